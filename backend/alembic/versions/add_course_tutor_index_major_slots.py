@@ -0,0 +1,51 @@
+"""keep the top K takers per major in the course tutor index
+
+Revision ID: add_course_tutor_index_major_slots
+Revises: create_cache_versions
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_course_tutor_index_major_slots'
+down_revision = 'create_cache_versions'
+branch_labels = None
+depends_on = None
+
+# Must match settings.COURSE_TUTOR_INDEX_SIZE at the time of the migration;
+# run python -m app.services.course_tutor_index after changing the setting
+TOP_K = 50
+
+
+def _repopulate(per_major: bool) -> None:
+    major_slots = f"OR major_rank <= {TOP_K}" if per_major else ""
+    op.execute("DELETE FROM course_tutor_index")
+    op.execute(f"""
+        INSERT INTO course_tutor_index (course_code, course_id, user_id, grade_score, year, semester, major_key, rank)
+        SELECT course_code, course_id, user_id, grade_score, year, semester, major_key, rank
+        FROM (
+            SELECT c.course_code, c.id AS course_id, c.user_id, c.grade_score, c.year, c.semester, u.major_key,
+                   row_number() OVER (
+                       PARTITION BY c.course_code
+                       ORDER BY c.grade_score DESC, c.year DESC NULLS LAST, c.semester ASC NULLS FIRST
+                   ) AS rank,
+                   row_number() OVER (
+                       PARTITION BY c.course_code, u.major_key
+                       ORDER BY c.grade_score DESC, c.year DESC NULLS LAST, c.semester ASC NULLS FIRST
+                   ) AS major_rank
+            FROM courses c
+            JOIN users u ON u.id = c.user_id
+            WHERE c.grade_score IS NOT NULL
+        ) ranked
+        WHERE rank <= {TOP_K} {major_slots}
+    """)
+
+
+def upgrade() -> None:
+    _repopulate(per_major=True)
+
+
+def downgrade() -> None:
+    _repopulate(per_major=False)
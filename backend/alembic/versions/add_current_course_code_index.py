@@ -0,0 +1,33 @@
+"""add partial index on current course codes
+
+Revision ID: add_current_course_code_index
+Revises: add_user_major_key
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_current_course_code_index'
+down_revision = 'add_user_major_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index matching the group study query (in-progress courses only):
+    # WHERE course_code IN (...) AND transcript_id IS NULL, covering user_id
+    op.create_index(
+        'idx_courses_current_code',
+        'courses',
+        ['course_code'],
+        unique=False,
+        postgresql_where=sa.text('transcript_id IS NULL'),
+        postgresql_include=['user_id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_courses_current_code', table_name='courses')
@@ -0,0 +1,33 @@
+"""add (help_request_id, rank) index on recommendations
+
+Revision ID: add_recommendations_request_rank_index
+Revises: add_current_course_code_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_recommendations_request_rank_index'
+down_revision = 'add_current_course_code_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Snapshot reads: WHERE help_request_id = X ORDER BY rank
+    # The composite index also serves help_request_id lookups, so it replaces the single-column one
+    op.create_index(
+        'idx_recommendations_request_rank',
+        'recommendations',
+        ['help_request_id', 'rank'],
+        unique=False
+    )
+    op.drop_index('ix_recommendations_help_request_id', table_name='recommendations')
+
+
+def downgrade() -> None:
+    op.create_index('ix_recommendations_help_request_id', 'recommendations', ['help_request_id'], unique=False)
+    op.drop_index('idx_recommendations_request_rank', table_name='recommendations')
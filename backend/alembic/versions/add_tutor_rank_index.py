@@ -0,0 +1,32 @@
+"""add tutor ranking index on courses
+
+Revision ID: add_tutor_rank_index
+Revises: convert_pointtype_to_string
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_tutor_rank_index'
+down_revision = 'convert_pointtype_to_string'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Partial index matching the tutor ranking query:
+    # WHERE course_code = X AND grade_score IS NOT NULL ORDER BY grade_score DESC, year DESC LIMIT k
+    op.create_index(
+        'idx_courses_tutor_rank',
+        'courses',
+        ['course_code', sa.text('grade_score DESC'), sa.text('year DESC')],
+        unique=False,
+        postgresql_where=sa.text('grade_score IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_courses_tutor_rank', table_name='courses')
@@ -0,0 +1,25 @@
+"""add course version counter to users
+
+Revision ID: add_user_course_version
+Revises: add_recommendations_request_rank_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_course_version'
+down_revision = 'add_recommendations_request_rank_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bumped on every course write; analytics snapshots are cached per (user, course_version)
+    op.add_column('users', sa.Column('course_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'course_version')
@@ -0,0 +1,114 @@
+"""add normalized major key to users and course tutor index
+
+Revision ID: add_user_major_key
+Revises: create_user_academic_summary
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import re
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_major_key'
+down_revision = 'create_user_academic_summary'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of app/core/majors.py at the time of this migration, so later edits
+# to the alias table don't change what this migration writes
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+CANONICAL_MAJORS = {
+    "computer science": ["cs", "comp sci", "compsci", "computer sciences"],
+    "computer engineering": ["comp e", "compe", "cpe", "cmpe"],
+    "electrical engineering": ["ee", "elec eng"],
+    "electrical and computer engineering": ["ece"],
+    "mechanical engineering": ["mech e", "meche", "mech eng"],
+    "civil engineering": ["civil e", "civ eng"],
+    "chemical engineering": ["chem e", "cheme"],
+    "biomedical engineering": ["bme", "biomed eng"],
+    "industrial engineering": ["ie", "ise", "industrial and systems engineering"],
+    "aerospace engineering": ["aero", "aero e", "aeroe"],
+    "software engineering": ["se", "swe"],
+    "information technology": ["it"],
+    "information systems": ["management information systems", "mis"],
+    "data science": ["ds"],
+    "mathematics": ["math", "maths"],
+    "applied mathematics": ["applied math"],
+    "statistics": ["stats", "stat"],
+    "physics": ["phys"],
+    "chemistry": ["chem"],
+    "biology": ["bio", "biological sciences", "biological science"],
+    "biochemistry": ["biochem"],
+    "neuroscience": ["neuro"],
+    "psychology": ["psych"],
+    "economics": ["econ"],
+    "political science": ["poli sci", "polisci", "political sciences"],
+    "business administration": ["business admin", "bba", "business"],
+    "accounting": ["acct", "accountancy"],
+    "finance": ["fin"],
+    "marketing": ["mktg"],
+    "kinesiology": ["kin", "kines"],
+    "communications": ["communication", "comm", "comms"],
+    "international relations": ["ir"],
+    "architecture": ["arch"],
+}
+
+_ALIASES = {
+    alias: canonical
+    for canonical, aliases in CANONICAL_MAJORS.items()
+    for alias in aliases
+}
+
+
+def _normalize_major(major):
+    """normalize_major() as of this migration (major is not None)"""
+    key = " ".join(_NON_ALPHANUMERIC.sub(" ", major.lower().replace("&", " and ")).split())
+    if not key:
+        return None
+    return _ALIASES.get(key, key)
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('major_key', sa.String(length=100), nullable=True))
+
+    # Backfill one UPDATE per distinct spelling (the alias table lives in Python)
+    connection = op.get_bind()
+    users = sa.table('users', sa.column('major'), sa.column('major_key'))
+    majors = connection.execute(sa.select(users.c.major).where(users.c.major.isnot(None)).distinct()).scalars().all()
+    keys = [{'spelling': major, 'key': _normalize_major(major)} for major in majors]
+    if keys:
+        connection.execute(
+            users.update().where(users.c.major == sa.bindparam('spelling')).values(major_key=sa.bindparam('key')),
+            keys
+        )
+
+    # Same-major lookups compare major_key; the raw major index can't serve them
+    op.create_index('ix_users_major_key', 'users', ['major_key'], unique=False)
+    op.drop_index('ix_users_major', table_name='users')
+
+    op.add_column('course_tutor_index', sa.Column('major_key', sa.String(length=100), nullable=True))
+    op.execute("""
+        UPDATE course_tutor_index
+        SET major_key = users.major_key
+        FROM users
+        WHERE users.id = course_tutor_index.user_id
+    """)
+    op.drop_column('course_tutor_index', 'major')
+
+
+def downgrade() -> None:
+    op.add_column('course_tutor_index', sa.Column('major', sa.String(length=100), nullable=True))
+    op.execute("""
+        UPDATE course_tutor_index
+        SET major = users.major
+        FROM users
+        WHERE users.id = course_tutor_index.user_id
+    """)
+    op.drop_column('course_tutor_index', 'major_key')
+
+    op.create_index('ix_users_major', 'users', ['major'], unique=False)
+    op.drop_index('ix_users_major_key', table_name='users')
+    op.drop_column('users', 'major_key')
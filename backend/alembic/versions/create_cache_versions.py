@@ -0,0 +1,62 @@
+"""create cache versions table and triggers
+
+Revision ID: create_cache_versions
+Revises: create_course_grade_stats
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_cache_versions'
+down_revision = 'create_course_grade_stats'
+branch_labels = None
+depends_on = None
+
+# (trigger name, table, events, counter) - keep in sync with _CACHE_RULES in app/core/http_cache.py.
+# The leaderboard counter has no trigger: a trigger on users would make every points award
+# update the one counter row inside its transaction, serializing concurrent awards on its
+# lock. points_service.leaderboard_changed bumps it after the award commits instead.
+TRIGGERS = [
+    ('class_posts_cache_version', 'class_posts', 'INSERT OR UPDATE OR DELETE OR TRUNCATE', 'class_posts'),
+    ('battle_buddy_teams_cache_version', 'battle_buddy_teams', 'INSERT OR UPDATE OR DELETE OR TRUNCATE', 'battle_buddy_teams'),
+    ('battle_buddy_members_cache_version', 'battle_buddy_members', 'INSERT OR UPDATE OR DELETE OR TRUNCATE', 'battle_buddy_teams'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'cache_versions',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.execute("""
+        INSERT INTO cache_versions (name)
+        VALUES ('class_posts'), ('battle_buddy_teams'), ('leaderboard')
+    """)
+
+    # Statement-level triggers: one increment per write statement, in the writer's transaction
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_cache_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE cache_versions SET version = version + 1 WHERE name = TG_ARGV[0];
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for name, table, events, counter in TRIGGERS:
+        op.execute(f"""
+            CREATE TRIGGER {name}
+            AFTER {events} ON {table}
+            FOR EACH STATEMENT EXECUTE PROCEDURE bump_cache_version('{counter}')
+        """)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_cache_version()")
+    op.drop_table('cache_versions')
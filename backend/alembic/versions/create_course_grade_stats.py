@@ -0,0 +1,56 @@
+"""create course grade stats table
+
+Revision ID: create_course_grade_stats
+Revises: add_user_course_version
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_course_grade_stats'
+down_revision = 'add_user_course_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'course_grade_stats',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('course_code', sa.String(length=20), nullable=False),
+        sa.Column('semester', sa.String(length=50), nullable=True),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('grade', sa.String(length=20), nullable=True),
+        sa.Column('taker_count', sa.Integer(), nullable=False),
+        sa.Column('graded_count', sa.Integer(), nullable=False),
+        sa.Column('grade_score_sum', sa.Numeric(precision=10, scale=2), nullable=False),
+        sa.Column('passed_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_course_grade_stats_code', 'course_grade_stats', ['course_code'], unique=False)
+    # Refreshes select courses by upper(course_code) - manually added courses keep the code as typed
+    op.create_index('idx_courses_course_code_upper', 'courses', [sa.text('upper(course_code)')], unique=False)
+    
+    # Backfill from existing courses (same grouping as app/services/course_grade_stats.py)
+    op.execute("""
+        INSERT INTO course_grade_stats
+            (course_code, semester, year, grade, taker_count, graded_count, grade_score_sum, passed_count)
+        SELECT
+            upper(course_code), semester, year, grade,
+            COUNT(*),
+            COUNT(grade_score),
+            COALESCE(SUM(grade_score), 0),
+            COUNT(*) FILTER (WHERE grade_score >= 1.7)
+        FROM courses
+        GROUP BY upper(course_code), semester, year, grade
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_courses_course_code_upper', table_name='courses')
+    op.drop_index('idx_course_grade_stats_code', table_name='course_grade_stats')
+    op.drop_table('course_grade_stats')
@@ -0,0 +1,64 @@
+"""create course tutor index table
+
+Revision ID: create_course_tutor_index
+Revises: add_tutor_rank_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_course_tutor_index'
+down_revision = 'add_tutor_rank_index'
+branch_labels = None
+depends_on = None
+
+# Must match settings.COURSE_TUTOR_INDEX_SIZE at the time of the migration;
+# run python -m app.services.course_tutor_index after changing the setting
+TOP_K = 50
+
+
+def upgrade() -> None:
+    op.create_table(
+        'course_tutor_index',
+        sa.Column('course_code', sa.String(length=20), nullable=False),
+        sa.Column('course_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('grade_score', sa.Numeric(precision=3, scale=2), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('semester', sa.String(length=50), nullable=True),
+        sa.Column('major', sa.String(length=100), nullable=True),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('course_code', 'course_id')
+    )
+    op.create_index('idx_course_tutor_index_code_rank', 'course_tutor_index', ['course_code', 'rank'], unique=False)
+    op.create_index(op.f('ix_course_tutor_index_user_id'), 'course_tutor_index', ['user_id'], unique=False)
+    
+    # Backfill from existing courses
+    op.execute(f"""
+        INSERT INTO course_tutor_index (course_code, course_id, user_id, grade_score, year, semester, major, rank)
+        SELECT course_code, course_id, user_id, grade_score, year, semester, major, rank
+        FROM (
+            SELECT c.course_code, c.id AS course_id, c.user_id, c.grade_score, c.year, c.semester, u.major,
+                   row_number() OVER (
+                       PARTITION BY c.course_code
+                       ORDER BY c.grade_score DESC, c.year DESC NULLS LAST, c.semester ASC NULLS FIRST
+                   ) AS rank
+            FROM courses c
+            JOIN users u ON u.id = c.user_id
+            WHERE c.grade_score IS NOT NULL
+        ) ranked
+        WHERE rank <= {TOP_K}
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_course_tutor_index_user_id'), table_name='course_tutor_index')
+    op.drop_index('idx_course_tutor_index_code_rank', table_name='course_tutor_index')
+    op.drop_table('course_tutor_index')
@@ -0,0 +1,69 @@
+"""create user academic summary table
+
+Revision ID: create_user_academic_summary
+Revises: create_course_tutor_index
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_user_academic_summary'
+down_revision = 'create_course_tutor_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'user_academic_summary',
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('gpa', sa.Numeric(precision=3, scale=2), nullable=False),
+        sa.Column('average_grade_score', sa.Numeric(precision=3, scale=2), nullable=False),
+        sa.Column('earned_credits', sa.Numeric(precision=6, scale=1), nullable=False),
+        sa.Column('course_count', sa.Integer(), nullable=False),
+        sa.Column('year_in_college', sa.String(length=20), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    
+    # Backfill from existing courses (same rules as app/services/academic_summary.py:
+    # credit is earned at C- / 1.7 or above, judged by grade_score when present, else by grade)
+    op.execute("""
+        INSERT INTO user_academic_summary
+            (user_id, gpa, average_grade_score, earned_credits, course_count, year_in_college)
+        SELECT
+            user_id,
+            COALESCE(ROUND(
+                SUM(grade_score * credit_hours) FILTER (WHERE earns AND grade_score IS NOT NULL AND credit_hours IS NOT NULL)
+                / NULLIF(SUM(credit_hours) FILTER (WHERE earns AND grade_score IS NOT NULL AND credit_hours IS NOT NULL), 0),
+            2), 0),
+            COALESCE(ROUND(AVG(grade_score), 2), 0),
+            COALESCE(SUM(credit_hours) FILTER (WHERE earns), 0),
+            COUNT(*),
+            CASE
+                WHEN COALESCE(SUM(credit_hours) FILTER (WHERE earns), 0) < 30 THEN 'Freshman'
+                WHEN COALESCE(SUM(credit_hours) FILTER (WHERE earns), 0) < 60 THEN 'Sophomore'
+                WHEN COALESCE(SUM(credit_hours) FILTER (WHERE earns), 0) < 90 THEN 'Junior'
+                ELSE 'Senior'
+            END
+        FROM (
+            SELECT
+                user_id, grade_score, credit_hours,
+                CASE
+                    WHEN grade_score IS NOT NULL THEN grade_score >= 1.7
+                    WHEN upper(trim(grade)) ~ '^[0-9]+(\\.[0-9]+)?$' THEN upper(trim(grade))::numeric >= 1.7
+                    ELSE COALESCE(upper(trim(grade)) IN ('A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-'), false)
+                END AS earns
+            FROM courses
+        ) graded
+        GROUP BY user_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('user_academic_summary')
@@ -1,16 +1,29 @@
 """
 Academic Analytics endpoints
 """
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, case
-from typing import Dict, List
+from sqlalchemy import and_, case, func
+from typing import Dict, List, Optional
+from datetime import datetime
 from collections import defaultdict
+import hashlib
+import uuid
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.http_cache import make_etag, etag_matches, not_modified
 from app.models.course import Course
 from app.models.user import User
 from app.api.v1.auth import get_current_user
-from pydantic import BaseModel
+from app.api.v1.admin import get_admin_user
+from app.services.academic_summary import LETTER_GRADES, earns_credit, grade_letter, term_gpa, term_period_columns
+from app.services.course_changes import get_course_version
+from app.services.chapter_analytics import get_chapter_report
+from app.services.gpa_percentiles import get_gpa_percentiles
+from app.services.projections import PRESETS, project_series
+from app.services.what_if import WhatIfError, simulate
+from pydantic import BaseModel, Field
 
 router = APIRouter()
 
@@ -43,6 +56,27 @@ class PointsTrendPoint(BaseModel):
     course_count: int  # Number of courses
 
 
+class GPAPercentile(BaseModel):
+    cohort_type: str  # chapter, major, pledge_class or graduation_year
+    cohort: str  # e.g., "Chapter", "Computer Science", "Fall 2022", "2026"
+    gpa: float
+    percentile: float  # Share of the cohort with a lower GPA (ties count half), 0-100
+    rank: int  # 1 = highest GPA in the cohort; ties share a rank
+    cohort_size: int  # Members with a GPA
+
+
+class ProjectedPoint(BaseModel):
+    period: str  # e.g., "Spring 2025"
+    value: float
+
+
+class TrendProjections(BaseModel):
+    """Projected future terms (same methods and presets as frontend projections.ts)"""
+    gpa: List[ProjectedPoint] = []  # Term GPA, linear regression, clamped to 0-4
+    points: List[ProjectedPoint] = []  # Points per term, linear regression
+    credits: List[ProjectedPoint] = []  # Credits per term, moving average
+
+
 class AcademicAnalytics(BaseModel):
     overall_gpa: float
     total_credits: float
@@ -52,70 +86,332 @@ class AcademicAnalytics(BaseModel):
     credits_by_semester: List[GPATrendPoint]
     course_distribution_by_department: List[CourseDistribution]
     points_trend: List[PointsTrendPoint]  # Replaces course_distribution_by_level
+    gpa_percentiles: List[GPAPercentile] = []  # Standing within the chapter and the user's cohorts
+    projections: TrendProjections = Field(default_factory=TrendProjections)
+
+
+class GPAStats(BaseModel):
+    mean: float
+    min: float
+    max: float
+    p10: float
+    p25: float
+    p50: float  # Median
+    p75: float
+    p90: float
+
+
+class GPABucket(BaseModel):
+    range: str  # e.g., "3.0-3.49"
+    count: int
+    percentage: float
+
+
+class ClassStandingCount(BaseModel):
+    standing: str  # Freshman, Sophomore, Junior or Senior (from earned credits)
+    count: int
+
+
+class CreditProgress(BaseModel):
+    average_earned_credits: float
+    median_earned_credits: float
+    class_standing: List[ClassStandingCount]
+
+
+class CohortAnalytics(BaseModel):
+    cohort: str  # e.g., "Computer Science", "Fall 2022", "2026" or "Unknown"
+    member_count: int
+    graded_member_count: int  # Members with a GPA (credit-earning graded courses)
+    # Statistics below are null/empty for cohorts under CHAPTER_ANALYTICS_MIN_COHORT_SIZE members
+    gpa: Optional[GPAStats] = None
+    gpa_distribution: List[GPABucket] = []
+    credit_progress: Optional[CreditProgress] = None
+    grade_distribution: List[GradeDistribution] = []
+    projected_term_gpa: Optional[float] = None  # Mean of members' projected next-term GPA (linear trend)
+    projected_member_count: int = 0  # Members with at least two terms to project from
+
+
+class ChapterAnalytics(BaseModel):
+    generated_at: datetime
+    refresh_interval_seconds: int
+    overall: CohortAnalytics
+    by_major: List[CohortAnalytics]
+    by_pledge_class: List[CohortAnalytics]
+    by_graduation_year: List[CohortAnalytics]
+
+
+class WhatIfRequest(BaseModel):
+    grade_levels: Optional[List[str]] = None  # Letters to enumerate per course (default: every letter with a GPA score)
+    scenarios: Optional[List[Dict[str, str]]] = None  # Explicit scenarios: course_code -> grade (instead of enumerating)
+
+
+class WhatIfCourse(BaseModel):
+    course_code: str
+    course_name: Optional[str] = None
+    credit_hours: float
+
+
+class GPADistribution(BaseModel):
+    min: float
+    max: float
+    mean: float
+    p10: float
+    p25: float
+    p50: float  # Median
+    p75: float
+    p90: float
+    histogram: List[GPABucket]  # 0.25-wide buckets
+
+
+class WhatIfScenarioResult(BaseModel):
+    grades: Dict[str, str]
+    term_gpa: Optional[float] = None  # None if no course in the scenario earns credit
+    cumulative_gpa: Optional[float] = None
+
 
+class WhatIfResponse(BaseModel):
+    courses: List[WhatIfCourse]  # Current courses (no transcript)
+    current_gpa: float  # Cumulative GPA of completed courses
+    scenario_count: int
+    term_gpa: Optional[GPADistribution] = None
+    cumulative_gpa: Optional[GPADistribution] = None
+    scenarios: List[WhatIfScenarioResult] = []  # Per-scenario results (explicit scenarios only)
 
-def earns_credit(grade: str, grade_score: float = None) -> bool:
+
+# Computed payloads per (user_id, course_version) - a course write bumps the version,
+# so cached entries are never served stale
+_trends_cache = TTLCache(
+    maxsize=settings.ANALYTICS_CACHE_MAXSIZE,
+    ttl_seconds=settings.ANALYTICS_CACHE_TTL_SECONDS
+)
+
+# Per-user data: browsers may store it but must revalidate (cheap - the ETag is the version)
+TRENDS_CACHE_CONTROL = "private, no-cache"
+
+
+def academic_trends_state(db: Session, user_id) -> tuple:
+    """(etag, version, percentiles, standing) of a user's academic trends"""
+    version = get_course_version(db, user_id)
+    percentiles = get_gpa_percentiles(db, user_id)
+    standing = _standing_tag(percentiles)
+    etag = make_etag("academic-trends", user_id.hex, version, standing)
+    return etag, version, percentiles, standing
+
+
+def cached_academic_trends(db: Session, user_id, version: int, percentiles: List[dict], standing: str) -> AcademicAnalytics:
+    """Academic trends for a course-set version, computed once and cached"""
+    # Entries are (standing, payload): a standing change only swaps the percentiles in
+    key = (user_id, version)
+    cached = _trends_cache.get(key)
+    if cached is None:
+        analytics = compute_academic_trends(db, user_id)
+        analytics.projections = project_trends([analytics])[0]
+        analytics.gpa_percentiles = [GPAPercentile(**p) for p in percentiles]
+        _trends_cache.set(key, (standing, analytics))
+    elif cached[0] != standing:
+        analytics = cached[1].model_copy(update={'gpa_percentiles': [GPAPercentile(**p) for p in percentiles]})
+        _trends_cache.set(key, (standing, analytics))
+    else:
+        analytics = cached[1]
+    return analytics
+
+
+@router.get("/academic-trends", response_model=AcademicAnalytics)
+async def get_academic_trends(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     """
-    Determine if a grade earns credit (C- or above)
-    Credits are only earned for grades C- (1.7) or above
+    Get academic trends and analytics for the current user
+    Cached per course-set version and GPA standing; unchanged data is answered with 304 Not Modified
     """
-    if grade_score is not None:
-        # C- has a grade_score of 1.7, so anything >= 1.7 earns credit
-        return float(grade_score) >= 1.7
-    
-    if not grade:
-        return False
-    
-    # Check letter grades
-    grade_upper = str(grade).strip().upper()
+    etag, version, percentiles, standing = academic_trends_state(db, current_user.id)
+    if etag_matches(request, etag):
+        return not_modified(etag, TRENDS_CACHE_CONTROL)
     
-    # Grades that earn credit: A+, A, A-, B+, B, B-, C+, C, C-
-    credit_grades = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-']
+    analytics = cached_academic_trends(db, current_user.id, version, percentiles, standing)
     
-    # Check if it's a numeric grade
-    try:
-        grade_num = float(grade_upper)
-        return grade_num >= 1.7  # C- or above
-    except ValueError:
-        pass
-    
-    # Check if it's a letter grade that earns credit
-    return grade_upper in credit_grades
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = TRENDS_CACHE_CONTROL
+    return analytics
 
 
-def calculate_gpa(courses: List[Course]) -> float:
-    """Calculate GPA from courses with grade_score (only courses that earn credit)"""
-    total_points = 0
-    total_credits = 0
-    
-    for course in courses:
-        if course.grade_score is not None and course.credit_hours is not None:
-            # Only count credits for courses with C- or above
-            if earns_credit(course.grade, course.grade_score):
-                total_points += float(course.grade_score) * float(course.credit_hours)
-                total_credits += float(course.credit_hours)
-    
-    if total_credits == 0:
-        return 0.0
-    
-    return round(total_points / total_credits, 2)
+@router.get("/gpa-percentiles", response_model=List[GPAPercentile])
+async def get_gpa_percentile_ranking(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Current user's GPA percentile within the chapter, their major, pledge class and
+    graduation year (empty without a GPA). Lookups bisect precomputed sorted GPA lists.
+    """
+    return [GPAPercentile(**p) for p in get_gpa_percentiles(db, current_user.id)]
 
 
-@router.get("/academic-trends", response_model=AcademicAnalytics)
-async def get_academic_trends(
+def project_trends(payloads: List[AcademicAnalytics]) -> List[TrendProjections]:
+    """Projections for many analytics payloads at once (one vectorized pass per series type)"""
+    series = {
+        'gpa': [[(point.period, point.gpa) for point in payload.gpa_trend] for payload in payloads],
+        'points': [[(point.period, point.points) for point in payload.points_trend] for payload in payloads],
+        'credits': [[(point.period, point.credits) for point in payload.credits_by_semester] for payload in payloads],
+    }
+    projected = {name: project_series(values, PRESETS[name]) for name, values in series.items()}
+    return [
+        TrendProjections(**{
+            name: [ProjectedPoint(period=period, value=value) for period, value in projected[name][i]]
+            for name in series
+        })
+        for i in range(len(payloads))
+    ]
+
+
+@router.post("/what-if", response_model=WhatIfResponse)
+async def simulate_what_if(
+    what_if: WhatIfRequest,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get academic trends and analytics for the current user"""
-    # Get all courses for the user (including those without grade_score for grade distribution)
-    all_courses = db.query(Course).filter(
-        Course.user_id == current_user.id
+    """
+    Distribution of end-of-term and cumulative GPA over grade combinations for the
+    current courses (every combination of grade_levels, or explicit scenarios)
+    """
+    try:
+        result = simulate(
+            db, current_user.id,
+            grade_levels=what_if.grade_levels,
+            scenarios=what_if.scenarios,
+            max_scenarios=settings.WHAT_IF_MAX_SCENARIOS
+        )
+    except WhatIfError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return WhatIfResponse(**result)
+
+
+def _standing_tag(percentiles: List[dict]) -> str:
+    """Short digest of a user's percentile results (part of the academic trends ETag)"""
+    digest = hashlib.blake2b(digest_size=6)
+    for p in percentiles:
+        digest.update(f"{p['cohort_type']}:{p['cohort']}:{p['gpa']}:{p['rank']}:{p['cohort_size']}\n".encode())
+    return digest.hexdigest()
+
+
+@router.get("/chapter", response_model=ChapterAnalytics)
+async def get_chapter_analytics(
+    admin_user: User = Depends(get_admin_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Chapter-wide GPA, credit progress and grade distribution (admin/officer), overall and
+    by major, pledge class and graduation year. Active members only; cohorts under
+    CHAPTER_ANALYTICS_MIN_COHORT_SIZE report counts only. Rebuilt at most every
+    CHAPTER_ANALYTICS_REFRESH_SECONDS.
+    """
+    return ChapterAnalytics(**get_chapter_report(db))
+
+
+# Semester priority within an academic year (points trend); the GPA trend is in calendar order
+ACADEMIC_SEMESTER_ORDER = {'Fall': 0, 'Spring': 1, 'Summer': 2, 'Winter': 3, 'Unknown': 99}
+
+
+def _academic_year_sort_key(period_str: str) -> tuple:
+    """
+    Sort key for "Semester Year" periods in academic calendar order: Fall starts the
+    academic year, and the following Spring and Summer belong to it
+    """
+    parts = period_str.split()
+    if len(parts) >= 2:
+        semester = parts[0]
+        try:
+            year = int(parts[1])
+            academic_year = year - 1 if semester in ('Spring', 'Summer') else year
+            return (academic_year, ACADEMIC_SEMESTER_ORDER.get(semester, 99))
+        except (ValueError, IndexError):
+            pass
+    return (0, 99)
+
+
+def _gpa_trend_rows(db: Session, user_id: uuid.UUID) -> List:
+    """
+    Per-term points/credits of graded, credit-earning courses in chronological order,
+    with running totals from a window function (for cumulative GPA)
+    """
+    period, sort_year, sort_semester = term_period_columns()
+    terms = db.query(
+        period.label('period'),
+        sort_year.label('sort_year'),
+        sort_semester.label('sort_semester'),
+        func.sum(Course.grade_score * Course.credit_hours).label('points'),
+        func.sum(Course.credit_hours).label('credits'),
+        func.count().label('course_count')
+    ).filter(
+        and_(
+            Course.user_id == user_id,
+            Course.grade_score.isnot(None),
+            Course.credit_hours.isnot(None),
+            Course.grade_score >= 1.7  # Only courses with C- or above earn credit
+        )
+    ).group_by(
+        period, sort_year, sort_semester
+    ).subquery()
+
+    chronological = (terms.c.sort_year, terms.c.sort_semester, terms.c.period)
+    return db.query(
+        terms.c.period,
+        terms.c.points,
+        terms.c.credits,
+        terms.c.course_count,
+        func.sum(terms.c.points).over(order_by=chronological).label('cumulative_points'),
+        func.sum(terms.c.credits).over(order_by=chronological).label('cumulative_credits')
+    ).order_by(*chronological).all()
+
+
+def _term_grade_rows(db: Session, user_id: uuid.UUID) -> List:
+    """Course counts, credits and points per (semester, year, grade)"""
+    # Whether grade_score earns credit (NULL when there is no grade_score - decided from the grade text)
+    score_earns_credit = case(
+        (Course.grade_score.is_(None), None),
+        (Course.grade_score >= 1.7, 1),
+        else_=0
+    )
+    return db.query(
+        Course.semester,
+        Course.year,
+        Course.grade,
+        score_earns_credit.label('score_earns_credit'),
+        func.count().label('course_count'),
+        func.sum(Course.credit_hours).label('credits'),
+        # Stored transcript points, else grade_score x credit_hours
+        func.sum(func.coalesce(Course.points, Course.grade_score * Course.credit_hours)).label('points')
+    ).filter(
+        Course.user_id == user_id
+    ).group_by(
+        Course.semester, Course.year, Course.grade, score_earns_credit
     ).order_by(Course.year, Course.semester).all()
-    
-    # Get courses with grade_score for GPA calculations
-    courses_with_gpa = [c for c in all_courses if c.grade_score is not None]
-    
-    if not all_courses:
+
+
+def _course_code_counts(db: Session, user_id: uuid.UUID) -> List:
+    """Course count per course code"""
+    return db.query(
+        Course.course_code,
+        func.count().label('course_count')
+    ).filter(
+        Course.user_id == user_id
+    ).group_by(Course.course_code).all()
+
+
+def compute_academic_trends(db: Session, user_id: uuid.UUID) -> AcademicAnalytics:
+    """
+    Compute the academic trends payload from a user's courses.
+    Aggregation happens in GROUP BY queries (cumulative GPA via a window function);
+    only per-term/per-grade/per-code rows are loaded.
+    """
+    term_grade_rows = _term_grade_rows(db, user_id)
+    if not term_grade_rows:
         return AcademicAnalytics(
             overall_gpa=0.0,
             total_credits=0.0,
@@ -127,104 +423,54 @@ async def get_academic_trends(
             points_trend=[]
         )
     
-    # Calculate overall GPA (only from courses with grade_score that earn credit)
-    overall_gpa = calculate_gpa(courses_with_gpa) if courses_with_gpa else 0.0
-    
-    # Calculate total credits (only from courses with C- or above)
-    total_credits = sum(
-        float(c.credit_hours) 
-        for c in all_courses 
-        if c.credit_hours and earns_credit(c.grade, c.grade_score)
-    )
-    total_courses = len(all_courses)
-    
-    # Group by semester/year for GPA trend (only courses with grade_score that earn credit)
-    semester_data = defaultdict(lambda: {"points": 0, "credits": 0, "count": 0})
-    
-    for course in courses_with_gpa:
-        if course.grade_score is not None and course.credit_hours is not None:
-            # Only count credits for courses with C- or above
-            if earns_credit(course.grade, course.grade_score):
-                period = f"{course.semester or 'Unknown'} {course.year or 'Unknown'}"
-                semester_data[period]["points"] += float(course.grade_score) * float(course.credit_hours)
-                semester_data[period]["credits"] += float(course.credit_hours)
-                semester_data[period]["count"] += 1
-    
-    # Build GPA trend - sort chronologically by year and semester
-    def sort_period_key(item: tuple) -> tuple:
-        """Sort key for (period, data) tuples - sorts by period chronologically"""
-        period_str, _ = item  # Unpack the tuple to get just the period string
-        # Semester order: Spring (0), Summer (1), Fall (2), Winter (3) - academic year order
-        semester_order = {'Spring': 0, 'Summer': 1, 'Fall': 2, 'Winter': 3, 'Unknown': 99}
-        
-        # Parse period string (e.g., "Fall 2024" or "Spring 2025")
-        parts = period_str.split()
-        if len(parts) >= 2:
-            semester = parts[0]
-            try:
-                year = int(parts[1])
-                semester_priority = semester_order.get(semester, 99)
-                return (year, semester_priority)
-            except (ValueError, IndexError):
-                pass
-        
-        # Fallback for malformed periods
-        return (0, 99)
-    
-    # Calculate cumulative GPA progressively from term GPAs
+    # GPA trend - term and cumulative GPA (only courses with grade_score that earn credit)
     gpa_trend = []
-    cumulative_total_points = 0.0
-    cumulative_total_credits = 0.0
-    
-    for period, data in sorted(semester_data.items(), key=sort_period_key):
-        term_gpa = round(data["points"] / data["credits"], 2) if data["credits"] > 0 else 0.0
-        term_credits = round(data["credits"], 1)
-        term_points = data["points"]
-        
-        # Calculate cumulative GPA: (previous_cumulative_points + current_term_points) / (previous_cumulative_credits + current_term_credits)
-        cumulative_total_points += term_points
-        cumulative_total_credits += data["credits"]
-        cumulative_gpa = round(cumulative_total_points / cumulative_total_credits, 2) if cumulative_total_credits > 0 else 0.0
-        
+    for row in _gpa_trend_rows(db, user_id):
         gpa_trend.append(GPATrendPoint(
-            period=period,
-            gpa=term_gpa,
-            cumulative_gpa=cumulative_gpa,
-            credits=term_credits,
-            course_count=data["count"]
+            period=row.period,
+            gpa=term_gpa(row.points, row.credits),
+            cumulative_gpa=term_gpa(row.cumulative_points, row.cumulative_credits),
+            credits=round(float(row.credits), 1),
+            course_count=row.course_count
         ))
     
-    # Grade distribution - use ALL courses with grades (not just those with grade_score)
+    # Overall GPA is the cumulative GPA after the last term
+    overall_gpa = gpa_trend[-1].cumulative_gpa if gpa_trend else 0.0
+    
+    # Totals, grade distribution and points trend from the per-(term, grade) rows
+    total_courses = 0
+    total_credits = 0.0
     grade_counts = defaultdict(int)
-    for course in all_courses:
-        if course.grade:
-            # Normalize grade - handle letter grades (A, A-, B+, etc.) and numeric grades
-            grade_str = str(course.grade).strip().upper()
-            
-            # If it's a numeric grade, convert to letter
-            try:
-                grade_num = float(grade_str)
-                if grade_num >= 3.7:
-                    grade_letter = "A"
-                elif grade_num >= 3.0:
-                    grade_letter = "B"
-                elif grade_num >= 2.0:
-                    grade_letter = "C"
-                elif grade_num >= 1.0:
-                    grade_letter = "D"
-                else:
-                    grade_letter = "F"
-            except ValueError:
-                # It's a letter grade - take first character
-                grade_letter = grade_str[0] if grade_str else "Unknown"
-            
-            # Only count valid letter grades
-            if grade_letter in ["A", "B", "C", "D", "F"]:
-                grade_counts[grade_letter] += 1
+    points_semester_data = defaultdict(lambda: {"points": 0, "attempted_credits": 0, "earned_credits": 0, "count": 0})
+    
+    for row in term_grade_rows:
+        total_courses += row.course_count
+        credits = float(row.credits) if row.credits is not None else 0.0
+        if row.score_earns_credit is not None:
+            grade_earns_credit = bool(row.score_earns_credit)
+        else:
+            grade_earns_credit = earns_credit(row.grade, None)
+        if grade_earns_credit:
+            total_credits += credits
+        
+        # Grade distribution - all courses with grades (not just those with grade_score)
+        if row.grade:
+            letter = grade_letter(row.grade)
+            if letter in LETTER_GRADES:
+                grade_counts[letter] += row.course_count
+        
+        # Points trend - total points, attempted credits and earned credits per term
+        if row.semester and row.year:
+            period = points_semester_data[f"{row.semester} {row.year}"]
+            period["points"] += float(row.points) if row.points is not None else 0.0
+            period["attempted_credits"] += credits
+            if grade_earns_credit:
+                period["earned_credits"] += credits
+            period["count"] += row.course_count
     
     total_graded = sum(grade_counts.values())
     grade_distribution = []
-    for grade in ["A", "B", "C", "D", "F"]:
+    for grade in LETTER_GRADES:
         count = grade_counts.get(grade, 0)
         percentage = round((count / total_graded * 100), 1) if total_graded > 0 else 0.0
         grade_distribution.append(GradeDistribution(
@@ -245,19 +491,18 @@ async def get_academic_trends(
         for point in gpa_trend
     ]
     
-    # Course distribution by department (use all courses)
+    # Course distribution by department (e.g., "CS 101" -> "CS"); most courses first, then by name
     dept_counts = defaultdict(int)
-    for course in all_courses:
-        if course.course_code:
-            # Extract department (e.g., "CS 101" -> "CS")
-            parts = course.course_code.split()
-            if parts:
-                dept = parts[0].upper()
-                dept_counts[dept] += 1
+    total_courses_for_dist = 0
+    for course_code, count in _course_code_counts(db, user_id):
+        parts = course_code.split() if course_code else []
+        if parts:
+            dept_counts[parts[0].upper()] += count
+        if course_code:
+            total_courses_for_dist += count
     
-    total_courses_for_dist = len([c for c in all_courses if c.course_code])
     course_distribution_by_department = []
-    for dept, count in sorted(dept_counts.items(), key=lambda x: x[1], reverse=True):
+    for dept, count in sorted(dept_counts.items(), key=lambda x: (-x[1], x[0])):
         percentage = round((count / total_courses_for_dist * 100), 1) if total_courses_for_dist > 0 else 0.0
         course_distribution_by_department.append(CourseDistribution(
             category=dept,
@@ -265,63 +510,8 @@ async def get_academic_trends(
             percentage=percentage
         ))
     
-    # Points trend by semester - tracks total points, attempted credits, and earned credits over time
-    points_semester_data = defaultdict(lambda: {"points": 0, "attempted_credits": 0, "earned_credits": 0, "count": 0})
-    
-    for course in all_courses:
-        if course.semester and course.year:
-            period = f"{course.semester} {course.year}"
-            
-            # Get points from database (stored from transcript) or calculate if not available
-            if course.points is not None:
-                points = float(course.points)
-            elif course.grade_score is not None and course.credit_hours is not None:
-                # Fallback: calculate points if not stored
-                points = float(course.grade_score) * float(course.credit_hours)
-            else:
-                points = 0.0
-            
-            points_semester_data[period]["points"] += points
-            
-            # Get attempted credits (use credit_hours as attempted credits)
-            attempted = float(course.credit_hours) if course.credit_hours else 0.0
-            points_semester_data[period]["attempted_credits"] += attempted
-            
-            # Get earned credits (only if grade earns credit)
-            if earns_credit(course.grade, course.grade_score) and course.credit_hours:
-                earned = float(course.credit_hours)
-                points_semester_data[period]["earned_credits"] += earned
-            
-            points_semester_data[period]["count"] += 1
-    
-    # Build points trend - sort by academic calendar order (Fall, Spring, Summer)
-    def sort_period_key_for_points(item: tuple) -> tuple:
-        """Sort key for (period, data) tuples - sorts by academic year order: Fall, Spring, Summer"""
-        period_str, _ = item
-        # Academic calendar order: Fall starts the year, then Spring, then Summer
-        semester_order = {'Fall': 0, 'Spring': 1, 'Summer': 2, 'Winter': 3, 'Unknown': 99}
-        parts = period_str.split()
-        if len(parts) >= 2:
-            semester = parts[0]
-            try:
-                year = int(parts[1])
-                semester_priority = semester_order.get(semester, 99)
-                # For academic year: Fall 2023 starts academic year 2023-2024
-                # Spring 2024 and Summer 2024 are part of the same academic year
-                # So we use the year of Fall as the academic year base
-                if semester == 'Spring' or semester == 'Summer':
-                    # Spring and Summer belong to the academic year that started in the previous Fall
-                    academic_year = year - 1
-                else:
-                    # Fall starts the academic year
-                    academic_year = year
-                return (academic_year, semester_priority)
-            except (ValueError, IndexError):
-                pass
-        return (0, 99)
-    
     points_trend = []
-    for period, data in sorted(points_semester_data.items(), key=sort_period_key_for_points):
+    for period, data in sorted(points_semester_data.items(), key=lambda item: _academic_year_sort_key(item[0])):
         points_trend.append(PointsTrendPoint(
             period=period,
             points=round(data["points"], 2),
@@ -340,4 +530,3 @@ async def get_academic_trends(
         course_distribution_by_department=course_distribution_by_department,
         points_trend=points_trend
     )
-
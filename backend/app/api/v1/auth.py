@@ -10,11 +10,17 @@ from typing import Optional
 from datetime import timedelta
 import uuid
 from app.core.database import get_db
-from app.core.security import verify_password, get_password_hash, create_access_token, decode_access_token
+from app.core.security import (
+    verify_password_async, verify_and_update_password, get_password_hash_async,
+    create_access_token, decode_access_token
+)
 from app.core.config import settings
-from app.core.storage import storage_service
+from app.core.user_cache import AuthenticatedUser, get_cached_user, cache_user, invalidate_user
 from app.models.user import User
 from app.models.transcript import Transcript
+from app.services.course_changes import courses_changed, user_major_changed
+from app.services.course_tutor_index import user_course_codes
+from app.services.points_service import leaderboard_changed
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -115,8 +121,12 @@ class Token(BaseModel):
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+) -> AuthenticatedUser:
+    """
+    Get current authenticated user
+    Returns a cached read-only projection; use get_current_user_for_update when
+    the handler needs to modify the User row.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -137,10 +147,30 @@ async def get_current_user(
     except (ValueError, TypeError):
         raise credentials_exception
     
+    # Serve repeat requests from the user cache (no database round trip)
+    cached_user = get_cached_user(user_uuid, token)
+    if cached_user is not None:
+        return cached_user
+    
     user = db.query(User).filter(User.id == user_uuid).first()
     if user is None:
         raise credentials_exception
     
+    return cache_user(user, token, payload.get("exp"))
+
+
+async def get_current_user_for_update(
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+) -> User:
+    """Load the full User row for handlers that write to it"""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
@@ -161,7 +191,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         )
     
     # Create new user with normalized email (lowercase for consistency and faster lookups)
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     user = User(
         email=email_lower,  # Store lowercase for faster lookups
         hashed_password=hashed_password,
@@ -176,6 +206,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     db.add(user)
     db.commit()
     db.refresh(user)
+    leaderboard_changed(db)
     
     return user
 
@@ -209,13 +240,24 @@ async def login(
             )
         
         # Verify password only if user exists (bcrypt is expensive, so check user first)
-        if not verify_password(form_data.password, user.hashed_password):
+        # Runs in the password hashing pool so the event loop stays free
+        password_valid, new_hash = await verify_and_update_password(form_data.password, user.hashed_password)
+        if not password_valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
+        # Stored hash uses an outdated cost factor (BCRYPT_ROUNDS changed) - upgrade it
+        if new_hash:
+            try:
+                user.hashed_password = new_hash
+                db.commit()
+            except Exception:
+                # Not fatal - the old hash still verifies, try again next login
+                db.rollback()
+        
         # Generate token immediately (minimal processing)
         access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
         access_token = create_access_token(
@@ -258,7 +300,7 @@ async def login(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: AuthenticatedUser = Depends(get_current_user)):
     """Get current user information"""
     # Explicitly convert User to UserResponse to ensure proper serialization
     return UserResponse.model_validate(current_user)
@@ -267,27 +309,28 @@ async def get_current_user_info(current_user: User = Depends(get_current_user)):
 @router.post("/change-password", status_code=status.HTTP_200_OK)
 async def change_password(
     password_data: PasswordChange,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
     db: Session = Depends(get_db)
 ):
     """Change user password"""
     # Verify current password
-    if not verify_password(password_data.current_password, current_user.hashed_password):
+    if not await verify_password_async(password_data.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
         )
     
     # Check if new password is different from current password
-    if verify_password(password_data.new_password, current_user.hashed_password):
+    if await verify_password_async(password_data.new_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(password_data.new_password)
+    current_user.hashed_password = await get_password_hash_async(password_data.new_password)
     db.commit()
+    invalidate_user(current_user.id)
     
     return {"message": "Password changed successfully"}
 
@@ -295,7 +338,7 @@ async def change_password(
 @router.put("/update-major", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def update_major(
     major_data: MajorUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
     db: Session = Depends(get_db)
 ):
     """Update user's major"""
@@ -309,6 +352,8 @@ async def update_major(
     
     db.commit()
     db.refresh(current_user)
+    invalidate_user(current_user.id)
+    user_major_changed(db, current_user.id)
     
     return current_user
 
@@ -316,20 +361,21 @@ async def update_major(
 @router.put("/update-phone", response_model=UserResponse, status_code=status.HTTP_200_OK)
 async def update_phone(
     phone_data: PhoneUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
     db: Session = Depends(get_db)
 ):
     """Update user's phone number"""
     current_user.phone_number = phone_data.phone_number
     db.commit()
     db.refresh(current_user)
+    invalidate_user(current_user.id)
     
     return current_user
 
 
 @router.delete("/delete-account", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_account(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_for_update),
     db: Session = Depends(get_db)
 ):
     """Delete user account and all associated data"""
@@ -344,6 +390,7 @@ async def delete_account(
             # Only try to delete if file_path exists
             if transcript.file_path:
                 try:
+                    from app.core.storage import storage_service  # Lazy: boto3 is only needed here
                     storage_service.delete_file(transcript.file_path)
                 except Exception as storage_error:
                     # Log but don't fail if storage deletion fails
@@ -351,8 +398,13 @@ async def delete_account(
         
         # Delete the user (CASCADE will delete courses, transcripts, help_requests, and recommendations)
         try:
+            user_id = current_user.id
+            deleted_course_codes = user_course_codes(db, user_id)
             db.delete(current_user)
             db.commit()
+            invalidate_user(user_id)
+            courses_changed(db, user_id, deleted_course_codes)
+            leaderboard_changed(db)
         except Exception as db_error:
             db.rollback()
             print(f"Database error during account deletion: {db_error}")
@@ -12,7 +12,8 @@ from app.api.v1.auth import get_current_user
 from app.models.user import User
 from app.models.battle_buddy import BattleBuddyTeam, BattleBuddyMember
 from app.models.points import PointType, PointsHistory
-from app.services.points_service import award_points
+from app.services.points_service import award_points, leaderboard_changed
+from app.core.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -336,17 +337,13 @@ async def delete_team(
     }
 
 
-@router.get("/my-team", response_model=Optional[BattleBuddyTeamResponse])
-async def get_my_team(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get the current user's battle buddy team"""
+def my_team(db: Session, user_id: uuid.UUID) -> Optional[BattleBuddyTeamResponse]:
+    """The battle buddy team a user belongs to, if any"""
     # Optimized: Single query with joinedload to get team and all members with users (O(1) instead of O(n))
     team = (
         db.query(BattleBuddyTeam)
         .join(BattleBuddyMember, BattleBuddyTeam.id == BattleBuddyMember.team_id)
-        .filter(BattleBuddyMember.user_id == current_user.id)
+        .filter(BattleBuddyMember.user_id == user_id)
         .options(joinedload(BattleBuddyTeam.members).joinedload(BattleBuddyMember.user))
         .first()
     )
@@ -377,6 +374,15 @@ async def get_my_team(
     )
 
 
+@router.get("/my-team", response_model=Optional[BattleBuddyTeamResponse])
+async def get_my_team(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's battle buddy team"""
+    return my_team(db, current_user.id)
+
+
 class TeamMemberAutocompleteResponse(BaseModel):
     """Response model for team member autocomplete"""
     user_id: str
@@ -592,6 +598,9 @@ async def update_team_points(
         
         # Single commit for all operations - O(1) database operation
         db.commit()
+        for user_id in user_ids:
+            invalidate_user(user_id)
+        leaderboard_changed(db)
         
         # Refresh team to get updated points
         db.refresh(team)
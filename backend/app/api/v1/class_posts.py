@@ -13,6 +13,7 @@ from app.core.database import get_db
 from app.models.class_post import ClassPost
 from app.models.user import User
 from app.api.v1.auth import get_current_user
+from app.core.serialization import RowSerializer
 
 router = APIRouter()
 
@@ -99,6 +100,10 @@ class ClassPostResponse(BaseModel):
         from_attributes = True
 
 
+# List endpoints serialize rows directly (same output as ClassPostResponse, without per-row validation)
+CLASS_POST_ROWS = RowSerializer(ClassPostResponse, ClassPost)
+
+
 @router.post("", response_model=ClassPostResponse, status_code=status.HTTP_201_CREATED)
 async def create_class_post(
     post_data: ClassPostCreate,
@@ -162,7 +167,7 @@ async def list_class_posts(
     # Order by most recent first
     posts = query.order_by(desc(ClassPost.created_at)).all()
     
-    return posts
+    return CLASS_POST_ROWS.response(posts)
 
 
 @router.get("/search", response_model=List[ClassPostResponse])
@@ -185,7 +190,7 @@ async def search_class_posts(
         )
     ).order_by(desc(ClassPost.created_at)).all()
     
-    return posts
+    return CLASS_POST_ROWS.response(posts)
 
 
 @router.get("/{post_id}", response_model=ClassPostResponse)
@@ -220,7 +225,7 @@ async def get_my_class_posts(
         ClassPost.user_id == current_user.id
     ).order_by(desc(ClassPost.created_at)).all()
     
-    return posts
+    return CLASS_POST_ROWS.response(posts)
 
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
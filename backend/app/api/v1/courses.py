@@ -11,6 +11,8 @@ from app.core.database import get_db
 from app.models.course import Course
 from app.models.user import User
 from app.api.v1.auth import get_current_user
+from app.services.course_changes import courses_changed
+from app.services.course_grade_stats import get_course_stats
 
 router = APIRouter()
 
@@ -49,6 +51,30 @@ class CourseResponse(BaseModel):
         from_attributes = True
 
 
+class GradeCount(BaseModel):
+    grade: str  # Letter bucket: A, B, C, D or F
+    count: int
+    percentage: float
+
+
+class TermTakers(BaseModel):
+    term: str  # e.g., "Fall 2024"
+    semester: Optional[str] = None
+    year: Optional[int] = None
+    taker_count: int
+    mean_grade_score: Optional[float] = None
+
+
+class CourseStatsResponse(BaseModel):
+    course_code: str
+    taker_count: int  # Every recorded enrolment, graded or not
+    graded_count: int  # Enrolments with a grade_score
+    mean_grade_score: Optional[float] = None
+    pass_rate: Optional[float] = None  # % of graded enrolments at C- or above
+    grade_distribution: List[GradeCount]
+    takers_by_term: List[TermTakers]
+
+
 class CourseCreate(BaseModel):
     course_code: str
     course_name: Optional[str] = None
@@ -114,6 +140,7 @@ async def create_course(
     db.add(course)
     db.commit()
     db.refresh(course)
+    courses_changed(db, current_user.id, [course.course_code])
     
     return course
 
@@ -151,6 +178,48 @@ async def search_courses(
     return courses
 
 
+MAX_COURSE_STATS_CODES = 50
+
+
+@router.get("/stats", response_model=List[CourseStatsResponse])
+async def get_bulk_course_stats(
+    course_codes: List[str] = Query(..., description="Course codes to get statistics for (repeat the parameter)"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Grade statistics for several courses (course planner); codes without records are omitted"""
+    codes = {code.strip().upper() for code in course_codes if code and code.strip()}
+    if not codes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one course code is required"
+        )
+    if len(codes) > MAX_COURSE_STATS_CODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_COURSE_STATS_CODES} course codes can be requested at once"
+        )
+    
+    return [CourseStatsResponse(**stats) for stats in get_course_stats(db, codes).values()]
+
+
+@router.get("/{course_code}/stats", response_model=CourseStatsResponse)
+async def get_single_course_stats(
+    course_code: str,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Grade histogram, mean grade_score, pass rate and takers by term for a course code"""
+    code = course_code.strip().upper()
+    stats = get_course_stats(db, [code]).get(code)
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No records for this course"
+        )
+    return CourseStatsResponse(**stats)
+
+
 @router.put("/{course_id}", response_model=CourseResponse)
 async def update_course(
     course_id: UUID,
@@ -213,6 +282,7 @@ async def update_course(
             )
     
     # Update course fields
+    previous_course_code = course.course_code
     course.course_code = course_data.course_code
     course.course_name = course_data.course_name
     course.credit_hours = course_data.credit_hours
@@ -230,6 +300,8 @@ async def update_course(
             detail=f"Failed to update course: {str(e)}"
         )
     
+    courses_changed(db, current_user.id, [previous_course_code, course.course_code])
+    
     return course
 
 
@@ -259,6 +331,7 @@ async def delete_course(
         )
     
     try:
+        course_code = course.course_code
         db.delete(course)
         db.commit()
     except Exception as e:
@@ -268,5 +341,7 @@ async def delete_course(
             detail=f"Failed to delete course: {str(e)}"
         )
     
+    courses_changed(db, current_user.id, [course_code])
+    
     return None
 
@@ -0,0 +1,193 @@
+"""
+Dashboard endpoints
+
+/dashboard/summary assembles the sections the dashboard page used to fetch one
+by one (academic trends, points, leaderboard, team, recommendations, current
+courses) in a single authenticated request. The sections are independent
+queries, so they run concurrently: a section that gets one of the worker's
+DASHBOARD_EXTRA_CONNECTIONS slots runs in its own thread on its own session,
+and the rest run one after another on the request's session alongside them.
+With every slot taken, the summary falls back to the request session alone, so
+it never holds more than the worker's small extra budget of pooled connections.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.orm import Session
+from pydantic import BaseModel
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import contextvars
+import logging
+import threading
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.http_cache import make_etag
+from app.api.v1.auth import get_current_user
+from app.api.v1.analytics import AcademicAnalytics, academic_trends_state, cached_academic_trends
+from app.api.v1.battle_buddy import BattleBuddyTeamResponse, my_team
+from app.api.v1.courses import CourseResponse
+from app.api.v1.points import LeaderboardEntry, PointsSummary, leaderboard_entries, points_summary
+from app.api.v1.recommendations import (
+    GroupStudyBrotherResponse, MajorMatchBrotherResponse, group_study_brothers, major_match_brothers
+)
+from app.core.user_cache import AuthenticatedUser
+from app.services.course_changes import get_course_version
+from app.services.what_if import current_courses
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+DASHBOARD_LEADERBOARD_LIMIT = 10
+DASHBOARD_RECOMMENDATION_LIMIT = 6  # BrothersInMajor / group study cards
+
+# Connections this worker's summaries may hold beyond their request sessions
+_extra_connections = threading.BoundedSemaphore(settings.DASHBOARD_EXTRA_CONNECTIONS)
+
+
+class SectionCacheHint(BaseModel):
+    max_age: int  # Seconds the client may reuse the section before refetching
+    etag: Optional[str] = None  # Same validator as the section's own endpoint, where it has one
+
+
+class DashboardSummary(BaseModel):
+    academic_trends: Optional[AcademicAnalytics] = None
+    points: Optional[PointsSummary] = None
+    leaderboard: Optional[List[LeaderboardEntry]] = None
+    my_team: Optional[BattleBuddyTeamResponse] = None
+    group_study: Optional[List[GroupStudyBrotherResponse]] = None
+    by_major: Optional[List[MajorMatchBrotherResponse]] = None
+    current_courses: Optional[List[CourseResponse]] = None
+    cache: Dict[str, SectionCacheHint] = {}  # Per requested section
+    errors: Dict[str, str] = {}  # Sections that failed; the others are still returned
+
+
+def _academic_trends(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    etag, version, percentiles, standing = academic_trends_state(db, user.id)
+    return cached_academic_trends(db, user.id, version, percentiles, standing), etag
+
+
+def _points(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    return PointsSummary(**points_summary(db, user.id)), None
+
+
+def _leaderboard(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    return [LeaderboardEntry(**entry) for entry in leaderboard_entries(db, DASHBOARD_LEADERBOARD_LIMIT)], None
+
+
+def _my_team(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    return my_team(db, user.id), None
+
+
+def _group_study(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    return group_study_brothers(db, user.id, limit=DASHBOARD_RECOMMENDATION_LIMIT), None
+
+
+def _by_major(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    return major_match_brothers(db, user, limit=DASHBOARD_RECOMMENDATION_LIMIT), None
+
+
+def _current_courses(db: Session, user: AuthenticatedUser) -> Tuple[Any, Optional[str]]:
+    etag = make_etag("current-courses", user.id.hex, get_course_version(db, user.id))
+    return [CourseResponse.model_validate(course) for course in current_courses(db, user.id)], etag
+
+
+# name -> (loader, max_age seconds). Sections with an ETag use max_age 0 (always revalidate).
+SECTIONS: Dict[str, Tuple[Callable[[Session, AuthenticatedUser], Tuple[Any, Optional[str]]], int]] = {
+    'academic_trends': (_academic_trends, 0),
+    'points': (_points, 30),
+    'leaderboard': (_leaderboard, 60),
+    'my_team': (_my_team, 300),
+    'group_study': (_group_study, 300),
+    'by_major': (_by_major, 300),
+    'current_courses': (_current_courses, 0),
+}
+
+
+def load_sections(db: Session, user: AuthenticatedUser, names: List[str]) -> Dict[str, Any]:
+    """Run each section on db; a failing section's entry is its exception"""
+    results = {}
+    for name in names:
+        loader, _ = SECTIONS[name]
+        try:
+            results[name] = loader(db, user)
+        except Exception as e:
+            db.rollback()  # Leave the session usable for the remaining sections
+            results[name] = e
+    return results
+
+
+def _load_on_own_session(name: str, user: AuthenticatedUser) -> Any:
+    """Run one section on a new session, then give back its extra-connection slot"""
+    db = SessionLocal()
+    try:
+        return load_sections(db, user, [name])[name]
+    finally:
+        db.close()
+        _extra_connections.release()
+
+
+def _submit(func: Callable, *args) -> asyncio.Future:
+    """Like asyncio.to_thread, but submitted right away, so a slot taken for it is always released"""
+    context = contextvars.copy_context()  # Carries the request deadline into the thread
+    return asyncio.get_running_loop().run_in_executor(None, context.run, func, *args)
+
+
+async def run_sections(db: Session, user: AuthenticatedUser, names: List[str]) -> Dict[str, Any]:
+    """
+    Run the sections concurrently: one per free extra-connection slot on its own session,
+    the remainder in one thread on the request's session. Entries are as in load_sections.
+    """
+    concurrent = []
+    # The request session always keeps at least one section
+    while len(concurrent) < len(names) - 1 and _extra_connections.acquire(blocking=False):
+        concurrent.append(names[len(concurrent)])
+    futures = [_submit(_load_on_own_session, name, user) for name in concurrent]
+    futures.append(_submit(load_sections, db, user, names[len(concurrent):]))
+
+    *own_results, results = await asyncio.gather(*futures)
+    results.update(zip(concurrent, own_results))
+    return {name: results[name] for name in names}
+
+
+def parse_sections(sections: Optional[str]) -> List[str]:
+    """Requested section names in SECTIONS order (all of them when none are given)"""
+    if not sections:
+        return list(SECTIONS)
+    requested = {name.strip() for name in sections.split(",") if name.strip()}
+    unknown = requested - set(SECTIONS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown dashboard sections: {', '.join(sorted(unknown))}. Valid sections: {', '.join(SECTIONS)}"
+        )
+    return [name for name in SECTIONS if name in requested]
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    response: Response,
+    sections: Optional[str] = Query(None, description="Comma-separated sections to include (default: all)"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get every dashboard section in one request
+    A failing section is reported in `errors` instead of failing the whole summary
+    """
+    names = parse_sections(sections)
+    results = await run_sections(db, current_user, names)
+
+    summary = DashboardSummary()
+    for name, result in results.items():
+        if isinstance(result, BaseException):
+            logger.warning(f"Dashboard section {name} failed: {result}")
+            summary.errors[name] = "Section could not be loaded"
+            continue
+        data, etag = result
+        setattr(summary, name, data)
+        summary.cache[name] = SectionCacheHint(max_age=SECTIONS[name][1], etag=etag)
+
+    # The summary as a whole is only as fresh as its shortest-lived section
+    max_age = min((hint.max_age for hint in summary.cache.values()), default=0)
+    response.headers["Cache-Control"] = f"private, max-age={max_age}" if max_age else "private, no-cache"
+    return summary
@@ -2,7 +2,7 @@
 Help Request endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session
 from sqlalchemy import desc
 from sqlalchemy.sql import func
 from pydantic import BaseModel, field_validator
@@ -13,8 +13,9 @@ from app.core.database import get_db
 from app.models.help_request import HelpRequest
 from app.models.recommendation import Recommendation
 from app.models.user import User
-from app.models.course import Course
 from app.api.v1.auth import get_current_user
+from app.core.serialization import RowSerializer
+from app.services.recommendation_snapshots import refresh_recommendations
 from sqlalchemy import and_, desc
 
 router = APIRouter()
@@ -58,6 +59,10 @@ class HelpRequestResponse(BaseModel):
         from_attributes = True
 
 
+# Listing serializes rows directly (same output as HelpRequestResponse, without per-row validation)
+HELP_REQUEST_ROWS = RowSerializer(HelpRequestResponse, HelpRequest)
+
+
 @router.post("", response_model=HelpRequestResponse, status_code=status.HTTP_201_CREATED)
 async def create_help_request(
     request_data: HelpRequestCreate,
@@ -102,61 +107,13 @@ async def create_help_request(
             db.commit()
             db.refresh(help_request)
         
-        # Optimized tutor search: Find tutors who have taken this course
-        # Uses composite index (course_code, grade_score, year) for fast lookup
-        # Single query with join to avoid N+1 queries
-        # Prioritize users with the same major as the requester
-        # Note: Use .upper() to match the stored format (course codes are stored in uppercase)
+        # Tutor search: Find tutors who have taken this course
+        # Ranked in SQL (same major first, then grade_score, year) with LIMIT, and stored
+        # in the recommendations table - GET /recommendations/{request_id} serves this snapshot
         try:
-            course_code_upper = request_data.course_code.upper()
-            matching_tutors = db.query(Course).options(
-                joinedload(Course.user)
-            ).join(
-                User, Course.user_id == User.id
-            ).filter(
-                and_(
-                    Course.course_code == course_code_upper,  # Uses index on course_code, matches stored format
-                    Course.user_id != current_user.id,  # Exclude requester
-                    Course.grade_score.isnot(None)  # Only courses with valid grades
-                )
-            ).all()
-            
-            # Sort with major-based prioritization
-            tutors_list = []
-            for course in matching_tutors:
-                helper = course.user
-                if helper is None:
-                    continue  # Skip if user relationship is not loaded
-                
-                same_major = (
-                    current_user.major is not None and 
-                    helper.major is not None and 
-                    current_user.major.lower().strip() == helper.major.lower().strip()
-                )
-                tutors_list.append({
-                    'course': course,
-                    'helper': helper,
-                    'same_major': same_major,
-                    'grade_score': float(course.grade_score) if course.grade_score else 0.0,
-                    'year': course.year or 0,
-                    'semester': course.semester or ''
-                })
-            
-            # Sort: same major first, then by grade_score (desc), year (desc), semester (desc)
-            tutors_list.sort(
-                key=lambda x: (
-                    not x['same_major'],  # False (same major) comes before True (different major)
-                    -x['grade_score'],  # Negative for descending order
-                    -x['year'],  # Negative for descending order
-                    x['semester']  # Ascending for semester
-                )
-            )
-            
-            matching_tutors = [item['course'] for item in tutors_list[:10]]  # Limit to top 10
-            
-            # Note: Recommendations are stored/returned via the recommendations endpoint
-            # This search is performed here to ensure tutors are available when request is created
+            refresh_recommendations(db, help_request, current_user.major)
         except Exception as search_error:
+            db.rollback()
             # If tutor search fails, still return the help request
             # Log the error but don't fail the request creation
             import logging
@@ -178,11 +135,11 @@ async def list_help_requests(
     db: Session = Depends(get_db)
 ):
     """List user's help requests"""
-    requests = db.query(HelpRequest).filter(
+    requests = db.query(*HELP_REQUEST_ROWS.columns).filter(
         HelpRequest.requester_id == current_user.id
     ).order_by(desc(HelpRequest.created_at)).all()
     
-    return requests
+    return HELP_REQUEST_ROWS.response(requests)
 
 
 @router.get("/{request_id}", response_model=HelpRequestResponse)
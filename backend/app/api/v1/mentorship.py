@@ -15,8 +15,8 @@ from app.models.alumni_profile import AlumniProfile
 from app.models.experience import Experience
 from app.models.resume import Resume
 from app.models.mentorship_request import MentorshipRequest, RequestStatus
-from app.core.storage import storage_service
 from app.core.config import settings
+from app.core.majors import normalize_major
 from app.services.points_service import award_points
 from app.models.points import PointsHistory, PointType
 
@@ -492,6 +492,7 @@ async def upload_resume(
     
     # Upload to storage
     try:
+        from app.core.storage import storage_service  # Lazy: boto3 is only needed here
         file_path = storage_service.upload_file(
             content,
             f"alumni/{str(current_user.id)}",
@@ -577,6 +578,7 @@ async def search_mentors(
             query = query.filter(AlumniProfile.id != current_profile.id)
     
     profiles = query.all()
+    major_key = normalize_major(major)
     
     results = []
     for profile in profiles:
@@ -584,12 +586,12 @@ async def search_mentors(
         experiences = db.query(Experience).filter(Experience.alumni_profile_id == profile.id).all()
         resume_count = db.query(Resume).filter(Resume.alumni_profile_id == profile.id).count()
         
-        # Calculate match score based on major similarity
+        # Calculate match score based on major similarity (normalized keys, so "CS" matches "Computer Science")
         match_score = None
-        if major and user.major:
-            if major.lower() == user.major.lower():
+        if major_key and user.major_key:
+            if major_key == user.major_key:
                 match_score = 1.0
-            elif major.lower() in user.major.lower() or user.major.lower() in major.lower():
+            elif major_key in user.major_key or user.major_key in major_key:
                 match_score = 0.7
         
         results.append({
@@ -4,7 +4,7 @@ Points System API endpoints
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from typing import Optional, List
 from datetime import datetime
 import uuid
@@ -28,6 +28,30 @@ class PointsHistoryResponse(BaseModel):
     related_entity_type: Optional[str]
     created_at: str
     
+    @field_validator('id', 'related_user_id', 'related_entity_id', mode='before')
+    @classmethod
+    def convert_uuid_to_str(cls, v):
+        """Convert UUID to string if needed"""
+        if v is not None:
+            return str(v)
+        return v
+    
+    @field_validator('point_type', mode='before')
+    @classmethod
+    def convert_point_type_to_str(cls, v):
+        """Convert PointType to its value"""
+        if isinstance(v, PointType):
+            return v.value
+        return v
+    
+    @field_validator('created_at', mode='before')
+    @classmethod
+    def convert_datetime_to_str(cls, v):
+        """Convert datetime to ISO format string"""
+        if isinstance(v, datetime):
+            return v.isoformat()
+        return v
+    
     class Config:
         from_attributes = True
 
@@ -46,14 +70,10 @@ class PointsSummary(BaseModel):
     recent_activity: List[PointsHistoryResponse]
 
 
-@router.get("/points", response_model=PointsSummary)
-async def get_my_points(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get current user's points and summary - Optimized queries"""
+def points_summary(db: Session, user_id: uuid.UUID) -> dict:
+    """Total points, rank and recent activity of a user"""
     # Get total points (already optimized in service)
-    total_points = get_user_points(db, current_user.id)
+    total_points = get_user_points(db, user_id)
     
     # Optimized: Use index on User.points for O(log n) lookup instead of O(n) scan
     # Count users with more points using indexed query
@@ -64,7 +84,7 @@ async def get_my_points(
     )
     
     # Get recent activity (already paginated with limit=10)
-    recent_history = get_points_history(db, current_user.id, limit=10)
+    recent_history = get_points_history(db, user_id, limit=10)
     
     return {
         "total_points": total_points,
@@ -73,6 +93,15 @@ async def get_my_points(
     }
 
 
+@router.get("/points", response_model=PointsSummary)
+async def get_my_points(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get current user's points and summary - Optimized queries"""
+    return points_summary(db, current_user.id)
+
+
 @router.get("/points/history", response_model=List[PointsHistoryResponse])
 async def get_points_history_endpoint(
     limit: int = 50,
@@ -85,13 +114,8 @@ async def get_points_history_endpoint(
     return history
 
 
-@router.get("/points/leaderboard", response_model=List[LeaderboardEntry])
-async def get_leaderboard(
-    limit: int = 100,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Get leaderboard of top users by points - Optimized with proper indexing"""
+def leaderboard_entries(db: Session, limit: int = 100) -> List[dict]:
+    """Top users by points with their rank"""
     # Optimized: Single query with limit, relies on index on User.points for O(log n + k) complexity
     # where k is the limit (typically 100), much better than O(n)
     top_users = (
@@ -102,7 +126,7 @@ async def get_leaderboard(
     )
     
     # Build response in single pass - O(k) where k is limit
-    leaderboard = [
+    return [
         {
             "user_id": str(user.id),
             "first_name": user.first_name,
@@ -112,8 +136,16 @@ async def get_leaderboard(
         }
         for rank, user in enumerate(top_users, start=1)
     ]
-    
-    return leaderboard
+
+
+@router.get("/points/leaderboard", response_model=List[LeaderboardEntry])
+async def get_leaderboard(
+    limit: int = 100,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get leaderboard of top users by points - Optimized with proper indexing"""
+    return leaderboard_entries(db, limit)
 
 
 @router.get("/points/values")
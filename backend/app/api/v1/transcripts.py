@@ -13,8 +13,9 @@ from app.core.config import settings
 from app.models.transcript import Transcript
 from app.models.user import User
 from app.api.v1.auth import get_current_user
-from app.tasks.process_transcript import process_transcript_task, _process_transcript_internal
-from app.services.pdf_processor import pdf_processor
+from app.core.serialization import RowSerializer
+from app.services.course_changes import courses_changed
+from app.services.course_tutor_index import user_course_codes
 from sqlalchemy import func
 
 router = APIRouter()
@@ -59,6 +60,10 @@ class TranscriptResponse(BaseModel):
         from_attributes = True
 
 
+# Listing reads only the serialized columns (not pdf_content) and skips per-row validation
+TRANSCRIPT_ROWS = RowSerializer(TranscriptResponse, Transcript)
+
+
 @router.post("/upload", response_model=TranscriptResponse, status_code=status.HTTP_202_ACCEPTED)
 async def upload_transcript(
     file: UploadFile = File(...),
@@ -91,11 +96,15 @@ async def upload_transcript(
     
     if existing_transcripts:
         print(f"Deleting {len(existing_transcripts)} previous transcript(s) for user {current_user.id}")
+        deleted_course_codes = user_course_codes(
+            db, current_user.id, [old_transcript.id for old_transcript in existing_transcripts]
+        )
         for old_transcript in existing_transcripts:
             # Delete from database (cascade will delete associated courses)
             db.delete(old_transcript)
         
         db.commit()
+        courses_changed(db, current_user.id, deleted_course_codes)
         print("Previous transcripts deleted successfully")
     
     # Create transcript record with PDF content stored in PostgreSQL
@@ -116,6 +125,8 @@ async def upload_transcript(
     # This ensures courses are saved to PostgreSQL immediately and available for analytics
     # PDF content is now read from the database instead of memory
     try:
+        # Lazy import: pulls in pdfplumber and Celery, only needed for uploads
+        from app.tasks.process_transcript import _process_transcript_internal
         print(f"Processing transcript {transcript.id} synchronously...")
         result = _process_transcript_internal(str(transcript.id), str(current_user.id))
         print(f"Transcript processed: {result.get('status', 'unknown')}")
@@ -190,11 +201,11 @@ async def list_transcripts(
     # Clean up stale pending/processing transcripts before listing
     _cleanup_stale_transcripts(db, current_user.id)
     
-    transcripts = db.query(Transcript).filter(
+    transcripts = db.query(*TRANSCRIPT_ROWS.columns).filter(
         Transcript.user_id == current_user.id
     ).order_by(desc(Transcript.upload_date)).all()
     
-    return transcripts
+    return TRANSCRIPT_ROWS.response(transcripts)
 
 
 @router.get("/{transcript_id}", response_model=TranscriptResponse)
@@ -269,8 +280,10 @@ async def delete_transcript(
     
     # Delete from database (cascade will delete courses)
     # No need to delete from storage since files are no longer stored
+    deleted_course_codes = user_course_codes(db, current_user.id, [transcript.id])
     db.delete(transcript)
     db.commit()
+    courses_changed(db, current_user.id, deleted_course_codes)
     
     return None
 
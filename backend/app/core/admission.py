@@ -0,0 +1,123 @@
+"""
+Admission control
+
+Limits how many requests of each route class run at once in this worker, with
+a bounded wait queue per class. Requests beyond the queue are shed immediately
+so expensive endpoints (uploads, bcrypt, cross-user scans) cannot starve cheap
+ones.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.route_classes import RouteClass, classify_route
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class RouteClassLimiter:
+    """Concurrency limit plus a bounded wait queue for one route class"""
+
+    def __init__(self, route_class: RouteClass, concurrency: int, queue_depth: int):
+        self.route_class = route_class
+        self.concurrency = concurrency
+        self.queue_depth = queue_depth
+        self.active = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def _publish_gauges(self) -> None:
+        metrics.set_gauge(f"admission.{self.route_class.value}.active", self.active)
+        metrics.set_gauge(f"admission.{self.route_class.value}.waiting", self.waiting)
+
+    async def acquire(self, timeout: float) -> None:
+        """
+        Wait for a slot. Raises AdmissionRejected with 429 when the queue is
+        full, or 503 when no slot frees up within timeout.
+        """
+        name = self.route_class.value
+        if self._semaphore.locked():
+            if self.waiting >= self.queue_depth:
+                metrics.increment(f"admission.{name}.rejected_queue_full")
+                raise AdmissionRejected(429, "Too many requests of this kind right now. Please try again shortly.")
+            self.waiting += 1
+            self._publish_gauges()
+        else:
+            # Fast path: a slot is free, no queueing
+            await self._semaphore.acquire()
+            self.active += 1
+            self._publish_gauges()
+            metrics.observe(f"admission.{name}.queue_wait", 0.0)
+            return
+
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=timeout)
+        except asyncio.TimeoutError:
+            metrics.increment(f"admission.{name}.rejected_timeout")
+            raise AdmissionRejected(503, "Server is busy. Please try again shortly.")
+        finally:
+            self.waiting -= 1
+            metrics.observe(f"admission.{name}.queue_wait", time.monotonic() - queued_at)
+            self._publish_gauges()
+        self.active += 1
+        self._publish_gauges()
+
+    def release(self) -> None:
+        """Free the slot taken by acquire()"""
+        self.active -= 1
+        self._semaphore.release()
+        self._publish_gauges()
+
+
+def _build_limiters() -> Dict[RouteClass, RouteClassLimiter]:
+    """Create one limiter per route class from settings"""
+    limits = {
+        RouteClass.UPLOAD: (settings.ADMISSION_UPLOAD_CONCURRENCY, settings.ADMISSION_UPLOAD_QUEUE),
+        RouteClass.AUTH: (settings.ADMISSION_AUTH_CONCURRENCY, settings.ADMISSION_AUTH_QUEUE),
+        RouteClass.HEAVY_READ: (settings.ADMISSION_HEAVY_READ_CONCURRENCY, settings.ADMISSION_HEAVY_READ_QUEUE),
+        RouteClass.LIGHT_READ: (settings.ADMISSION_LIGHT_READ_CONCURRENCY, settings.ADMISSION_LIGHT_READ_QUEUE),
+    }
+    return {
+        route_class: RouteClassLimiter(route_class, concurrency, queue_depth)
+        for route_class, (concurrency, queue_depth) in limits.items()
+    }
+
+
+class AdmissionControlMiddleware(BaseHTTPMiddleware):
+    """Apply per-route-class concurrency limits and shed excess load"""
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.limiters = _build_limiters()
+
+    async def dispatch(self, request: Request, call_next):
+        route_class = classify_route(request.method, request.url.path)
+        limiter = self.limiters[route_class]
+        try:
+            await limiter.acquire(settings.ADMISSION_QUEUE_TIMEOUT_SECONDS)
+        except AdmissionRejected as e:
+            logger.warning(f"Request shed ({e.status_code}): {request.method} {request.url.path} ({route_class.value})")
+            return JSONResponse(
+                status_code=e.status_code,
+                content={"detail": e.detail},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)}
+            )
+        try:
+            return await call_next(request)
+        finally:
+            limiter.release()
@@ -1,12 +1,13 @@
 """
 Database Configuration
 """
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import OperationalError, DisconnectionError
 from fastapi import HTTPException, status
 from app.core.config import settings
+from app.core.deadlines import DeadlineExceeded, statement_timeout_ms
 
 # Try to import psycopg2 errors for more specific error handling
 try:
@@ -48,8 +49,8 @@ if "sslmode" not in database_url.lower():
 engine = create_engine(
     database_url,
     pool_pre_ping=True,  # Verify connections before using them (prevents stale connections)
-    pool_size=10,
-    max_overflow=20,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
     pool_recycle=3600,  # Recycle connections after 1 hour to prevent stale connections
     pool_reset_on_return='commit',  # Reset connections on return to pool
     echo=False,  # Set to True for SQL query logging (useful for debugging)
@@ -64,6 +65,32 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    """Apply the remaining request budget as statement_timeout for this transaction"""
+    if not settings.REQUEST_DEADLINES_ENABLED:
+        return
+    timeout_ms = statement_timeout_ms()
+    if timeout_ms is not None:
+        # SET LOCAL only lasts until commit/rollback, so it is re-applied on every begin
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def _is_statement_timeout(e: Exception) -> bool:
+    """Check if an error is Postgres cancelling a statement (statement_timeout)"""
+    original_error = getattr(e, 'orig', e)
+    # 57014 = query_canceled
+    return getattr(original_error, 'pgcode', None) == '57014'
+
+
+def _deadline_exceeded_error() -> HTTPException:
+    """HTTPException returned when a request runs past its deadline"""
+    return HTTPException(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        detail="Request took too long to process. Please try again."
+    )
+
+
 def _handle_database_error(e: Exception) -> HTTPException:
     """Handle database connection errors and return appropriate HTTPException"""
     error_msg = str(e)
@@ -114,6 +141,10 @@ def get_db():
             try:
                 db.execute(text("SELECT 1"))
                 break  # Connection is good, exit retry loop
+            except DeadlineExceeded:
+                # No budget left (e.g. spent waiting on retries) - don't hold a connection
+                db.close()
+                raise _deadline_exceeded_error()
             except (OperationalError, DisconnectionError) as e:
                 # Connection test failed, close and retry
                 if db:
@@ -157,6 +188,13 @@ def get_db():
     # Yield the session and handle errors
     try:
         yield db
+    except DeadlineExceeded:
+        # Request budget ran out before a new transaction could start
+        try:
+            db.rollback()
+        except:
+            pass
+        raise _deadline_exceeded_error()
     except (OperationalError, DisconnectionError) as e:
         # Connection error during use
         if db:
@@ -165,6 +203,8 @@ def get_db():
                 db.close()
             except:
                 pass
+        if _is_statement_timeout(e):
+            raise _deadline_exceeded_error()
         raise _handle_database_error(e)
     except Exception as e:
         # Other errors during use
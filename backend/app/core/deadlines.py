@@ -0,0 +1,84 @@
+"""
+Per-request deadlines
+
+Each request gets a time budget based on its route class. The deadline is kept
+in a context variable so the database layer can apply the remaining time as
+Postgres statement_timeout, and the middleware answers 504 once it runs out.
+"""
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from app.core.config import settings
+from app.core.route_classes import RouteClass, classify_route
+
+logger = logging.getLogger(__name__)
+
+# Absolute deadline (time.monotonic()) for the request being handled, if any
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+# Never hand Postgres a timeout below this - a 0 statement_timeout means "no limit"
+MIN_STATEMENT_TIMEOUT_MS = 1
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work is started after the request deadline has passed"""
+
+
+def get_budget_seconds(route_class: RouteClass) -> float:
+    """Return the configured time budget for a route class"""
+    budgets = {
+        RouteClass.UPLOAD: settings.REQUEST_DEADLINE_UPLOAD_SECONDS,
+        RouteClass.AUTH: settings.REQUEST_DEADLINE_AUTH_SECONDS,
+        RouteClass.HEAVY_READ: settings.REQUEST_DEADLINE_HEAVY_READ_SECONDS,
+        RouteClass.LIGHT_READ: settings.REQUEST_DEADLINE_LIGHT_READ_SECONDS,
+    }
+    return budgets[route_class]
+
+
+def remaining_seconds() -> Optional[float]:
+    """Seconds left before the current request's deadline (None outside a request)"""
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def statement_timeout_ms() -> Optional[int]:
+    """
+    Remaining budget as a Postgres statement_timeout in milliseconds.
+    Returns None when there is no deadline (background tasks, scripts).
+    Raises DeadlineExceeded when the budget is already spent.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return None
+    if remaining <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
+    return max(int(remaining * 1000), MIN_STATEMENT_TIMEOUT_MS)
+
+
+class DeadlineMiddleware(BaseHTTPMiddleware):
+    """Assign a deadline to every request and return 504 when it is exhausted"""
+
+    async def dispatch(self, request: Request, call_next):
+        route_class = classify_route(request.method, request.url.path)
+        budget = get_budget_seconds(route_class)
+        token = _request_deadline.set(time.monotonic() + budget)
+        try:
+            return await asyncio.wait_for(call_next(request), timeout=budget)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Request deadline exceeded: {request.method} {request.url.path} "
+                f"({route_class.value}, budget {budget}s)"
+            )
+            return JSONResponse(
+                status_code=504,
+                content={"detail": "Request took too long to process. Please try again."}
+            )
+        finally:
+            _request_deadline.reset(token)
@@ -0,0 +1,158 @@
+"""
+HTTP conditional request helpers
+
+ETags are derived from version counters, so a matching If-None-Match can be
+answered with 304 Not Modified without recomputing the response.
+
+HTTPCacheMiddleware does this for the stable shared endpoints in _CACHE_RULES:
+their ETag comes from cache_versions counters (bumped by Postgres triggers on
+every write to the underlying tables, or by the application right after the
+write commits for the hot leaderboard) plus the query string, so a matching
+If-None-Match is answered before the handler - and its auth, session and
+queries - runs. Per-user endpoints set their own validators (academic-trends).
+"""
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+from fastapi import Request, Response
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.security import decode_access_token
+from app.models.cache_version import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from version parts, e.g. make_etag("trends", user_id, 3) -> '"trends-<id>-3"'"""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match contains etag (weak comparison, per RFC 9110)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return etag in candidates
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """Empty 304 response carrying the validators"""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+@lru_cache(maxsize=1)
+def _point_values_version() -> str:
+    """Point values only change with a deploy - version them by content"""
+    from app.services.points_service import POINT_VALUES
+    values = sorted((point_type.value, value) for point_type, value in POINT_VALUES.items())
+    return hashlib.blake2b(repr(values).encode(), digest_size=4).hexdigest()
+
+
+class CachePolicy(NamedTuple):
+    """How one route is validated and cached"""
+    name: str  # ETag prefix
+    counters: Tuple[str, ...]  # cache_versions rows the response depends on
+    cache_control: str
+    private: bool = True  # Requires a valid bearer token before a 304 is answered
+    static_version: Optional[Callable[[], str]] = None  # Version for data that only changes with a deploy
+
+
+# (method, exact path, policy). Paths include /api/v1. Counters are bumped by the
+# triggers in alembic/versions/create_cache_versions.py, except leaderboard
+# (points_service.leaderboard_changed, after commit - its ETag may briefly trail a write).
+_TEAMS_POLICY = CachePolicy("teams", ("battle_buddy_teams",), "private, no-cache")
+_CLASS_POSTS_POLICY = CachePolicy("class-posts", ("class_posts",), "private, no-cache")
+_CACHE_RULES = [
+    ("GET", "/api/v1/points/values", CachePolicy(
+        "point-values", (), "public, max-age=3600", private=False, static_version=_point_values_version
+    )),
+    ("GET", "/api/v1/points/leaderboard", CachePolicy("leaderboard", ("leaderboard",), "private, max-age=15")),
+    ("GET", "/api/v1/battle-buddy/teams/list", _TEAMS_POLICY),
+    ("GET", "/api/v1/admin/battle-buddy/teams/list", _TEAMS_POLICY),
+    ("GET", "/api/v1/class-posts", _CLASS_POSTS_POLICY),
+    ("GET", "/api/v1/class-posts/search", _CLASS_POSTS_POLICY),
+]
+
+
+def cache_policy(method: str, path: str) -> Optional[CachePolicy]:
+    """The caching policy for a request method and path, if the route is cached"""
+    method = method.upper()
+    path = path.rstrip("/") or "/"
+    for rule_method, rule_path, policy in _CACHE_RULES:
+        if rule_method == method and rule_path == path:
+            return policy
+    return None
+
+
+def read_versions(counters: Sequence[str]) -> Dict[str, int]:
+    """Current value of each counter (0 for counters without a row)"""
+    db = SessionLocal()
+    try:
+        rows = db.query(CacheVersion.name, CacheVersion.version).filter(CacheVersion.name.in_(counters)).all()
+    finally:
+        db.close()
+    versions = dict.fromkeys(counters, 0)
+    versions.update({name: int(version) for name, version in rows})
+    return versions
+
+
+def _query_tag(request: Request) -> str:
+    """Short digest of the (sorted) query parameters - each query is its own representation"""
+    params = sorted(request.query_params.multi_items())
+    if not params:
+        return "0"
+    return hashlib.blake2b(repr(params).encode(), digest_size=4).hexdigest()
+
+
+def _has_valid_token(request: Request) -> bool:
+    """True if the request carries a bearer token that decodes (signature and expiry)"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and bool(token) and decode_access_token(token) is not None
+
+
+async def policy_etag(request: Request, policy: CachePolicy) -> str:
+    """Current ETag of a cached route for this request's query"""
+    parts = [policy.name]
+    if policy.counters:
+        versions = await run_in_threadpool(read_versions, policy.counters)
+        parts.extend(versions[name] for name in policy.counters)
+    if policy.static_version is not None:
+        parts.append(policy.static_version())
+    parts.append(_query_tag(request))
+    return make_etag(*parts)
+
+
+class HTTPCacheMiddleware(BaseHTTPMiddleware):
+    """Answer If-None-Match for cached routes without running the handler; add validators to 200s"""
+
+    async def dispatch(self, request: Request, call_next):
+        policy = cache_policy(request.method, request.url.path)
+        # Without a valid token the handler runs and answers 401 - a 304 must not bypass auth
+        if policy is None or (policy.private and not _has_valid_token(request)):
+            return await call_next(request)
+
+        try:
+            etag = await policy_etag(request, policy)
+        except Exception as e:
+            # Validators are an optimization - serve the request normally
+            logger.warning(f"HTTP cache: could not read versions for {request.url.path}: {e}")
+            return await call_next(request)
+
+        if etag_matches(request, etag):
+            metrics.increment(f"http_cache.{policy.name}.not_modified")
+            return not_modified(etag, policy.cache_control)
+
+        metrics.increment(f"http_cache.{policy.name}.miss")
+        response = await call_next(request)
+        # Versions are read before the handler runs, so the body is never older than its ETag
+        if response.status_code == 200:
+            response.headers.setdefault("ETag", etag)
+            response.headers.setdefault("Cache-Control", policy.cache_control)
+        return response
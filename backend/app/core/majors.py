@@ -0,0 +1,65 @@
+"""
+Major normalization
+
+All major comparisons go through normalize_major(): case, punctuation and
+whitespace are ignored, and common abbreviations map to one canonical name
+(e.g. "CS", "Comp Sci" and "computer science" all match). The result is stored
+in users.major_key (indexed), so same-major lookups are index lookups.
+"""
+import re
+from typing import Dict, Optional
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+# Canonical major -> alternative spellings (already in normalized form)
+CANONICAL_MAJORS: Dict[str, list] = {
+    "computer science": ["cs", "comp sci", "compsci", "computer sciences"],
+    "computer engineering": ["comp e", "compe", "cpe", "cmpe"],
+    "electrical engineering": ["ee", "elec eng"],
+    "electrical and computer engineering": ["ece"],
+    "mechanical engineering": ["mech e", "meche", "mech eng"],
+    "civil engineering": ["civil e", "civ eng"],
+    "chemical engineering": ["chem e", "cheme"],
+    "biomedical engineering": ["bme", "biomed eng"],
+    "industrial engineering": ["ie", "ise", "industrial and systems engineering"],
+    "aerospace engineering": ["aero", "aero e", "aeroe"],
+    "software engineering": ["se", "swe"],
+    "information technology": ["it"],
+    "information systems": ["management information systems", "mis"],
+    "data science": ["ds"],
+    "mathematics": ["math", "maths"],
+    "applied mathematics": ["applied math"],
+    "statistics": ["stats", "stat"],
+    "physics": ["phys"],
+    "chemistry": ["chem"],
+    "biology": ["bio", "biological sciences", "biological science"],
+    "biochemistry": ["biochem"],
+    "neuroscience": ["neuro"],
+    "psychology": ["psych"],
+    "economics": ["econ"],
+    "political science": ["poli sci", "polisci", "political sciences"],
+    "business administration": ["business admin", "bba", "business"],
+    "accounting": ["acct", "accountancy"],
+    "finance": ["fin"],
+    "marketing": ["mktg"],
+    "kinesiology": ["kin", "kines"],
+    "communications": ["communication", "comm", "comms"],
+    "international relations": ["ir"],
+    "architecture": ["arch"],
+}
+
+_ALIASES: Dict[str, str] = {
+    alias: canonical
+    for canonical, aliases in CANONICAL_MAJORS.items()
+    for alias in aliases
+}
+
+
+def normalize_major(major: Optional[str]) -> Optional[str]:
+    """Comparison key for a major, or None if empty"""
+    if major is None:
+        return None
+    key = " ".join(_NON_ALPHANUMERIC.sub(" ", major.lower().replace("&", " and ")).split())
+    if not key:
+        return None
+    return _ALIASES.get(key, key)
@@ -0,0 +1,54 @@
+"""
+In-process metrics
+
+Lightweight counters, gauges and timing summaries for the current worker.
+Exposed as JSON by the /metrics endpoint.
+"""
+import threading
+from typing import Dict
+
+
+class MetricsRegistry:
+    """Thread-safe registry of counters, gauges and timing summaries"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._gauges: Dict[str, float] = {}
+        self._timings: Dict[str, Dict[str, float]] = {}
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """Add value to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value"""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a duration in a timing summary (count, total, max)"""
+        with self._lock:
+            timing = self._timings.setdefault(name, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            timing["count"] += 1
+            timing["total_seconds"] += seconds
+            timing["max_seconds"] = max(timing["max_seconds"], seconds)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Return a copy of all metrics, with average durations for timings"""
+        with self._lock:
+            timings = {}
+            for name, timing in self._timings.items():
+                timings[name] = {
+                    **timing,
+                    "avg_seconds": timing["total_seconds"] / timing["count"] if timing["count"] else 0.0,
+                }
+            return {
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "timings": timings,
+            }
+
+
+metrics = MetricsRegistry()
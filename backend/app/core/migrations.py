@@ -0,0 +1,89 @@
+"""
+Database migrations
+
+Runs Alembic migrations under a Postgres advisory lock so that only one
+process applies them at a time. Run as a pre-deploy step, not at app startup:
+
+    python -m app.core.migrations
+"""
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_ID = 72035411
+
+
+def normalize_database_url(database_url: str) -> str:
+    """Normalize DATABASE_URL for SQLAlchemy/Alembic (scheme and sslmode)"""
+    if database_url.startswith("https://"):
+        database_url = database_url.replace("https://", "postgresql://", 1)
+    elif database_url.startswith("http://"):
+        database_url = database_url.replace("http://", "postgresql://", 1)
+
+    # Add sslmode if not present and it's a production database
+    if "sslmode" not in database_url.lower():
+        is_production = (
+            "railway" in database_url.lower() or
+            "amazonaws.com" in database_url.lower() or
+            "heroku" in database_url.lower() or
+            "render.com" in database_url.lower()
+        )
+        if is_production:
+            separator = "&" if "?" in database_url else "?"
+            database_url = f"{database_url}{separator}sslmode=require"
+
+    return database_url
+
+
+def run_migrations() -> bool:
+    """
+    Upgrade the database to head while holding the migration advisory lock.
+    Returns True if migrations ran, False if DATABASE_URL is not set.
+    Raises on migration failure.
+    """
+    from alembic.config import Config
+    from alembic import command
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    database_url = os.getenv("DATABASE_URL", "")
+    if not database_url:
+        logger.warning("⚠ DATABASE_URL not set, skipping migrations")
+        return False
+    database_url = normalize_database_url(database_url)
+
+    alembic_cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    alembic_cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    alembic_cfg.set_main_option("sqlalchemy.url", database_url)
+
+    lock_engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        # AUTOCOMMIT so the lock connection doesn't sit idle in a transaction during the upgrade
+        with lock_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            logger.info("Waiting for migration lock...")
+            conn.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+            try:
+                logger.info("Running database migrations...")
+                command.upgrade(alembic_cfg, "head")
+                logger.info("✓ Database migrations: Applied")
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+    finally:
+        lock_engine.dispose()
+
+    return True
+
+
+if __name__ == "__main__":
+    import sys
+    logging.basicConfig(level=logging.INFO)
+    try:
+        run_migrations()
+    except Exception as e:
+        logger.error(f"⚠ Database migrations failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,46 @@
+"""
+Route classification
+
+Groups endpoints by their cost profile so per-class policies (time budgets,
+concurrency limits) can be applied without touching every router.
+"""
+import enum
+
+
+class RouteClass(str, enum.Enum):
+    """Cost classes for API routes"""
+    UPLOAD = "upload"  # PDF/resume uploads - synchronous parsing, large bodies
+    AUTH = "auth"  # bcrypt-bound endpoints (login, register, change-password)
+    HEAVY_READ = "heavy_read"  # Cross-user scans and aggregations
+    LIGHT_READ = "light_read"  # Everything else - single-user lookups and small writes
+
+
+# (method, path prefix) pairs, checked in order. Method None matches any method.
+# Prefixes are matched against the full request path including /api/v1.
+_ROUTE_RULES = [
+    ("POST", "/api/v1/transcripts/upload", RouteClass.UPLOAD),
+    ("POST", "/api/v1/mentorship/resumes", RouteClass.UPLOAD),
+    ("POST", "/api/v1/auth/login", RouteClass.AUTH),
+    ("POST", "/api/v1/auth/register", RouteClass.AUTH),
+    ("POST", "/api/v1/auth/change-password", RouteClass.AUTH),
+    (None, "/api/v1/analytics", RouteClass.HEAVY_READ),
+    (None, "/api/v1/recommendations", RouteClass.HEAVY_READ),
+    (None, "/api/v1/dashboard", RouteClass.HEAVY_READ),  # Includes trends, leaderboard and recommendations
+    ("POST", "/api/v1/help-requests", RouteClass.HEAVY_READ),  # Runs a tutor search on create
+    (None, "/api/v1/points/leaderboard", RouteClass.HEAVY_READ),
+    (None, "/api/v1/mentorship/search", RouteClass.HEAVY_READ),
+    (None, "/api/v1/courses/search", RouteClass.HEAVY_READ),
+    (None, "/api/v1/class-posts/search", RouteClass.HEAVY_READ),
+    (None, "/api/v1/admin/users/search", RouteClass.HEAVY_READ),
+]
+
+
+def classify_route(method: str, path: str) -> RouteClass:
+    """Return the cost class for a request method and path"""
+    method = method.upper()
+    for rule_method, prefix, route_class in _ROUTE_RULES:
+        if rule_method is not None and rule_method != method:
+            continue
+        if path == prefix or path.startswith(prefix + "/"):
+            return route_class
+    return RouteClass.LIGHT_READ
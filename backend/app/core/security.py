@@ -1,13 +1,36 @@
 """
 Security utilities (JWT, password hashing)
 """
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import metrics
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# min/max rounds pin the cost factor so hashes made with a different BCRYPT_ROUNDS
+# are reported by verify_and_update and transparently rehashed on login
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt is CPU-bound (~100-300ms per call), so it runs in a dedicated bounded pool
+# instead of blocking the event loop inside async handlers
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_hash_pending = 0  # Jobs submitted and not yet finished (running + queued)
+_hash_pending_lock = threading.Lock()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,6 +51,67 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _update_hash_pool_gauges() -> None:
+    """Publish pool occupancy (caller holds _hash_pending_lock)"""
+    metrics.set_gauge("password_hash.in_flight", _hash_pending)
+    metrics.set_gauge("password_hash.queue_length", max(_hash_pending - settings.PASSWORD_HASH_WORKERS, 0))
+
+
+def _release_hash_slot(_future) -> None:
+    """Done-callback: free the slot once the bcrypt call has actually finished"""
+    global _hash_pending
+    with _hash_pending_lock:
+        _hash_pending -= 1
+        _update_hash_pool_gauges()
+
+
+async def _run_in_hash_pool(func, *args):
+    """
+    Run a password hashing function in the bounded pool.
+    Raises HTTP 429 when the pool's queue is full.
+    """
+    global _hash_pending
+    max_pending = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+    with _hash_pending_lock:
+        if _hash_pending >= max_pending:
+            metrics.increment("password_hash.rejected")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many sign-in attempts right now. Please try again in a moment.",
+                headers={"Retry-After": "1"}
+            )
+        _hash_pending += 1
+        _update_hash_pool_gauges()
+    
+    submitted_at = time.monotonic()
+    
+    def _timed_call():
+        metrics.observe("password_hash.queue_wait", time.monotonic() - submitted_at)
+        return func(*args)
+    
+    future = _hash_executor.submit(_timed_call)
+    future.add_done_callback(_release_hash_slot)
+    return await asyncio.wrap_future(future)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password against its hash without blocking the event loop"""
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and check whether its hash uses the configured cost factor.
+    Returns (is_valid, new_hash) - new_hash is set when the stored hash should be replaced.
+    """
+    return await _run_in_hash_pool(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password without blocking the event loop"""
+    return await _run_in_hash_pool(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token"""
     to_encode = data.copy()
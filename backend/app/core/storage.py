@@ -4,15 +4,18 @@ Object Storage Service (S3/MinIO)
 import boto3
 from botocore.exceptions import ClientError
 from app.core.config import settings
+import threading
 import uuid
 from typing import Optional
 
 
 class StorageService:
     def __init__(self):
+        # The client is created lazily (on first use, or in the background at app startup) so that
+        # importing this module never blocks on network calls to S3
         self.s3_client = None
         self.bucket_name = settings.S3_BUCKET_NAME
-        self._initialize_client()
+        self._init_lock = threading.Lock()
     
     def _initialize_client(self):
         """Initialize S3 client - gracefully handles failures without crashing"""
@@ -51,7 +54,10 @@ class StorageService:
     def _reinitialize_if_needed(self):
         """Reinitialize client if it's None (lazy initialization)"""
         if self.s3_client is None:
-            self._initialize_client()
+            # Lock so a request arriving during background initialization waits for it
+            with self._init_lock:
+                if self.s3_client is None:
+                    self._initialize_client()
     
     def _validate_bucket_name(self, bucket_name: str) -> bool:
         """Validate S3 bucket name according to AWS rules"""
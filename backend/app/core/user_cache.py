@@ -0,0 +1,79 @@
+"""
+Authenticated user cache
+
+Keeps a read-only projection of the users that authenticated recently so
+get_current_user does not hit the database on every request. Entries are keyed
+by (user_id, token) and must be invalidated whenever a user's profile or
+points change.
+"""
+import time
+import uuid
+from typing import Optional
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class AuthenticatedUser(BaseModel):
+    """Read-only projection of User with the fields handlers need from current_user"""
+    id: uuid.UUID
+    email: str
+    first_name: str
+    last_name: str
+    pledge_class: Optional[str] = None
+    graduation_year: Optional[int] = None
+    major: Optional[str] = None
+    phone_number: Optional[str] = None
+    is_alumni: bool = False
+    points: int = 0
+
+    class Config:
+        from_attributes = True
+        frozen = True
+
+
+_user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def get_cached_user(user_id: uuid.UUID, token: str) -> Optional[AuthenticatedUser]:
+    """Return the cached projection for this user and token, if any"""
+    return _user_cache.get((user_id, token))
+
+
+def cache_user(user, token: str, token_expires_at: Optional[float] = None) -> AuthenticatedUser:
+    """
+    Build the projection for a User row and cache it.
+    The entry never outlives the token it was validated for.
+    """
+    projection = AuthenticatedUser(
+        id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        pledge_class=user.pledge_class,
+        graduation_year=user.graduation_year,
+        major=user.major,
+        phone_number=user.phone_number,
+        is_alumni=bool(user.is_alumni),
+        points=user.points or 0,
+    )
+    ttl = None
+    if token_expires_at is not None:
+        ttl = token_expires_at - time.time()
+    _user_cache.set((user.id, token), projection, ttl_seconds=ttl)
+    return projection
+
+
+def invalidate_user(user_id: uuid.UUID) -> None:
+    """Drop every cached entry (all tokens) for a user"""
+    if isinstance(user_id, str):
+        user_id = uuid.UUID(user_id)
+    _user_cache.discard_where(lambda key: key[0] == user_id)
+
+
+def clear_user_cache() -> None:
+    """Drop all cached users"""
+    _user_cache.clear()
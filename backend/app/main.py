@@ -4,9 +4,15 @@ NuPeer - Main FastAPI Application
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
+import threading
 from typing import List
-from app.api.v1 import auth, transcripts, courses, help_requests, recommendations, analytics, mentorship, points, admin, battle_buddy, academic_teams, class_posts
+from app.api.v1 import auth, transcripts, courses, help_requests, recommendations, analytics, mentorship, points, admin, battle_buddy, academic_teams, class_posts, dashboard
 from app.core.config import settings
+from app.core.deadlines import DeadlineMiddleware
+from app.core.admission import AdmissionControlMiddleware
+from app.core.http_cache import HTTPCacheMiddleware
+from app.core.metrics import metrics
+from app.core.serialization import ORJSONResponse
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +23,8 @@ app = FastAPI(
     description="Sigma Nu Zeta Chi Class Matching System",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse  # orjson instead of json.dumps for every response
 )
 
 def normalize_cors_origins(origins: List[str]) -> List[str]:
@@ -107,6 +114,18 @@ cors_origins_list = get_cors_origins()
 logger.info(f"CORS Origins configured: {cors_origins_list}")
 logger.info(f"CORS Origins count: {len(cors_origins_list)}")
 
+# Request deadlines and admission control - added before CORS so CORS stays outermost
+# and 429/503/504 responses still carry CORS headers.
+# Middleware added later wraps earlier ones: admission runs first, so time spent
+# waiting for a slot does not count against the request deadline.
+if settings.REQUEST_DEADLINES_ENABLED:
+    app.add_middleware(DeadlineMiddleware)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+# HTTP caching wraps admission: revalidations answered with 304 never wait for a slot
+if settings.HTTP_CACHE_ENABLED:
+    app.add_middleware(HTTPCacheMiddleware)
+
 # CORS middleware - must be added before routers
 # max_age=3600 caches preflight responses for 1 hour
 app.add_middleware(
@@ -134,55 +153,30 @@ app.include_router(battle_buddy.router, prefix="/api/v1/admin/battle-buddy", tag
 app.include_router(battle_buddy.router, prefix="/api/v1/battle-buddy", tags=["Battle Buddy"])
 app.include_router(academic_teams.router, prefix="/api/v1/admin/academic-teams", tags=["Academic Teams"])
 app.include_router(class_posts.router, prefix="/api/v1/class-posts", tags=["Class Posts"])
+app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["Dashboard"])
+
+def _initialize_storage():
+    """Import and initialize the storage service, then log its status"""
+    try:
+        from app.core.storage import storage_service
+        storage_service._reinitialize_if_needed()
+        if storage_service.s3_client:
+            logger.info("✓ Storage service: Available")
+        else:
+            logger.debug("Storage service: Not available (S3 credentials not configured or invalid)")
+            logger.debug("Application will continue - file uploads will fail until S3 is configured")
+    except Exception as e:
+        logger.debug(f"Storage service: Error checking - {str(e)}")
+        logger.debug("Application will continue - storage is optional")
+
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information - storage and database are checked, migrations are run"""
+    """Log startup information - database is checked, storage initializes in the background"""
     logger.info("=== Application Startup ===")
     
-    # Run database migrations first (before checking connection)
-    try:
-        from alembic.config import Config
-        from alembic import command
-        import os
-        
-        # Get DATABASE_URL from environment (alembic.ini will be overridden)
-        database_url = os.getenv("DATABASE_URL", "")
-        if database_url:
-            # Normalize DATABASE_URL for Alembic
-            if database_url.startswith("https://"):
-                database_url = database_url.replace("https://", "postgresql://", 1)
-            elif database_url.startswith("http://"):
-                database_url = database_url.replace("http://", "postgresql://", 1)
-            
-            # Add sslmode if not present and it's a production database
-            if "sslmode" not in database_url.lower():
-                is_production = (
-                    "railway" in database_url.lower() or
-                    "amazonaws.com" in database_url.lower() or
-                    "heroku" in database_url.lower() or
-                    "render.com" in database_url.lower()
-                )
-                if is_production:
-                    separator = "&" if "?" in database_url else "?"
-                    database_url = f"{database_url}{separator}sslmode=require"
-            
-            # Configure Alembic
-            alembic_cfg = Config("alembic.ini")
-            alembic_cfg.set_main_option("sqlalchemy.url", database_url)
-            
-            # Run migrations
-            logger.info("Running database migrations...")
-            command.upgrade(alembic_cfg, "head")
-            logger.info("✓ Database migrations: Applied")
-        else:
-            logger.warning("⚠ DATABASE_URL not set, skipping migrations")
-    except Exception as e:
-        logger.error(f"⚠ Database migrations failed: {str(e)}")
-        logger.error("  Tables may not exist. Check DATABASE_URL and migration files.")
-        logger.error("  Application will start, but database operations may fail")
-        import traceback
-        logger.debug(traceback.format_exc())
+    # Migrations are not run here - they run once per deploy as a pre-deploy step
+    # (python -m app.core.migrations), so worker startup stays fast
     
     # Check database connection (non-blocking, just log status)
     try:
@@ -196,17 +190,9 @@ async def startup_event():
         logger.warning("  Application will start, but database operations will fail")
         logger.warning("  Check DATABASE_URL environment variable in Railway")
     
-    # Check storage service (optional)
-    try:
-        from app.core.storage import storage_service
-        if storage_service.s3_client:
-            logger.info("✓ Storage service: Available")
-        else:
-            logger.debug("Storage service: Not available (S3 credentials not configured or invalid)")
-            logger.debug("Application will continue - file uploads will fail until S3 is configured")
-    except Exception as e:
-        logger.debug(f"Storage service: Error checking - {str(e)}")
-        logger.debug("Application will continue - storage is optional")
+    # Initialize storage service in the background (optional) - importing boto3 and
+    # checking the bucket can take seconds and must not delay health checks
+    threading.Thread(target=_initialize_storage, name="storage-init", daemon=True).start()
     
     logger.info("=== Application Startup Complete ===")
 
@@ -238,6 +224,12 @@ async def health_check():
         }
 
 
+@app.get("/metrics")
+async def get_metrics():
+    """In-process metrics for this worker (queue lengths, wait times, rejections)"""
+    return metrics.snapshot()
+
+
 @app.get("/debug/cors")
 async def debug_cors():
     """Debug endpoint to check CORS configuration"""
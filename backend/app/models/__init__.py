@@ -12,11 +12,16 @@ from app.models.battle_buddy import BattleBuddyTeam, BattleBuddyMember
 from app.models.academic_team import AcademicTeam, AcademicTeamMember
 from app.models.tagged_member import TaggedMember
 from app.models.class_post import ClassPost
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user_academic_summary import UserAcademicSummary
+from app.models.course_grade_stats import CourseGradeStats
+from app.models.cache_version import CacheVersion
 
 __all__ = [
     "User", "Transcript", "Course", "HelpRequest", "Recommendation", 
     "AlumniProfile", "Experience", "Resume", "MentorshipRequest", "RequestStatus",
     "PointsHistory", "PointType", "BattleBuddyTeam", "BattleBuddyMember",
-    "AcademicTeam", "AcademicTeamMember", "TaggedMember", "ClassPost"
+    "AcademicTeam", "AcademicTeamMember", "TaggedMember", "ClassPost",
+    "CourseTutorIndex", "UserAcademicSummary", "CourseGradeStats", "CacheVersion"
 ]
 
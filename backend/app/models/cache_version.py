@@ -0,0 +1,19 @@
+"""
+Cache Version Model - Version counters for HTTP validators
+"""
+from sqlalchemy import Column, String, BigInteger
+from app.core.database import Base
+
+
+class CacheVersion(Base):
+    """
+    One counter per cached resource. Most HTTP cache counters (app/core/http_cache.py)
+    are bumped by Postgres statement triggers on every write to the resource's tables;
+    the others (leaderboard, current_courses, ...) are bumped by the application after
+    committing (app/services/cache_versions.py).
+    Caches keyed by a counter change exactly when the data can have changed.
+    """
+    __tablename__ = "cache_versions"
+    
+    name = Column(String(64), primary_key=True)  # class_posts, battle_buddy_teams, leaderboard, current_courses, ...
+    version = Column(BigInteger, nullable=False, default=0, server_default="0")
@@ -35,5 +35,20 @@ class Course(Base):
     __table_args__ = (
         UniqueConstraint('user_id', 'course_code', 'semester', 'year', name='unique_user_course'),
         Index('idx_course_code_grade_year', 'course_code', 'grade_score', 'year'),  # Composite index for tutor search
+        # Tutor ranking: WHERE course_code = X AND grade_score IS NOT NULL ORDER BY grade_score DESC, year DESC LIMIT k
+        Index(
+            'idx_courses_tutor_rank',
+            course_code, grade_score.desc(), year.desc(),
+            postgresql_where=grade_score.isnot(None)
+        ),
+        # Group study: WHERE course_code IN (...) AND transcript_id IS NULL (current courses only)
+        Index(
+            'idx_courses_current_code',
+            course_code,
+            postgresql_where=transcript_id.is_(None),
+            postgresql_include=['user_id']
+        ),
+        # Course grade stats: WHERE upper(course_code) IN (...) (manual courses keep the code as typed)
+        Index('idx_courses_course_code_upper', func.upper(course_code)),
     )
 
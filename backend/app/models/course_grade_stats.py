@@ -0,0 +1,29 @@
+"""
+Course Grade Stats Model - Grade counts per course code, term and grade
+"""
+from sqlalchemy import Column, String, Numeric, Integer, DateTime, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CourseGradeStats(Base):
+    """
+    Course counts per (course_code, semester, year, grade) (see app/services/course_grade_stats.py).
+    Per-course statistics read these few rows instead of every taker's course row.
+    """
+    __tablename__ = "course_grade_stats"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    course_code = Column(String(20), nullable=False)
+    semester = Column(String(50))
+    year = Column(Integer)
+    grade = Column(String(20))  # As recorded on the courses (bucketed into letters when read)
+    taker_count = Column(Integer, nullable=False)  # Course rows, graded or not
+    graded_count = Column(Integer, nullable=False)  # Course rows with a grade_score
+    grade_score_sum = Column(Numeric(10, 2), nullable=False)  # Sum of grade_score over graded rows
+    passed_count = Column(Integer, nullable=False)  # Graded rows at C- (1.7) or above
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_course_grade_stats_code', 'course_code'),
+    )
@@ -0,0 +1,30 @@
+"""
+Course Tutor Index Model - Materialized top-K tutors per course code
+"""
+from sqlalchemy import Column, String, Numeric, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class CourseTutorIndex(Base):
+    """
+    Top K graded takers of each course_code, overall and per major_key (see
+    app/services/course_tutor_index.py). Denormalized from courses/users so tutor
+    lookup reads a bounded number of rows regardless of enrolment.
+    """
+    __tablename__ = "course_tutor_index"
+    
+    course_code = Column(String(20), primary_key=True)
+    course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    grade_score = Column(Numeric(3, 2), nullable=False)
+    year = Column(Integer)
+    semester = Column(String(50))
+    major_key = Column(String(100))  # Tutor's normalized major at refresh time
+    rank = Column(Integer, nullable=False)  # Among all takers of the code: 1 = best grade_score, then most recent year
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_course_tutor_index_code_rank', 'course_code', 'rank'),
+    )
@@ -1,7 +1,7 @@
 """
 Recommendation Model
 """
-from sqlalchemy import Column, String, Numeric, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, String, Numeric, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -13,7 +13,7 @@ class Recommendation(Base):
     __tablename__ = "recommendations"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    help_request_id = Column(UUID(as_uuid=True), ForeignKey("help_requests.id", ondelete="CASCADE"), nullable=False, index=True)
+    help_request_id = Column(UUID(as_uuid=True), ForeignKey("help_requests.id", ondelete="CASCADE"), nullable=False)
     helper_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     course_id = Column(UUID(as_uuid=True), ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     grade_score = Column(Numeric(3, 2))  # Normalized grade (0.0-4.0)
@@ -24,4 +24,8 @@ class Recommendation(Base):
     help_request = relationship("HelpRequest", back_populates="recommendations")
     helper = relationship("User", foreign_keys=[helper_id])
     course = relationship("Course")
-
+    
+    __table_args__ = (
+        # Snapshot reads: WHERE help_request_id = X ORDER BY rank
+        Index('idx_recommendations_request_rank', 'help_request_id', 'rank'),
+    )
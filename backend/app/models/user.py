@@ -1,12 +1,13 @@
 """
 User Model
 """
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
 from app.core.database import Base
+from app.core.majors import normalize_major
 
 
 class User(Base):
@@ -19,15 +20,22 @@ class User(Base):
     pledge_class = Column(String(50))
     graduation_year = Column(Integer)
     major = Column(String(100), nullable=True)  # User's major field
+    major_key = Column(String(100), nullable=True, index=True)  # normalize_major(major); kept in sync on assignment
     phone_number = Column(String(20), nullable=True)  # User's phone number
     hashed_password = Column(String(255), nullable=False)
     is_alumni = Column(Boolean, default=False)  # Flag to identify alumni users
     mentor_id = Column(UUID(as_uuid=True), ForeignKey("alumni_profiles.id", ondelete="SET NULL"), nullable=True)  # Active mentor
     mentee_id = Column(UUID(as_uuid=True), ForeignKey("alumni_profiles.id", ondelete="SET NULL"), nullable=True)  # Active mentee
     points = Column(Integer, default=0, nullable=False)  # Total points earned
+    course_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bumped on every course write (analytics cache key)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     alumni_profile = relationship("AlumniProfile", foreign_keys="AlumniProfile.user_id", back_populates="user", uselist=False)
 
+
+@event.listens_for(User.major, "set")
+def _sync_major_key(target, value, oldvalue, initiator):
+    """Keep major_key in sync with major (all major comparisons use major_key)"""
+    target.major_key = normalize_major(value)
@@ -0,0 +1,23 @@
+"""
+User Academic Summary Model - Per-user GPA, credits and course count
+"""
+from sqlalchemy import Column, String, Numeric, Integer, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class UserAcademicSummary(Base):
+    """
+    Academic totals for one user, maintained on course writes (see app/services/academic_summary.py).
+    Users without courses have no row.
+    """
+    __tablename__ = "user_academic_summary"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    gpa = Column(Numeric(3, 2), nullable=False, default=0)  # Credit-weighted, courses earning credit only
+    average_grade_score = Column(Numeric(3, 2), nullable=False, default=0)  # Plain average of graded courses
+    earned_credits = Column(Numeric(6, 1), nullable=False, default=0)  # C- or above
+    course_count = Column(Integer, nullable=False, default=0)
+    year_in_college = Column(String(20), nullable=False, default="Freshman")  # From earned credits
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
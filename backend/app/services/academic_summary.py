@@ -0,0 +1,204 @@
+"""
+Academic Summary Service - Maintains per-user GPA, earned credits and course counts
+
+The user_academic_summary row of a user is recomputed from their courses on
+every course write, so cross-user views read one row per user instead of
+aggregating every course row.
+
+Full rebuild:
+    python -m app.services.academic_summary
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import String, and_, case, cast, func
+from app.models.course import Course
+from app.models.user_academic_summary import UserAcademicSummary
+from decimal import Decimal
+from typing import List, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Grades that earn credit: C- or above
+CREDIT_GRADES = ['A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-']
+
+# Letter buckets of grade distributions
+LETTER_GRADES = ["A", "B", "C", "D", "F"]
+
+# Chronological order of semesters within a calendar year (unknown semesters sort last, as 99)
+SEMESTER_ORDER = {'Spring': 0, 'Summer': 1, 'Fall': 2, 'Winter': 3}
+
+
+def term_period_columns():
+    """
+    (period, sort_year, sort_semester) expressions of a course's term, as in the GPA trend:
+    "Fall 2024", with 'Unknown' for a NULL/empty semester or a NULL/0 year. Ordering by
+    (sort_year, sort_semester, period) is chronological; terms without a year sort first.
+    """
+    has_year = and_(Course.year.isnot(None), Course.year != 0)
+    period = (
+        func.coalesce(func.nullif(Course.semester, ''), 'Unknown')
+        + ' '
+        + case((has_year, cast(Course.year, String)), else_='Unknown')
+    )
+    sort_year = case((has_year, Course.year), else_=0)
+    sort_semester = case(
+        *[(and_(has_year, Course.semester == name), priority) for name, priority in SEMESTER_ORDER.items()],
+        else_=99
+    )
+    return period, sort_year, sort_semester
+
+
+def term_gpa(points, credits) -> float:
+    """points / credits rounded to 2 places (0.0 without credits), divided exactly as decimals"""
+    if not credits or float(credits) <= 0:
+        return 0.0
+    return round(float(Decimal(str(points)) / Decimal(str(credits))), 2)
+
+
+def earns_credit(grade: str, grade_score: float = None) -> bool:
+    """
+    Determine if a grade earns credit (C- or above)
+    Credits are only earned for grades C- (1.7) or above
+    """
+    if grade_score is not None:
+        # C- has a grade_score of 1.7, so anything >= 1.7 earns credit
+        return float(grade_score) >= 1.7
+    
+    if not grade:
+        return False
+    
+    # Check letter grades
+    grade_upper = str(grade).strip().upper()
+    
+    # Check if it's a numeric grade
+    try:
+        grade_num = float(grade_upper)
+        return grade_num >= 1.7  # C- or above
+    except ValueError:
+        pass
+    
+    # Check if it's a letter grade that earns credit
+    return grade_upper in CREDIT_GRADES
+
+
+def grade_letter(grade: str) -> str:
+    """Letter bucket for a grade - numeric grades are converted, letter grades use their first character"""
+    grade_str = str(grade).strip().upper()
+    try:
+        grade_num = float(grade_str)
+        if grade_num >= 3.7:
+            return "A"
+        elif grade_num >= 3.0:
+            return "B"
+        elif grade_num >= 2.0:
+            return "C"
+        elif grade_num >= 1.0:
+            return "D"
+        return "F"
+    except ValueError:
+        return grade_str[0] if grade_str else "Unknown"
+
+
+def calculate_gpa(courses: List[Course]) -> float:
+    """Calculate GPA from courses with grade_score (only courses that earn credit)"""
+    total_points = 0
+    total_credits = 0
+    
+    for course in courses:
+        if course.grade_score is not None and course.credit_hours is not None:
+            # Only count credits for courses with C- or above
+            if earns_credit(course.grade, course.grade_score):
+                total_points += float(course.grade_score) * float(course.credit_hours)
+                total_credits += float(course.credit_hours)
+    
+    if total_credits == 0:
+        return 0.0
+    
+    return round(total_points / total_credits, 2)
+
+
+def calculate_earned_credits(courses: List[Course]) -> float:
+    """Total credits from courses that earn credit (C- or above)"""
+    return round(sum(
+        float(c.credit_hours)
+        for c in courses
+        if c.credit_hours and earns_credit(c.grade, c.grade_score)
+    ), 1)
+
+
+def year_in_college_from_credits(earned_credits: float) -> str:
+    """Class standing from earned credits"""
+    if earned_credits < 30:
+        return "Freshman"
+    if earned_credits < 60:
+        return "Sophomore"
+    if earned_credits < 90:
+        return "Junior"
+    return "Senior"
+
+
+def _summary_values(courses: List[Course]) -> dict:
+    """Summary column values for a user's courses"""
+    graded = [float(c.grade_score) for c in courses if c.grade_score is not None]
+    earned_credits = calculate_earned_credits(courses)
+    return {
+        "gpa": calculate_gpa(courses),
+        "average_grade_score": round(sum(graded) / len(graded), 2) if graded else 0.0,
+        "earned_credits": earned_credits,
+        "course_count": len(courses),
+        "year_in_college": year_in_college_from_credits(earned_credits),
+    }
+
+
+def _apply_summary(db: Session, user_id: uuid.UUID, courses: List[Course]) -> None:
+    """Upsert (or remove, for users without courses) the summary row; caller commits"""
+    summary = db.get(UserAcademicSummary, user_id)
+    if not courses:
+        if summary is not None:
+            db.delete(summary)
+        return
+    
+    values = _summary_values(courses)
+    if summary is None:
+        db.add(UserAcademicSummary(user_id=user_id, **values))
+    else:
+        for column, value in values.items():
+            setattr(summary, column, value)
+
+
+def refresh_user_summary(db: Session, user_id: uuid.UUID) -> None:
+    """Recompute one user's summary from their courses and commit"""
+    courses = db.query(Course).filter(Course.user_id == user_id).all()
+    _apply_summary(db, user_id, courses)
+    db.commit()
+
+
+def get_user_summary(db: Session, user_id: uuid.UUID) -> Optional[UserAcademicSummary]:
+    """Summary row for a user (None if they have no courses)"""
+    return db.get(UserAcademicSummary, user_id)
+
+
+def rebuild_academic_summaries(db: Session) -> int:
+    """Recompute every user's summary; returns the number of summary rows"""
+    db.query(UserAcademicSummary).delete(synchronize_session=False)
+    courses_by_user = {}
+    for course in db.query(Course).yield_per(1000):
+        courses_by_user.setdefault(course.user_id, []).append(course)
+    for user_id, courses in courses_by_user.items():
+        _apply_summary(db, user_id, courses)
+    db.commit()
+    return len(courses_by_user)
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+    from app.services.cache_versions import GPA_PERCENTILES, bump_cache_version
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        rows = rebuild_academic_summaries(session)
+        bump_cache_version(session, GPA_PERCENTILES)  # Running workers rebuild their percentile lists
+        logger.info(f"✓ Academic summaries rebuilt: {rows} users")
+    finally:
+        session.close()
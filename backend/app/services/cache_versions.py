@@ -0,0 +1,43 @@
+"""
+Cache Versions Service - Named counters in cache_versions for invalidating per-worker caches
+
+A writer bumps a counter after committing its change; readers key their caches
+on the counter, so a cache check is one primary-key lookup and a change made in
+any worker invalidates every worker's copy.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from app.models.cache_version import CacheVersion
+
+# Counter names
+CURRENT_COURSES = "current_courses"  # Any user's courses changed (bumped by courses_changed)
+LEADERBOARD = "leaderboard"  # Points or leaderboard membership changed (bumped by points_service.leaderboard_changed)
+GPA_PERCENTILES = "gpa_percentiles"  # Any member's summary or major changed (bumped by gpa_percentiles.member_changed)
+
+
+def get_cache_version(db: Session, name: str) -> int:
+    """Current value of a counter (0 before its first bump)"""
+    version = db.query(CacheVersion.version).filter(CacheVersion.name == name).scalar()
+    return version or 0
+
+
+def bump_cache_version(db: Session, name: str) -> int:
+    """Increment a counter and commit; returns the new value"""
+    for _ in range(2):
+        version = db.execute(
+            update(CacheVersion).where(CacheVersion.name == name).values(
+                version=CacheVersion.version + 1
+            ).returning(CacheVersion.version)
+        ).scalar()
+        if version is not None:
+            db.commit()
+            return version
+        try:
+            # First bump of this counter
+            db.add(CacheVersion(name=name, version=1))
+            db.commit()
+            return 1
+        except IntegrityError:
+            db.rollback()  # Another worker created it - increment that row
+    raise RuntimeError(f"Could not bump cache version {name}")
@@ -0,0 +1,272 @@
+"""
+Chapter Analytics Service - Chapter-wide GPA, credit and grade statistics by cohort
+
+Reads one row per member (users joined to user_academic_summary) plus GROUP BY
+queries over courses for grade counts and term GPAs, then computes every
+cohort's statistics over columnar NumPy arrays. Cohorts are majors (by
+major_key), pledge classes and graduation years. Every member's next-term GPA is
+projected in one batched pass (app/services/projections.py).
+
+Cohorts smaller than CHAPTER_ANALYTICS_MIN_COHORT_SIZE report their member
+counts only: their GPA, credit, grade and projection statistics would expose
+individual members' records.
+
+The report is cached per worker and rebuilt after
+CHAPTER_ANALYTICS_REFRESH_SECONDS, so officers never trigger more than one
+chapter-wide scan per interval.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, or_
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.course import Course
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.academic_summary import LETTER_GRADES, grade_letter, term_gpa, term_period_columns
+from app.services.projections import PRESETS, project_series
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+UNKNOWN_COHORT = "Unknown"
+GPA_PERCENTILES = (10, 25, 50, 75, 90)
+# GPA histogram buckets: [lower, upper) except the last, which includes 4.0 and above
+GPA_BUCKETS = [("0.0-1.99", 0.0), ("2.0-2.49", 2.0), ("2.5-2.99", 2.5), ("3.0-3.49", 3.0), ("3.5-4.0", 3.5)]
+CLASS_STANDINGS = ["Freshman", "Sophomore", "Junior", "Senior"]
+
+_report_cache = TTLCache(maxsize=1, ttl_seconds=settings.CHAPTER_ANALYTICS_REFRESH_SECONDS)
+
+
+def _member_rows(db: Session) -> List[Any]:
+    """Every active (non-alumni) member with their academic summary, if any"""
+    return db.query(
+        User.id,
+        User.major,
+        User.major_key,
+        User.pledge_class,
+        User.graduation_year,
+        UserAcademicSummary.gpa,
+        UserAcademicSummary.earned_credits,
+        UserAcademicSummary.year_in_college
+    ).outerjoin(
+        UserAcademicSummary, UserAcademicSummary.user_id == User.id
+    ).filter(
+        or_(User.is_alumni.is_(False), User.is_alumni.is_(None))
+    ).order_by(User.id).all()
+
+
+def _grade_count_rows(db: Session) -> List[Any]:
+    """(user_id, grade, course_count) for every graded course of active members"""
+    return db.query(
+        Course.user_id,
+        Course.grade,
+        func.count().label('course_count')
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        Course.grade.isnot(None),
+        Course.grade != '',
+        or_(User.is_alumni.is_(False), User.is_alumni.is_(None))
+    ).group_by(Course.user_id, Course.grade).all()
+
+
+def _term_gpa_rows(db: Session) -> List[Any]:
+    """
+    Points and credits per (member, term) of graded, credit-earning courses of active members,
+    with terms labelled and ordered exactly as in each member's GPA trend (/analytics/academic-trends)
+    """
+    period, sort_year, sort_semester = term_period_columns()
+    return db.query(
+        Course.user_id,
+        period.label('period'),
+        sort_year.label('sort_year'),
+        sort_semester.label('sort_semester'),
+        func.sum(Course.grade_score * Course.credit_hours).label('points'),
+        func.sum(Course.credit_hours).label('credits')
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        Course.grade_score.isnot(None),
+        Course.credit_hours.isnot(None),
+        Course.grade_score >= 1.7,  # Only courses with C- or above earn credit
+        or_(User.is_alumni.is_(False), User.is_alumni.is_(None))
+    ).group_by(Course.user_id, period, sort_year, sort_semester).all()
+
+
+def _projected_gpas(db: Session, positions: Dict[Any, int]) -> np.ndarray:
+    """Each member's projected next-term GPA from their term GPA trend (NaN without a projection)"""
+    # The same series as the member's own projections.gpa
+    terms: Dict[Any, list] = {}
+    for row in _term_gpa_rows(db):
+        if row.user_id in positions:
+            terms.setdefault(row.user_id, []).append(
+                ((row.sort_year, row.sort_semester, row.period), row.period, term_gpa(row.points, row.credits))
+            )
+
+    members = list(terms)
+    series = [[(period, gpa) for _, period, gpa in sorted(terms[member])] for member in members]
+    projected = np.full(len(positions), np.nan)
+    for member, points in zip(members, project_series(series, PRESETS['gpa'])):
+        if points:
+            projected[positions[member]] = points[0][1]
+    return projected
+
+
+def _percentages(counts: np.ndarray) -> List[float]:
+    """Each count as a percentage of the total, rounded to 1 place (zeros without a total)"""
+    total = counts.sum()
+    if total == 0:
+        return [0.0] * len(counts)
+    return [round(float(count) / float(total) * 100, 1) for count in counts]
+
+
+def _cohort_stats(
+    cohort: str,
+    gpa: np.ndarray,
+    credits: np.ndarray,
+    standing: np.ndarray,
+    grade_counts: np.ndarray,
+    projected_gpa: np.ndarray
+) -> Dict[str, Any]:
+    """Statistics for one cohort's rows (NaN gpa/credits for members without graded courses)"""
+    graded = ~np.isnan(gpa)
+    projected = projected_gpa[~np.isnan(projected_gpa)]
+    counts = {
+        'cohort': cohort,
+        'member_count': int(len(gpa)),
+        'graded_member_count': int(graded.sum()),
+        'projected_member_count': int(len(projected))
+    }
+    if len(gpa) < settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE:
+        # Too few members to aggregate without revealing someone's GPA or grades
+        return {
+            **counts,
+            'gpa': None,
+            'gpa_distribution': [],
+            'credit_progress': None,
+            'grade_distribution': [],
+            'projected_term_gpa': None
+        }
+
+    gpas = gpa[graded]
+    if len(gpas):
+        percentiles = np.percentile(gpas, GPA_PERCENTILES)
+        gpa_stats = {
+            'mean': round(float(gpas.mean()), 2),
+            'min': round(float(gpas.min()), 2),
+            'max': round(float(gpas.max()), 2),
+            **{f'p{p}': round(float(value), 2) for p, value in zip(GPA_PERCENTILES, percentiles)}
+        }
+    else:
+        gpa_stats = {'mean': 0.0, 'min': 0.0, 'max': 0.0, **{f'p{p}': 0.0 for p in GPA_PERCENTILES}}
+
+    bucket_edges = np.array([lower for _, lower in GPA_BUCKETS[1:]])
+    bucket_counts = np.bincount(np.searchsorted(bucket_edges, gpas, side='right'), minlength=len(GPA_BUCKETS))
+
+    earned = credits[~np.isnan(credits)]
+    standing_counts = np.bincount(standing[standing >= 0], minlength=len(CLASS_STANDINGS))
+    letter_counts = grade_counts.sum(axis=0)
+
+    return {
+        **counts,
+        'gpa': gpa_stats,
+        'gpa_distribution': [
+            {'range': label, 'count': int(count), 'percentage': percentage}
+            for (label, _), count, percentage in zip(GPA_BUCKETS, bucket_counts, _percentages(bucket_counts))
+        ],
+        'credit_progress': {
+            'average_earned_credits': round(float(earned.mean()), 1) if len(earned) else 0.0,
+            'median_earned_credits': round(float(np.median(earned)), 1) if len(earned) else 0.0,
+            'class_standing': [
+                {'standing': name, 'count': int(count)}
+                for name, count in zip(CLASS_STANDINGS, standing_counts)
+            ]
+        },
+        'grade_distribution': [
+            {'grade': letter, 'count': int(count), 'percentage': percentage}
+            for letter, count, percentage in zip(LETTER_GRADES, letter_counts, _percentages(letter_counts))
+        ],
+        'projected_term_gpa': round(float(projected.mean()), 2) if len(projected) else None
+    }
+
+
+def _breakdown(labels: Sequence[str], columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Statistics per distinct label, sorted by label (Unknown last)"""
+    label_array = np.array(labels, dtype=object)
+    cohorts = sorted(set(labels), key=lambda label: (label == UNKNOWN_COHORT, label))
+    return [
+        _cohort_stats(cohort, **{name: column[label_array == cohort] for name, column in columns.items()})
+        for cohort in cohorts
+    ]
+
+
+def _major_labels(rows: Sequence[Any]) -> List[str]:
+    """Cohort label per member: the most common spelling among members sharing a major_key"""
+    spellings: Dict[str, Counter] = {}
+    for row in rows:
+        if row.major_key:
+            spellings.setdefault(row.major_key, Counter())[row.major.strip()] += 1
+    display = {
+        key: min(counter.items(), key=lambda item: (-item[1], item[0]))[0]
+        for key, counter in spellings.items()
+    }
+    return [display[row.major_key] if row.major_key else UNKNOWN_COHORT for row in rows]
+
+
+def build_chapter_report(db: Session) -> Dict[str, Any]:
+    """Compute the chapter-wide report (overall plus per-major, pledge class and graduation year)"""
+    rows = _member_rows(db)
+    positions = {row.id: i for i, row in enumerate(rows)}
+
+    # A summary GPA of 0 means no credit-earning graded courses - left out of GPA statistics
+    gpa = np.array([
+        float(row.gpa) if row.gpa is not None and float(row.gpa) > 0 else np.nan for row in rows
+    ], dtype=np.float64)
+    credits = np.array([
+        float(row.earned_credits) if row.earned_credits is not None else np.nan for row in rows
+    ], dtype=np.float64)
+    standing_positions = {name: i for i, name in enumerate(CLASS_STANDINGS)}
+    standing = np.array([standing_positions.get(row.year_in_college, -1) for row in rows], dtype=np.int64)
+
+    # member x letter grade course counts
+    letter_positions = {letter: j for j, letter in enumerate(LETTER_GRADES)}
+    grade_counts = np.zeros((len(rows), len(LETTER_GRADES)), dtype=np.int64)
+    letters = {}
+    for user_id, grade, course_count in _grade_count_rows(db):
+        if grade not in letters:
+            letters[grade] = letter_positions.get(grade_letter(grade))
+        column = letters[grade]
+        if column is not None and user_id in positions:
+            grade_counts[positions[user_id], column] += course_count
+
+    columns = {
+        'gpa': gpa,
+        'credits': credits,
+        'standing': standing,
+        'grade_counts': grade_counts,
+        'projected_gpa': _projected_gpas(db, positions)
+    }
+    return {
+        'generated_at': datetime.now(timezone.utc),
+        'refresh_interval_seconds': settings.CHAPTER_ANALYTICS_REFRESH_SECONDS,
+        'overall': _cohort_stats('Chapter', **columns),
+        'by_major': _breakdown(_major_labels(rows), columns),
+        'by_pledge_class': _breakdown(
+            [row.pledge_class.strip() if row.pledge_class and row.pledge_class.strip() else UNKNOWN_COHORT for row in rows],
+            columns
+        ),
+        'by_graduation_year': _breakdown(
+            [str(row.graduation_year) if row.graduation_year else UNKNOWN_COHORT for row in rows],
+            columns
+        )
+    }
+
+
+def get_chapter_report(db: Session) -> Dict[str, Any]:
+    """Cached chapter report, rebuilt once the refresh interval has passed"""
+    report = _report_cache.get('chapter')
+    if report is None:
+        report = build_chapter_report(db)
+        _report_cache.set('chapter', report)
+    return report
@@ -0,0 +1,86 @@
+"""
+Course Change Hooks - Keeps data derived from courses in sync after course writes
+
+Call after the write has been committed. Failures are logged and never fail the
+request; derived data can always be rebuilt from courses.
+
+users.course_version is bumped on every change, so caches of data computed from
+a user's courses can be keyed by (user_id, course_version). Chapter-wide caches
+of current courses are keyed by the current_courses cache version.
+"""
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.services.academic_summary import refresh_user_summary
+from app.services.cache_versions import CURRENT_COURSES, bump_cache_version
+from app.services.course_grade_stats import refresh_course_stats
+from app.services.course_tutor_index import refresh_course_codes, update_user_major
+from app.services.gpa_percentiles import member_changed
+from typing import Iterable, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def get_course_version(db: Session, user_id: uuid.UUID) -> int:
+    """Current version of a user's course set (0 if the user doesn't exist)"""
+    version = db.query(User.course_version).filter(User.id == user_id).scalar()
+    return version or 0
+
+
+def courses_changed(db: Session, user_id: uuid.UUID, course_codes: Iterable[Optional[str]]) -> None:
+    """A user's courses with these codes were inserted, updated or deleted"""
+    course_codes = list(course_codes)
+    try:
+        db.query(User).filter(User.id == user_id).update(
+            {User.course_version: User.course_version + 1}, synchronize_session=False
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Course version bump failed for user {user_id}: {str(e)}")
+    
+    try:
+        bump_cache_version(db, CURRENT_COURSES)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Current courses version bump failed for user {user_id}: {str(e)}")
+    
+    try:
+        refresh_user_summary(db, user_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Academic summary refresh failed for user {user_id}: {str(e)}")
+    
+    try:
+        member_changed(db, user_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"GPA percentile index update failed for user {user_id}: {str(e)}")
+    
+    try:
+        refresh_course_codes(db, course_codes)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Course tutor index refresh failed for user {user_id}: {str(e)}")
+    
+    try:
+        refresh_course_stats(db, course_codes)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Course grade stats refresh failed for user {user_id}: {str(e)}")
+
+
+def user_major_changed(db: Session, user_id: uuid.UUID) -> None:
+    """A user's major changed (committed, including users.major_key)"""
+    try:
+        update_user_major(db, user_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Course tutor index major update failed for user {user_id}: {str(e)}")
+    
+    try:
+        member_changed(db, user_id)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"GPA percentile index update failed for user {user_id}: {str(e)}")
@@ -0,0 +1,145 @@
+"""
+Course Grade Stats Service - Maintains grade counts per course code for course statistics
+
+Rows (one per course_code, semester, year and grade) are recomputed per affected
+course_code whenever courses are written, alongside the course tutor index, so
+grade histograms, mean grade_score, pass rates and takers by term are assembled
+from a handful of rows instead of scanning every taker. Codes are grouped and
+looked up upper-cased: manually added courses keep the code as typed, so
+"cs 101" counts towards "CS 101".
+
+Full rebuild:
+    python -m app.services.course_grade_stats
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import case, func, insert, select, text
+from app.models.course import Course
+from app.models.course_grade_stats import CourseGradeStats
+from app.services.academic_summary import LETTER_GRADES, SEMESTER_ORDER, grade_letter
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+_STATS_COLUMNS = ["course_code", "semester", "year", "grade", "taker_count", "graded_count", "grade_score_sum", "passed_count"]
+
+
+def _stats_select(course_codes: Optional[List[str]] = None):
+    """SELECT of the grouped counts per (upper-cased course_code, semester, year, grade) (all codes if None)"""
+    code = func.upper(Course.course_code)  # Uses idx_courses_course_code_upper
+    query = select(
+        code.label('course_code'),
+        Course.semester,
+        Course.year,
+        Course.grade,
+        func.count().label('taker_count'),
+        func.count(Course.grade_score).label('graded_count'),
+        func.coalesce(func.sum(Course.grade_score), 0).label('grade_score_sum'),
+        func.sum(case((Course.grade_score >= 1.7, 1), else_=0)).label('passed_count')
+    ).group_by(
+        code, Course.semester, Course.year, Course.grade
+    )
+    if course_codes is not None:
+        query = query.where(code.in_(course_codes))
+    return query
+
+
+def refresh_course_stats(db: Session, course_codes: Iterable[Optional[str]]) -> None:
+    """Recompute stats rows for the given course codes (any case) and commit"""
+    codes = sorted({code.upper() for code in course_codes if code})
+    if not codes:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Serialize concurrent refreshes of the same code (delete + insert would race)
+        for code in codes:
+            db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:code))"), {"code": f"course_grade_stats:{code}"})
+
+    db.query(CourseGradeStats).filter(
+        CourseGradeStats.course_code.in_(codes)
+    ).delete(synchronize_session=False)
+    db.execute(insert(CourseGradeStats).from_select(_STATS_COLUMNS, _stats_select(codes)))
+    db.commit()
+
+
+def rebuild_course_grade_stats(db: Session) -> int:
+    """Rebuild every stats row from courses; returns the number of rows written"""
+    db.query(CourseGradeStats).delete(synchronize_session=False)
+    db.execute(insert(CourseGradeStats).from_select(_STATS_COLUMNS, _stats_select()))
+    db.commit()
+    return db.query(func.count()).select_from(CourseGradeStats).scalar()
+
+
+def _mean(total: float, count: int) -> Optional[float]:
+    """total / count rounded to 2 places (None without a count)"""
+    return round(total / count, 2) if count else None
+
+
+def _course_stats(course_code: str, rows: List[Any]) -> Dict[str, Any]:
+    """Statistics of one course from its stats rows"""
+    letter_counts = defaultdict(int)
+    terms = {}
+    for row in rows:
+        if row.grade:
+            letter = grade_letter(row.grade)
+            if letter in LETTER_GRADES:
+                letter_counts[letter] += row.taker_count
+        term = terms.setdefault((row.semester, row.year), {'taker_count': 0, 'graded_count': 0, 'grade_score_sum': 0.0})
+        term['taker_count'] += row.taker_count
+        term['graded_count'] += row.graded_count
+        term['grade_score_sum'] += float(row.grade_score_sum)
+
+    graded_count = sum(row.graded_count for row in rows)
+    passed_count = sum(row.passed_count for row in rows)
+    lettered = sum(letter_counts.values())
+    return {
+        'course_code': course_code,
+        'taker_count': sum(row.taker_count for row in rows),
+        'graded_count': graded_count,
+        'mean_grade_score': _mean(sum(float(row.grade_score_sum) for row in rows), graded_count),
+        'pass_rate': round(passed_count / graded_count * 100, 1) if graded_count else None,
+        'grade_distribution': [
+            {
+                'grade': letter,
+                'count': letter_counts[letter],
+                'percentage': round(letter_counts[letter] / lettered * 100, 1) if lettered else 0.0
+            }
+            for letter in LETTER_GRADES
+        ],
+        'takers_by_term': [
+            {
+                'term': f"{semester or 'Unknown'} {year or 'Unknown'}",
+                'semester': semester,
+                'year': year,
+                'taker_count': term['taker_count'],
+                'mean_grade_score': _mean(term['grade_score_sum'], term['graded_count'])
+            }
+            for (semester, year), term in sorted(
+                terms.items(),
+                key=lambda item: (item[0][1] or 0, SEMESTER_ORDER.get(item[0][0], 99), item[0][0] or '')
+            )
+        ]
+    }
+
+
+def get_course_stats(db: Session, course_codes: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Statistics per upper-cased course code, for codes with at least one recorded course (one query)"""
+    codes = sorted({code.upper() for code in course_codes})
+    if not codes:
+        return {}
+    rows_by_code = defaultdict(list)
+    for row in db.query(CourseGradeStats).filter(CourseGradeStats.course_code.in_(codes)).all():  # Uses idx_course_grade_stats_code
+        rows_by_code[row.course_code].append(row)
+    return {code: _course_stats(code, rows) for code, rows in sorted(rows_by_code.items())}
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        rows = rebuild_course_grade_stats(session)
+        logger.info(f"✓ Course grade stats rebuilt: {rows} rows")
+    finally:
+        session.close()
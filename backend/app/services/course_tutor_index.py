@@ -0,0 +1,108 @@
+"""
+Course Tutor Index Service - Maintains the materialized top-K tutors per course code
+
+Each course_code keeps its top K takers overall plus the top K takers of each
+major, so same-major-first lookups for any requester are answered from the
+index. Rows are recomputed per affected course_code whenever courses are
+written (manual course CRUD, transcript processing/deletion, account deletion)
+or a taker changes major, so tutor lookups never read every taker of the course.
+
+Full rebuild:
+    python -m app.services.course_tutor_index
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, insert, or_, select, text
+from app.core.config import settings
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from typing import Iterable, List, Optional
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_INDEX_COLUMNS = ["course_code", "course_id", "user_id", "grade_score", "year", "semester", "major_key", "rank"]
+
+
+def _top_k_select(course_codes: Optional[List[str]] = None):
+    """SELECT of the top K graded takers per course_code and per (course_code, major_key) (all codes if None)"""
+    filters = [Course.grade_score.isnot(None)]
+    if course_codes is not None:
+        filters.append(Course.course_code.in_(course_codes))
+    order_by = (Course.grade_score.desc(), Course.year.desc().nullslast(), Course.semester.asc().nullsfirst())
+
+    ranked = select(
+        Course.course_code,
+        Course.id.label('course_id'),
+        Course.user_id,
+        Course.grade_score,
+        Course.year,
+        Course.semester,
+        User.major_key,
+        func.row_number().over(partition_by=Course.course_code, order_by=order_by).label('rank'),
+        func.row_number().over(partition_by=(Course.course_code, User.major_key), order_by=order_by).label('major_rank')
+    ).join(
+        User, Course.user_id == User.id
+    ).where(
+        and_(*filters)
+    ).subquery()
+
+    return select(*[ranked.c[name] for name in _INDEX_COLUMNS]).where(
+        or_(
+            ranked.c.rank <= settings.COURSE_TUTOR_INDEX_SIZE,
+            ranked.c.major_rank <= settings.COURSE_TUTOR_INDEX_SIZE
+        )
+    )
+
+
+def refresh_course_codes(db: Session, course_codes: Iterable[Optional[str]]) -> None:
+    """Recompute index rows for the given course codes and commit"""
+    codes = sorted({code for code in course_codes if code})
+    if not codes:
+        return
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Serialize concurrent refreshes of the same code (delete + insert would race)
+        for code in codes:
+            db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:code))"), {"code": f"course_tutor_index:{code}"})
+
+    db.query(CourseTutorIndex).filter(
+        CourseTutorIndex.course_code.in_(codes)
+    ).delete(synchronize_session=False)
+    db.execute(insert(CourseTutorIndex).from_select(_INDEX_COLUMNS, _top_k_select(codes)))
+    db.commit()
+
+
+def update_user_major(db: Session, user_id: uuid.UUID) -> None:
+    """Recompute the course codes a user has taken after their major changed, and commit"""
+    # Re-ranked rather than relabelled: the user may now belong in (or drop out of)
+    # the per-major top K of their codes
+    refresh_course_codes(db, user_course_codes(db, user_id))
+
+
+def user_course_codes(db: Session, user_id: uuid.UUID, transcript_ids: Optional[List[uuid.UUID]] = None) -> List[str]:
+    """Distinct course codes of a user's courses (optionally only those from some transcripts)"""
+    query = db.query(Course.course_code).filter(Course.user_id == user_id)
+    if transcript_ids is not None:
+        query = query.filter(Course.transcript_id.in_(transcript_ids))
+    return [code for (code,) in query.distinct().all()]
+
+
+def rebuild_course_tutor_index(db: Session) -> int:
+    """Rebuild the whole index from courses; returns the number of rows written"""
+    db.query(CourseTutorIndex).delete(synchronize_session=False)
+    db.execute(insert(CourseTutorIndex).from_select(_INDEX_COLUMNS, _top_k_select()))
+    db.commit()
+    return db.query(func.count()).select_from(CourseTutorIndex).scalar()
+
+
+if __name__ == "__main__":
+    from app.core.database import SessionLocal
+    logging.basicConfig(level=logging.INFO)
+    session = SessionLocal()
+    try:
+        rows = rebuild_course_tutor_index(session)
+        logger.info(f"✓ Course tutor index rebuilt: {rows} rows")
+    finally:
+        session.close()
@@ -0,0 +1,151 @@
+"""
+GPA Percentiles Service - Where a member's GPA stands within the chapter and their cohorts
+
+Keeps one sorted GPA list per cohort (chapter, major_key, pledge class,
+graduation year) built from user_academic_summary, so a percentile lookup is
+two bisects. Every summary or major change bumps the gpa_percentiles cache
+version; the worker making the change updates the member's entries in place
+(remove + insort) if its lists were current before the change, and any worker
+whose lists are behind the version rebuilds them on the next lookup. A lookup
+reads only the version (one primary-key lookup) before bisecting.
+
+Only active (non-alumni) members with a GPA (credit-earning graded courses) are ranked.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import or_
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.cache_versions import GPA_PERCENTILES, bump_cache_version, get_cache_version
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, List, Optional, Tuple
+import threading
+import uuid
+
+COHORT_TYPES = ("chapter", "major", "pledge_class", "graduation_year")
+CHAPTER_COHORT = "Chapter"
+
+
+class GPAPercentileIndex:
+    """Sorted GPAs per (cohort_type, cohort_key), plus each member's GPA and cohorts"""
+
+    def __init__(self):
+        self.sorted_gpas: Dict[Tuple[str, str], List[float]] = {}
+        self.members: Dict[uuid.UUID, Tuple[float, Dict[str, Tuple[str, str]]]] = {}  # user -> (gpa, type -> (key, label))
+        self.version = None  # gpa_percentiles cache version the lists reflect
+
+    def remove_member(self, user_id: uuid.UUID) -> None:
+        """Drop a member's GPA from each of their cohort lists"""
+        entry = self.members.pop(user_id, None)
+        if entry is None:
+            return
+        gpa, cohorts = entry
+        for cohort_type, (key, _) in cohorts.items():
+            gpas = self.sorted_gpas[(cohort_type, key)]
+            del gpas[bisect_left(gpas, gpa)]
+            if not gpas:
+                del self.sorted_gpas[(cohort_type, key)]
+
+    def set_member(self, user_id: uuid.UUID, gpa: Optional[float], cohorts: Dict[str, Tuple[str, str]]) -> None:
+        """Insert or move a member (gpa None removes them)"""
+        self.remove_member(user_id)
+        if gpa is None:
+            return
+        self.members[user_id] = (gpa, cohorts)
+        for cohort_type, (key, _) in cohorts.items():
+            insort(self.sorted_gpas.setdefault((cohort_type, key), []), gpa)
+
+    def percentiles(self, user_id: uuid.UUID) -> List[Dict[str, Any]]:
+        """Percentile rank of a member's GPA within each of their cohorts (empty without a GPA)"""
+        entry = self.members.get(user_id)
+        if entry is None:
+            return []
+        gpa, cohorts = entry
+        results = []
+        for cohort_type in COHORT_TYPES:
+            if cohort_type not in cohorts:
+                continue
+            key, label = cohorts[cohort_type]
+            gpas = self.sorted_gpas[(cohort_type, key)]
+            below, through = bisect_left(gpas, gpa), bisect_right(gpas, gpa)
+            results.append({
+                'cohort_type': cohort_type,
+                'cohort': label,
+                'gpa': gpa,
+                # Share of the cohort below the GPA, counting ties as half
+                'percentile': round((below + (through - below) / 2) / len(gpas) * 100, 1),
+                'rank': len(gpas) - through + 1,  # 1 = highest GPA; ties share a rank
+                'cohort_size': len(gpas)
+            })
+        return results
+
+
+_index = GPAPercentileIndex()
+_index_lock = threading.Lock()
+
+
+def _member_query(db: Session):
+    """Active members with a GPA, and their cohort columns"""
+    return db.query(
+        User.id,
+        User.major,
+        User.major_key,
+        User.pledge_class,
+        User.graduation_year,
+        UserAcademicSummary.gpa
+    ).join(
+        UserAcademicSummary, UserAcademicSummary.user_id == User.id
+    ).filter(
+        or_(User.is_alumni.is_(False), User.is_alumni.is_(None)),
+        UserAcademicSummary.gpa > 0
+    )
+
+
+def _cohorts(row: Any) -> Dict[str, Tuple[str, str]]:
+    """(cohort_key, label) per cohort type the member belongs to"""
+    cohorts = {'chapter': ('chapter', CHAPTER_COHORT)}
+    if row.major_key:
+        cohorts['major'] = (row.major_key, row.major.strip())
+    pledge_class = (row.pledge_class or '').strip()
+    if pledge_class:
+        cohorts['pledge_class'] = (pledge_class.lower(), pledge_class)
+    if row.graduation_year:
+        cohorts['graduation_year'] = (str(row.graduation_year), str(row.graduation_year))
+    return cohorts
+
+
+def rebuild_index(db: Session) -> None:
+    """Rebuild every cohort list from user_academic_summary"""
+    index = GPAPercentileIndex()
+    # Read before the rows: a change committed meanwhile leaves the index behind its
+    # bump, so the next lookup rebuilds again rather than missing it
+    index.version = get_cache_version(db, GPA_PERCENTILES)
+    for row in _member_query(db).order_by(UserAcademicSummary.gpa).all():
+        gpa, cohorts = float(row.gpa), _cohorts(row)
+        index.members[row.id] = (gpa, cohorts)
+        for cohort_type, (key, _) in cohorts.items():
+            index.sorted_gpas.setdefault((cohort_type, key), []).append(gpa)  # Rows arrive sorted
+
+    global _index
+    with _index_lock:
+        _index = index
+
+
+def member_changed(db: Session, user_id: uuid.UUID) -> None:
+    """A member's summary or major change was committed: bump the version and re-place them"""
+    version = bump_cache_version(db, GPA_PERCENTILES)
+    row = _member_query(db).filter(User.id == user_id).first()
+    with _index_lock:
+        # Only an index that reflected every earlier change can take this one in place;
+        # otherwise (not built, or behind another worker's change) the next lookup rebuilds
+        if _index.version != version - 1:
+            return
+        _index.set_member(user_id, float(row.gpa) if row else None, _cohorts(row) if row else {})
+        _index.version = version
+
+
+def get_gpa_percentiles(db: Session, user_id: uuid.UUID) -> List[Dict[str, Any]]:
+    """A member's GPA percentile within the chapter, their major, pledge class and graduation year"""
+    if _index.version != get_cache_version(db, GPA_PERCENTILES):
+        rebuild_index(db)
+    with _index_lock:
+        return _index.percentiles(user_id)
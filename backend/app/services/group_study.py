@@ -0,0 +1,93 @@
+"""
+Group Study Service - Ranks brothers sharing the user's current courses in SQL
+
+Current courses are those without a transcript (transcript_id IS NULL). Overlap
+is grouped and ranked in Postgres (served by idx_courses_current_code), so only
+the top `limit` users are returned regardless of enrolment.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, cast, desc, distinct, func, Float
+from app.models.course import Course
+from app.models.user import User
+from typing import Any, List
+import uuid
+
+
+def current_course_codes(db: Session, user_id: uuid.UUID) -> List[str]:
+    """Distinct course codes the user is currently taking"""
+    rows = db.query(Course.course_code).filter(
+        and_(
+            Course.user_id == user_id,
+            Course.transcript_id.is_(None),
+            Course.course_code.isnot(None)
+        )
+    ).distinct().all()
+    return [code for (code,) in rows]
+
+
+def group_study_rows(
+    db: Session,
+    user_id: uuid.UUID,
+    limit: int = 10,
+    jaccard: bool = False
+) -> List[Any]:
+    """
+    Top `limit` users sharing current courses with user_id. Rows: (User, shared_codes,
+    shared_count, similarity) where similarity is the Jaccard index of the two sets of
+    current course codes. Ordered by shared_count (or similarity if jaccard), then name.
+    """
+    codes = current_course_codes(db, user_id)
+    if not codes:
+        return []
+
+    # One row per other user: which of my codes they take (uses idx_courses_current_code)
+    shared = db.query(
+        Course.user_id.label('user_id'),
+        func.array_agg(distinct(Course.course_code)).label('shared_codes'),
+        func.count(distinct(Course.course_code)).label('shared_count')
+    ).filter(
+        and_(
+            Course.course_code.in_(codes),
+            Course.user_id != user_id,
+            Course.transcript_id.is_(None)
+        )
+    ).group_by(Course.user_id).subquery()
+
+    # Size of each candidate's current course set (only candidates are scanned)
+    totals = db.query(
+        Course.user_id.label('user_id'),
+        func.count(distinct(Course.course_code)).label('course_count')
+    ).join(
+        shared, shared.c.user_id == Course.user_id
+    ).filter(
+        Course.transcript_id.is_(None)
+    ).group_by(Course.user_id).subquery()
+
+    # |A ∩ B| / |A ∪ B|
+    similarity = (
+        cast(shared.c.shared_count, Float)
+        / (len(codes) + totals.c.course_count - shared.c.shared_count)
+    ).label('similarity')
+    helper_name = User.first_name + " " + User.last_name
+
+    order_by = [desc(shared.c.shared_count), helper_name]
+    if jaccard:
+        order_by.insert(0, desc(similarity))
+
+    rows = db.query(
+        User, shared.c.shared_codes, shared.c.shared_count, similarity
+    ).join(
+        shared, shared.c.user_id == User.id
+    ).join(
+        totals, totals.c.user_id == User.id
+    ).order_by(*order_by).limit(limit).all()
+
+    return [
+        (
+            user,
+            sorted(shared_codes),
+            shared_count,
+            similarity_value
+        )
+        for user, shared_codes, shared_count, similarity_value in rows
+    ]
@@ -1,7 +1,6 @@
 """
 PDF Processing Service
 """
-import pdfplumber
 import re
 from io import BytesIO
 from typing import List, Dict, Optional
@@ -39,6 +38,8 @@ class PDFProcessor:
     
     def extract_text(self, pdf_content: bytes) -> str:
         """Extract text from PDF"""
+        import pdfplumber  # Imported on first use - it is slow to import and only needed for uploads
+        
         # pdfplumber.open() requires a file-like object, not raw bytes
         # Wrap bytes in BytesIO to provide seek() method
         pdf_file = BytesIO(pdf_content)
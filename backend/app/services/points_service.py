@@ -4,9 +4,14 @@ Points Service - Handles awarding and managing points
 from sqlalchemy.orm import Session
 from app.models.points import PointsHistory, PointType
 from app.models.user import User
+from app.core.user_cache import invalidate_user
+from app.services.cache_versions import LEADERBOARD, bump_cache_version
 from typing import Optional
+import logging
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 # Point values for different activities
 POINT_VALUES = {
@@ -94,10 +99,25 @@ def award_points(
     db.add(points_entry)
     db.commit()
     db.refresh(points_entry)
+    invalidate_user(user_id)
+    leaderboard_changed(db)
     
     return points_entry
 
 
+def leaderboard_changed(db: Session) -> None:
+    """
+    Bump the leaderboard ETag version after a committed points or user change. Done in its
+    own short transaction, after the writer's commit, so concurrent point awards don't
+    queue on the counter row for the length of their transactions.
+    """
+    try:
+        bump_cache_version(db, LEADERBOARD)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Leaderboard version bump failed: {str(e)}")
+
+
 def get_user_points(db: Session, user_id: uuid.UUID) -> int:
     """Get total points for a user"""
     user = db.query(User).filter(User.id == user_id).first()
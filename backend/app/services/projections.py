@@ -0,0 +1,145 @@
+"""
+Projections Service - Trend projections for academic series, batched across many series
+
+Server-side counterpart of frontend/lib/utils/projections.ts (see
+documentation/ARCHITECTURE/PROJECTION_SYSTEM.md): linear regression, moving
+average and exponential smoothing over the last `lookback_periods` points,
+projected `periods` terms ahead, clamped and rounded the same way. The window
+of every series is packed into one (series x lookback) matrix, so a whole
+chapter is projected in a single vectorized pass.
+
+Results match the frontend for the same input, including its quirks: the
+linear fit uses x = 0..n-1 inside the window but projects at
+x = len(series) + i - 1, and periods follow getNextPeriod()'s order.
+"""
+from typing import List, Optional, Sequence, Tuple
+import re
+import numpy as np
+
+METHODS = ("linear", "moving_average", "exponential")
+SMOOTHING_ALPHA = 0.3
+# Order used by getNextPeriod() in projections.ts (after Summer comes Fall of the next year)
+NEXT_PERIOD_ORDER = ['Fall', 'Spring', 'Summer', 'Winter']
+
+_PERIOD = re.compile(r"(\w+)\s+(\d{4})")
+
+
+class ProjectionConfig:
+    """Same options and defaults as ProjectionConfig in projections.ts"""
+
+    def __init__(
+        self,
+        method: str = "linear",
+        periods: int = 4,
+        lookback_periods: int = 6,
+        min_data_points: int = 2,
+        minimum: Optional[float] = None,
+        maximum: Optional[float] = None
+    ):
+        if method not in METHODS:
+            raise ValueError(f"Unknown projection method: {method}")
+        self.method = method
+        self.periods = periods
+        self.lookback_periods = lookback_periods
+        self.min_data_points = min_data_points
+        self.minimum = minimum
+        self.maximum = maximum
+
+
+# projectionPresets in projections.ts
+PRESETS = {
+    'gpa': ProjectionConfig(method="linear", minimum=0.0, maximum=4.0),
+    'points': ProjectionConfig(method="linear", minimum=0.0),
+    'credits': ProjectionConfig(method="moving_average", minimum=0.0),
+}
+
+
+def _next_period(semester: str, year: int) -> Tuple[str, int]:
+    """getNextPeriod() from projections.ts"""
+    if semester == 'Summer':
+        return 'Fall', year + 1
+    index = NEXT_PERIOD_ORDER.index(semester) + 1 if semester in NEXT_PERIOD_ORDER else 0
+    if index >= len(NEXT_PERIOD_ORDER):
+        return NEXT_PERIOD_ORDER[0], year + 1
+    return NEXT_PERIOD_ORDER[index], year
+
+
+def _projected_periods(existing: Sequence[str], periods: int) -> List[Tuple[int, str]]:
+    """(projection index, period) pairs after the last existing period, skipping existing periods"""
+    match = _PERIOD.search(existing[-1])
+    if not match:
+        return []
+    semester, year = match.group(1), int(match.group(2))
+    seen = set(existing)
+    result = []
+    for i in range(periods):
+        semester, year = _next_period(semester, year)
+        period = f"{semester} {year}"
+        if period in seen:
+            semester, year = _next_period(semester, year)
+            continue
+        seen.add(period)
+        result.append((i, period))
+    return result
+
+
+def _projected_values(values: List[Sequence[float]], config: ProjectionConfig) -> np.ndarray:
+    """(series x periods) projected values, one vectorized fit over every series' window"""
+    lookback = config.lookback_periods
+    windows = np.zeros((len(values), lookback))
+    valid = np.zeros((len(values), lookback), dtype=bool)
+    for row, series in enumerate(values):
+        recent = series[-lookback:]
+        windows[row, lookback - len(recent):] = recent
+        valid[row, lookback - len(recent):] = True
+
+    n = valid.sum(axis=1).astype(np.float64)
+    lengths = np.array([len(series) for series in values], dtype=np.float64)
+    steps = np.arange(config.periods)
+
+    if config.method == "linear":
+        x = np.where(valid, np.arange(lookback) - (lookback - n)[:, None], 0.0)  # 0..n-1 inside the window
+        sum_x, sum_y = x.sum(axis=1), windows.sum(axis=1)
+        sum_xy, sum_x2 = (x * windows).sum(axis=1), (x * x).sum(axis=1)
+        denominator = n * sum_x2 - sum_x * sum_x
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = np.where(denominator != 0, (n * sum_xy - sum_x * sum_y) / denominator, 0.0)
+        intercept = (sum_y - slope * sum_x) / n
+        projected = slope[:, None] * (lengths[:, None] + steps - 1) + intercept[:, None]
+    elif config.method == "moving_average":
+        projected = np.repeat((windows.sum(axis=1) / n)[:, None], config.periods, axis=1)
+    else:
+        first = (lookback - n).astype(np.int64)
+        smoothed = windows[np.arange(len(values)), first]
+        for column in range(1, lookback):
+            update = valid[:, column] & (column > first)
+            smoothed = np.where(update, SMOOTHING_ALPHA * windows[:, column] + (1 - SMOOTHING_ALPHA) * smoothed, smoothed)
+        projected = np.repeat(smoothed[:, None], config.periods, axis=1)
+
+    if config.minimum is not None:
+        projected = np.maximum(projected, config.minimum)
+    if config.maximum is not None:
+        projected = np.minimum(projected, config.maximum)
+    return np.floor(projected * 100 + 0.5) / 100  # Math.round(value * 100) / 100
+
+
+def project_series(
+    series: Sequence[Sequence[Tuple[str, Optional[float]]]],
+    config: ProjectionConfig
+) -> List[List[Tuple[str, float]]]:
+    """
+    Projected (period, value) points for each series of chronological (period, value)
+    points. Series shorter than min_data_points, or ending in a period without a
+    year, get no projections. Missing values count as 0.
+    """
+    results: List[List[Tuple[str, float]]] = [[] for _ in series]
+    eligible = [row for row, points in enumerate(series) if points and len(points) >= config.min_data_points]
+    if not eligible or config.periods <= 0:
+        return results
+
+    values = [[value or 0.0 for _, value in series[row]] for row in eligible]
+    projected = _projected_values(values, config)
+    for position, row in enumerate(eligible):
+        periods = _projected_periods([period for period, _ in series[row]], config.periods)
+        results[row] = [(period, float(projected[position, i])) for i, period in periods]
+    return results
@@ -0,0 +1,112 @@
+"""
+Recommendation Snapshots Service - Stores each help request's tutor ranking in `recommendations`
+
+The ranking is computed when a help request is created and served from the
+stored rows afterwards. A snapshot is stale once the course tutor index for its
+course code has been refreshed after the snapshot was taken (new or changed
+graded courses); stale snapshots are still served and re-ranked in the background.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.help_request import HelpRequest
+from app.models.recommendation import Recommendation
+from app.models.user import User
+from app.services.tutor_ranking import rank_tutors
+from typing import Any, List, Optional, Tuple
+import logging
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+_refreshing = set()  # help_request ids with a background refresh in flight (per worker)
+_refreshing_lock = threading.Lock()
+
+
+def store_recommendations(db: Session, help_request_id: uuid.UUID, ranked: List[Tuple[Course, User]]) -> None:
+    """Replace the stored ranking of a help request and commit"""
+    db.query(Recommendation).filter(
+        Recommendation.help_request_id == help_request_id
+    ).delete(synchronize_session=False)
+    if ranked:
+        db.execute(insert(Recommendation), [
+            {
+                'id': uuid.uuid4(),
+                'help_request_id': help_request_id,
+                'helper_id': helper.id,
+                'course_id': course.id,
+                'grade_score': course.grade_score,
+                'rank': rank
+            }
+            for rank, (course, helper) in enumerate(ranked, 1)
+        ])
+    db.commit()
+
+
+def refresh_recommendations(db: Session, help_request: HelpRequest, requester_major: Optional[str]) -> List[Tuple[Course, User]]:
+    """Re-rank tutors for a help request, store the snapshot and return the ranking"""
+    ranked = rank_tutors(
+        db, help_request.course_code, help_request.requester_id, requester_major,
+        limit=settings.RECOMMENDATION_SNAPSHOT_SIZE
+    )
+    store_recommendations(db, help_request.id, ranked)
+    return ranked
+
+
+def get_snapshot(db: Session, help_request: HelpRequest) -> Tuple[List[Tuple[Course, User]], bool]:
+    """
+    Stored ranking of a help request, best first, and whether it is stale.
+    One query (idx_recommendations_request_rank); staleness comes from the latest
+    course tutor index refresh for the course code, read in the same statement.
+    """
+    index_refreshed_at = select(
+        func.max(CourseTutorIndex.updated_at)
+    ).where(
+        CourseTutorIndex.course_code == help_request.course_code
+    ).scalar_subquery()
+
+    rows: List[Any] = db.query(
+        Course, User, Recommendation.created_at, index_refreshed_at
+    ).select_from(
+        Recommendation
+    ).join(
+        Course, Recommendation.course_id == Course.id
+    ).join(
+        User, Recommendation.helper_id == User.id
+    ).filter(
+        Recommendation.help_request_id == help_request.id
+    ).order_by(
+        Recommendation.rank
+    ).all()
+
+    if not rows:
+        return [], False
+    # Rows of a snapshot are inserted together, so they share created_at
+    snapshot_taken_at, index_refreshed = rows[0][2], rows[0][3]
+    stale = snapshot_taken_at is not None and index_refreshed is not None and index_refreshed > snapshot_taken_at
+    return [(course, helper) for course, helper, _, _ in rows], stale
+
+
+def refresh_in_background(help_request_id: uuid.UUID, requester_major: Optional[str]) -> None:
+    """Background task: re-rank a stale snapshot in its own session (one refresh per request at a time)"""
+    with _refreshing_lock:
+        if help_request_id in _refreshing:
+            return
+        _refreshing.add(help_request_id)
+
+    db = SessionLocal()
+    try:
+        help_request = db.query(HelpRequest).filter(HelpRequest.id == help_request_id).first()
+        if help_request is not None:
+            refresh_recommendations(db, help_request, requester_major)
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Recommendation refresh failed for help request {help_request_id}: {str(e)}")
+    finally:
+        db.close()
+        with _refreshing_lock:
+            _refreshing.discard(help_request_id)
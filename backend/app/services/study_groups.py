@@ -0,0 +1,126 @@
+"""
+Study Groups Service - Forms study groups for every current course in one vectorized pass
+
+Builds the member x course incidence matrix from all current enrolments
+(transcript_id IS NULL), derives pairwise shared-course counts with one matrix
+product, then splits each course's members into balanced groups, placing
+members who share the most other courses together.
+
+Plans are cached per worker, keyed by the current_courses cache version that
+courses_changed bumps, so a cache hit is one counter lookup and any enrolment
+change (in any worker) produces a new plan on the next request. Enrolments are
+only scanned on a miss.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.course import Course
+from app.services.cache_versions import CURRENT_COURSES, get_cache_version
+from typing import Dict, List, Sequence, Tuple
+import uuid
+import numpy as np
+
+
+class StudyGroupPlan:
+    """Suggested groups per course code, plus pairwise shared current-course counts"""
+
+    def __init__(self, member_ids: List[uuid.UUID], shared: np.ndarray, groups: Dict[str, List[List[int]]]):
+        self.member_ids = member_ids
+        self._positions = {member_id: i for i, member_id in enumerate(member_ids)}
+        self.shared = shared  # shared[i, j] = current courses members i and j both take
+        self.groups = groups  # course_code -> groups of member positions
+
+    def groups_for(self, user_id: uuid.UUID) -> List[Tuple[str, int, List[uuid.UUID]]]:
+        """(course_code, group_count, member ids) of each group containing user_id"""
+        position = self._positions.get(user_id)
+        if position is None:
+            return []
+        result = []
+        for course_code, course_groups in sorted(self.groups.items()):
+            for group in course_groups:
+                if position in group:
+                    result.append((course_code, len(course_groups), [self.member_ids[i] for i in group]))
+                    break
+        return result
+
+    def shared_count(self, user_id: uuid.UUID, other_id: uuid.UUID) -> int:
+        """Number of current courses two members share"""
+        return int(self.shared[self._positions[user_id], self._positions[other_id]])
+
+
+_plan_cache = TTLCache(maxsize=2, ttl_seconds=settings.STUDY_GROUPS_CACHE_TTL_SECONDS)
+
+
+def _current_enrolments(db: Session) -> List[Tuple[uuid.UUID, str]]:
+    """Every (user_id, course_code) current enrolment, in a stable order"""
+    return db.query(Course.user_id, Course.course_code).filter(
+        and_(
+            Course.transcript_id.is_(None),
+            Course.course_code.isnot(None)
+        )
+    ).distinct().order_by(Course.course_code, Course.user_id).all()
+
+
+def _split_course(members: np.ndarray, shared: np.ndarray, group_size: int) -> List[List[int]]:
+    """
+    Split one course's members into ceil(n / group_size) groups whose sizes differ by
+    at most one. Members are placed strongest-affinity first, each into the open group
+    they share the most courses with (smallest group on ties).
+    """
+    count = len(members)
+    group_count = -(-count // group_size)
+    capacities = np.full(group_count, count // group_count)
+    capacities[:count % group_count] += 1
+
+    affinity = shared[np.ix_(members, members)].astype(np.int64)
+    np.fill_diagonal(affinity, 0)
+
+    assignment = np.zeros((group_count, count), dtype=np.int64)  # group x member membership
+    sizes = np.zeros(group_count, dtype=np.int64)
+    for member in np.argsort(-affinity.sum(axis=1), kind="stable"):
+        scores = assignment @ affinity[:, member]
+        open_groups = np.flatnonzero(sizes < capacities)
+        # Most shared courses with the group, then fewest members, then lowest group number
+        best = open_groups[np.lexsort((open_groups, sizes[open_groups], -scores[open_groups]))[0]]
+        assignment[best, member] = 1
+        sizes[best] += 1
+
+    return [sorted(int(members[i]) for i in np.flatnonzero(row)) for row in assignment]
+
+
+def build_study_group_plan(enrolments: Sequence[Tuple[uuid.UUID, str]], group_size: int) -> StudyGroupPlan:
+    """Form groups for every course with at least two current members"""
+    member_ids = sorted({user_id for user_id, _ in enrolments}, key=str)
+    course_codes = sorted({course_code for _, course_code in enrolments})
+    if not member_ids:
+        return StudyGroupPlan([], np.zeros((0, 0), dtype=np.int32), {})
+
+    member_positions = {member_id: i for i, member_id in enumerate(member_ids)}
+    course_positions = {course_code: j for j, course_code in enumerate(course_codes)}
+    rows = np.fromiter((member_positions[user_id] for user_id, _ in enrolments), dtype=np.int64, count=len(enrolments))
+    cols = np.fromiter((course_positions[code] for _, code in enrolments), dtype=np.int64, count=len(enrolments))
+
+    incidence = np.zeros((len(member_ids), len(course_codes)), dtype=np.int32)
+    incidence[rows, cols] = 1
+    shared = incidence @ incidence.T
+
+    groups = {}
+    for j, course_code in enumerate(course_codes):
+        members = np.flatnonzero(incidence[:, j])
+        if len(members) >= 2:
+            groups[course_code] = _split_course(members, shared, max(group_size, 2))
+
+    return StudyGroupPlan(member_ids, shared, groups)
+
+
+def get_study_group_plan(db: Session) -> StudyGroupPlan:
+    """Current plan for the chapter, rebuilt only when enrolments have changed"""
+    # Read the version before scanning: a change committed in between is then cached
+    # under the older version and replaced after its bump
+    key = (get_cache_version(db, CURRENT_COURSES), settings.STUDY_GROUP_SIZE)
+    plan = _plan_cache.get(key)
+    if plan is None:
+        plan = build_study_group_plan(_current_enrolments(db), settings.STUDY_GROUP_SIZE)
+        _plan_cache.set(key, plan)
+    return plan
@@ -0,0 +1,195 @@
+"""
+Tutor Ranking Service - Ranks past takers of a course as tutors in set-based SQL queries
+"""
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import and_, case, desc, func, literal
+from app.core.config import settings
+from app.core.majors import normalize_major
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.help_request import HelpRequest
+from app.models.user import User
+from typing import Any, List, Optional, Tuple
+import uuid
+
+
+def _same_major_expr(major_key_column, requester_major: Optional[str]):
+    """1 if major_key_column matches the requester's normalized major, else 0"""
+    requester_key = normalize_major(requester_major)
+    if requester_key is None:
+        return literal(0)
+    # CASE rather than a bare comparison: NULL majors must rank as "different major",
+    # and NULLs would sort first under DESC
+    return case(
+        (major_key_column == requester_key, 1),
+        else_=0
+    )
+
+
+def build_tutor_ranking_query(
+    db: Session,
+    course_code: str,
+    exclude_user_id: uuid.UUID,
+    requester_major: Optional[str],
+    limit: int
+) -> Query:
+    """
+    Build the ranking query for tutors of course_code over all of its takers:
+    same major as the requester first, then grade_score, year (desc), semester.
+    Ranking and LIMIT happen in Postgres so only `limit` rows are hydrated.
+    Served by idx_courses_tutor_rank (course_code, grade_score DESC, year DESC).
+    """
+    return db.query(Course, User).join(
+        User, Course.user_id == User.id
+    ).filter(
+        and_(
+            Course.course_code == course_code,  # Uses idx_courses_tutor_rank
+            Course.user_id != exclude_user_id,
+            Course.grade_score.isnot(None)  # Only courses with valid grades
+        )
+    ).order_by(
+        desc(_same_major_expr(User.major_key, requester_major)),
+        desc(Course.grade_score),
+        Course.year.desc().nullslast(),
+        Course.semester.asc().nullsfirst()
+    ).limit(limit)
+
+
+def build_indexed_tutor_ranking_query(
+    db: Session,
+    course_code: str,
+    exclude_user_id: uuid.UUID,
+    requester_major: Optional[str],
+    limit: int
+) -> Query:
+    """
+    Same ranking, read from the course_tutor_index rows for course_code. The index
+    keeps the top K takers overall and per major, so for limit < K the result equals
+    build_tutor_ranking_query: the best `limit` same-major takers are indexed, and so
+    is every other-major taker ranked above them.
+    """
+    return db.query(Course, User).join(
+        CourseTutorIndex, CourseTutorIndex.course_id == Course.id
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        and_(
+            CourseTutorIndex.course_code == course_code,  # Uses idx_course_tutor_index_code_rank
+            CourseTutorIndex.user_id != exclude_user_id
+        )
+    ).order_by(
+        desc(_same_major_expr(CourseTutorIndex.major_key, requester_major)),
+        CourseTutorIndex.rank
+    ).limit(limit)
+
+
+def rank_tutors(
+    db: Session,
+    course_code: str,
+    exclude_user_id: uuid.UUID,
+    requester_major: Optional[str],
+    limit: int = 10
+) -> List[Tuple[Course, User]]:
+    """Return the top `limit` (course, helper) pairs for course_code, best first"""
+    # The index holds K rows per course (and per major) and may include the requester,
+    # so larger limits fall back to ranking every taker
+    if limit < settings.COURSE_TUTOR_INDEX_SIZE:
+        query = build_indexed_tutor_ranking_query(db, course_code, exclude_user_id, requester_major, limit)
+    else:
+        query = build_tutor_ranking_query(db, course_code, exclude_user_id, requester_major, limit)
+    return query.all()
+
+
+def _help_request_tutors_subquery(db: Session, requester_id: uuid.UUID):
+    """
+    Every (help request, candidate tutor course) pair for the requester's help requests,
+    with the course's rank within its help request (grade_score, year, semester desc).
+    One set-based query instead of one top-N query per help request.
+    """
+    return db.query(
+        HelpRequest.id.label('help_request_id'),
+        HelpRequest.created_at.label('help_request_date'),
+        Course.id.label('course_id'),
+        Course.user_id.label('helper_id'),
+        Course.course_code.label('course_code'),
+        Course.grade_score.label('grade_score'),
+        func.row_number().over(
+            partition_by=HelpRequest.id,
+            order_by=(desc(Course.grade_score), desc(Course.year), desc(Course.semester))
+        ).label('course_rank')
+    ).join(
+        Course,
+        and_(
+            Course.course_code == HelpRequest.course_code,
+            Course.user_id != requester_id,
+            Course.grade_score.isnot(None)
+        )
+    ).filter(
+        HelpRequest.requester_id == requester_id
+    ).subquery()
+
+
+def previous_tutor_rows(db: Session, requester_id: uuid.UUID) -> List[Any]:
+    """
+    Top tutor of each of the requester's help requests, one row per tutor (their best grade,
+    most recent help request on ties). Rows: (Course, User, help_request_id, help_request_date),
+    ordered by grade_score desc.
+    """
+    ranked = _help_request_tutors_subquery(db, requester_id)
+    per_helper = db.query(
+        ranked,
+        func.row_number().over(
+            partition_by=ranked.c.helper_id,
+            order_by=(desc(ranked.c.grade_score), desc(ranked.c.help_request_date))
+        ).label('helper_rank')
+    ).filter(
+        ranked.c.course_rank == 1
+    ).subquery()
+
+    return db.query(
+        Course, User, per_helper.c.help_request_id, per_helper.c.help_request_date
+    ).join(
+        per_helper, Course.id == per_helper.c.course_id
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        per_helper.c.helper_rank == 1
+    ).order_by(
+        desc(per_helper.c.grade_score),
+        desc(per_helper.c.help_request_date)
+    ).all()
+
+
+def connected_brother_rows(db: Session, requester_id: uuid.UUID, per_request: int = 10) -> List[Any]:
+    """
+    Top `per_request` tutors of each of the requester's help requests, deduplicated to one row
+    per (tutor, course_code) (earliest help request, best rank). Rows:
+    (Course, User, help_request_date, first_connected, last_connected), ordered by
+    last_connected desc, then tutor, then help_request_date.
+    """
+    ranked = _help_request_tutors_subquery(db, requester_id)
+    top = db.query(ranked).filter(ranked.c.course_rank <= per_request).subquery()
+    per_course = db.query(
+        top,
+        func.row_number().over(
+            partition_by=(top.c.helper_id, top.c.course_code),
+            order_by=(top.c.help_request_date, top.c.course_rank)
+        ).label('course_occurrence'),
+        func.min(top.c.help_request_date).over(partition_by=top.c.helper_id).label('first_connected'),
+        func.max(top.c.help_request_date).over(partition_by=top.c.helper_id).label('last_connected')
+    ).subquery()
+
+    return db.query(
+        Course, User, per_course.c.help_request_date, per_course.c.first_connected, per_course.c.last_connected
+    ).join(
+        per_course, Course.id == per_course.c.course_id
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        per_course.c.course_occurrence == 1
+    ).order_by(
+        desc(per_course.c.last_connected),
+        per_course.c.helper_id,
+        per_course.c.help_request_date,
+        per_course.c.course_rank
+    ).all()
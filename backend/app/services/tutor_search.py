@@ -0,0 +1,145 @@
+"""
+Tutor Search Service - Scores tutors across several courses at once
+
+Loads every graded taker of the requested courses in one query and scores all
+candidates in a single vectorized pass: coverage of the requested courses,
+average grade_score over the covered ones, and recency of their latest course,
+with same major as the requester as the tiebreaker.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, desc
+from app.core.majors import normalize_major
+from app.models.course import Course
+from app.models.user import User
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+import uuid
+import numpy as np
+
+# Score weights (sum to 1) - coverage matters most when preparing for a whole semester
+COVERAGE_WEIGHT = 0.5
+GRADE_WEIGHT = 0.35
+RECENCY_WEIGHT = 0.15
+RECENCY_HALF_LIFE_YEARS = 2.0  # Recency halves for every 2 years since the latest covered course
+MAX_GRADE_SCORE = 4.0
+
+
+def _candidate_rows(db: Session, course_codes: Sequence[str], exclude_user_id: uuid.UUID) -> List[Any]:
+    """Graded courses of every other taker of course_codes, best attempt first per (user, code)"""
+    return db.query(
+        Course.user_id,
+        Course.course_code,
+        Course.grade,
+        Course.grade_score,
+        Course.semester,
+        Course.year,
+        User.first_name,
+        User.last_name,
+        User.email,
+        User.phone_number,
+        User.major,
+        User.major_key
+    ).join(
+        User, Course.user_id == User.id
+    ).filter(
+        and_(
+            Course.course_code.in_(course_codes),  # Uses idx_courses_tutor_rank
+            Course.user_id != exclude_user_id,
+            Course.grade_score.isnot(None)
+        )
+    ).order_by(
+        Course.user_id,
+        Course.course_code,
+        desc(Course.grade_score),
+        Course.year.desc().nullslast()
+    ).all()
+
+
+def search_tutors(
+    db: Session,
+    course_codes: Sequence[str],
+    exclude_user_id: uuid.UUID,
+    requester_major: Optional[str],
+    limit: int = 10
+) -> List[Dict[str, Any]]:
+    """
+    Top `limit` tutors across course_codes, best first. Each result has the tutor's
+    details, their best attempt at each covered course, and the score components.
+    """
+    codes = sorted(set(course_codes))
+    if not codes:
+        return []
+
+    code_positions = {code: j for j, code in enumerate(codes)}
+
+    # Best attempt per (user, course_code) - rows are ordered best first within each pair
+    tutors: Dict[uuid.UUID, Dict[str, Any]] = {}
+    best = []
+    for row in _candidate_rows(db, codes, exclude_user_id):
+        tutor = tutors.get(row.user_id)
+        if tutor is None:
+            tutor = tutors[row.user_id] = {'row': row, 'position': len(tutors), 'courses': {}}
+        if row.course_code in tutor['courses']:
+            continue
+        tutor['courses'][row.course_code] = row
+        best.append((tutor['position'], code_positions[row.course_code], float(row.grade_score), row.year))
+    if not tutors:
+        return []
+
+    # tutor x course matrices, NaN where the tutor hasn't taken the course
+    positions, columns, grade_scores, years = zip(*best)
+    grades = np.full((len(tutors), len(codes)), np.nan)
+    taken_years = np.full((len(tutors), len(codes)), np.nan)
+    grades[positions, columns] = grade_scores
+    taken_years[positions, columns] = [np.nan if year is None else year for year in years]
+
+    covered = ~np.isnan(grades)
+    coverage = covered.sum(axis=1) / len(codes)
+    average_grade = np.where(covered, grades, 0.0).sum(axis=1) / covered.sum(axis=1)
+    latest_year = np.where(np.isnan(taken_years), -np.inf, taken_years).max(axis=1)
+    years_since = np.maximum(datetime.now().year - latest_year, 0.0)
+    recency = np.where(np.isinf(latest_year), 0.0, 0.5 ** (years_since / RECENCY_HALF_LIFE_YEARS))
+
+    scores = np.round(
+        COVERAGE_WEIGHT * coverage
+        + GRADE_WEIGHT * average_grade / MAX_GRADE_SCORE
+        + RECENCY_WEIGHT * recency,
+        6
+    )
+
+    ordered = list(tutors.values())
+    requester_key = normalize_major(requester_major)
+    same_major = np.array([requester_key is not None and t['row'].major_key == requester_key for t in ordered])
+    names = np.array([f"{t['row'].first_name} {t['row'].last_name}" for t in ordered])
+
+    # np.lexsort: last key is primary - score, then same major, then name
+    order = np.lexsort((names, ~same_major, -scores))[:limit]
+
+    results = []
+    for i in order:
+        tutor = ordered[i]
+        row = tutor['row']
+        results.append({
+            'helper_id': str(row.user_id),
+            'helper_name': str(names[i]),
+            'helper_email': row.email,
+            'helper_phone_number': row.phone_number,
+            'major': row.major,
+            'courses': [
+                {
+                    'course_code': course.course_code,
+                    'grade': course.grade,
+                    'grade_score': float(course.grade_score),
+                    'semester': course.semester,
+                    'year': course.year
+                }
+                for _, course in sorted(tutor['courses'].items())
+            ],
+            'courses_covered': int(covered[i].sum()),
+            'coverage': float(coverage[i]),
+            'average_grade_score': round(float(average_grade[i]), 2),
+            'latest_year': None if np.isinf(latest_year[i]) else int(latest_year[i]),
+            'same_major': bool(same_major[i]),
+            'score': float(scores[i])
+        })
+    return results
@@ -0,0 +1,180 @@
+"""
+What-If Service - Term and cumulative GPA under hypothetical grades for current courses
+
+Current courses are those without a transcript (transcript_id IS NULL). Every
+combination of grade levels (or a list of explicit scenarios) is evaluated as a
+NumPy grid: each course contributes a vector of points/credits per grade level
+and the totals of all combinations come from successive outer sums, so
+13 levels over 5 courses (371,293 scenarios) is a handful of array operations.
+
+GPA rules match the rest of the app (calculate_gpa): only grades of C- (1.7) or
+above count toward points and credits.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func
+from app.models.course import Course
+from app.services.pdf_processor import PDFProcessor
+from typing import Any, Dict, List, Optional, Sequence
+import uuid
+import numpy as np
+
+# Letter grades with a GPA score, best first (S/W have no GPA impact)
+GRADE_LEVELS = [grade for grade, score in PDFProcessor.GRADE_MAP.items() if score is not None]
+CREDIT_THRESHOLD = 1.7  # C-
+GPA_PERCENTILES = (10, 25, 50, 75, 90)
+HISTOGRAM_EDGES = np.arange(0.0, 4.25, 0.25)  # 0.25-wide buckets, the last one includes 4.0
+MAX_EXPLICIT_SCENARIOS = 1000  # Explicit scenarios are returned one by one
+
+
+class WhatIfError(ValueError):
+    """Invalid grade levels or scenarios (message is safe to show to the user)"""
+
+
+def current_courses(db: Session, user_id: uuid.UUID) -> List[Course]:
+    """Courses the user is currently taking, in a stable order"""
+    return db.query(Course).filter(
+        and_(Course.user_id == user_id, Course.transcript_id.is_(None))
+    ).order_by(Course.course_code, Course.id).all()
+
+
+def completed_totals(db: Session, user_id: uuid.UUID) -> tuple:
+    """(points, credits) of credit-earning graded courses outside the current term"""
+    points, credits = db.query(
+        func.coalesce(func.sum(Course.grade_score * Course.credit_hours), 0),
+        func.coalesce(func.sum(Course.credit_hours), 0)
+    ).filter(
+        and_(
+            Course.user_id == user_id,
+            Course.transcript_id.isnot(None),
+            Course.grade_score.isnot(None),
+            Course.credit_hours.isnot(None),
+            Course.grade_score >= CREDIT_THRESHOLD
+        )
+    ).one()
+    return float(points), float(credits)
+
+
+def _scores(grades: Sequence[str]) -> np.ndarray:
+    """GRADE_MAP scores of grade letters (WhatIfError for letters without a score)"""
+    scores = []
+    for grade in grades:
+        score = PDFProcessor.GRADE_MAP.get(grade.strip().upper())
+        if score is None:
+            raise WhatIfError(f"Unknown grade: {grade}")
+        scores.append(score)
+    return np.array(scores, dtype=np.float64)
+
+
+def _gpa(points: np.ndarray, credits: np.ndarray) -> np.ndarray:
+    """points / credits, NaN where there are no credits"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(credits > 0, points / credits, np.nan)
+
+
+def enumerate_totals(credit_hours: np.ndarray, levels: np.ndarray) -> tuple:
+    """
+    (points, credits) of every combination of levels over the courses, as flat arrays
+    (course 0 varies slowest). Built by outer sums of per-course contributions.
+    """
+    counts = (levels >= CREDIT_THRESHOLD).astype(np.float64)
+    points = np.zeros(1)
+    credits = np.zeros(1)
+    for hours in credit_hours:
+        points = np.add.outer(points, levels * counts * hours).ravel()
+        credits = np.add.outer(credits, counts * hours).ravel()
+    return points, credits
+
+
+def scenario_totals(credit_hours: np.ndarray, scores: np.ndarray) -> tuple:
+    """(points, credits) of explicit scenarios - scores is scenarios x courses, NaN = course not counted"""
+    counts = np.where(np.isnan(scores), 0.0, (scores >= CREDIT_THRESHOLD).astype(np.float64))
+    filled = np.nan_to_num(scores)
+    return (filled * counts) @ credit_hours, counts @ credit_hours
+
+
+def distribution(gpas: np.ndarray) -> Optional[Dict[str, Any]]:
+    """Summary statistics and 0.25-wide histogram of GPAs (None if no scenario has credits)"""
+    values = gpas[~np.isnan(gpas)]
+    if not len(values):
+        return None
+    counts, _ = np.histogram(values, bins=HISTOGRAM_EDGES)
+    percentiles = np.percentile(values, GPA_PERCENTILES)
+    return {
+        'min': round(float(values.min()), 2),
+        'max': round(float(values.max()), 2),
+        'mean': round(float(values.mean()), 2),
+        **{f'p{p}': round(float(value), 2) for p, value in zip(GPA_PERCENTILES, percentiles)},
+        'histogram': [
+            {
+                'range': f"{low:.2f}-{4.0 if i == len(counts) - 1 else low + 0.24:.2f}",
+                'count': int(count),
+                'percentage': round(float(count) / len(values) * 100, 1)
+            }
+            for i, (low, count) in enumerate(zip(HISTOGRAM_EDGES[:-1], counts))
+        ]
+    }
+
+
+def simulate(
+    db: Session,
+    user_id: uuid.UUID,
+    grade_levels: Optional[Sequence[str]] = None,
+    scenarios: Optional[Sequence[Dict[str, str]]] = None,
+    max_scenarios: int = 1_000_000
+) -> Dict[str, Any]:
+    """
+    Term and cumulative GPA distributions for the user's current courses: every
+    combination of grade_levels (default: all GRADE_MAP letters with a score, at most
+    max_scenarios combinations), or the explicit scenarios (course_code -> grade;
+    omitted courses are not counted).
+    """
+    courses = current_courses(db, user_id)
+    base_points, base_credits = completed_totals(db, user_id)
+    credit_hours = np.array([float(c.credit_hours or 0) for c in courses], dtype=np.float64)
+
+    if scenarios is not None:
+        if len(scenarios) > MAX_EXPLICIT_SCENARIOS:
+            raise WhatIfError(f"At most {MAX_EXPLICIT_SCENARIOS} explicit scenarios can be evaluated at once")
+        codes = {c.course_code for c in courses}
+        scores = np.full((len(scenarios), len(courses)), np.nan)
+        for row, scenario in enumerate(scenarios):
+            unknown = set(scenario) - codes
+            if unknown:
+                raise WhatIfError(f"Not a current course: {sorted(unknown)[0]}")
+            for column, course in enumerate(courses):
+                if course.course_code in scenario:
+                    scores[row, column] = _scores([scenario[course.course_code]])[0]
+        points, credits = scenario_totals(credit_hours, scores)
+    else:
+        levels = _scores(grade_levels if grade_levels else GRADE_LEVELS)
+        if len(levels) ** len(courses) > max_scenarios:
+            raise WhatIfError(
+                f"{len(levels)} grade levels over {len(courses)} courses is more than {max_scenarios} "
+                "scenarios - pass fewer grade levels or explicit scenarios"
+            )
+        points, credits = enumerate_totals(credit_hours, levels)
+
+    term_gpa = _gpa(points, credits)
+    cumulative_gpa = _gpa(points + base_points, credits + base_credits)
+    results = []
+    if scenarios is not None:
+        results = [
+            {
+                'grades': dict(scenario),
+                'term_gpa': None if np.isnan(term) else round(float(term), 2),
+                'cumulative_gpa': None if np.isnan(cumulative) else round(float(cumulative), 2)
+            }
+            for scenario, term, cumulative in zip(scenarios, term_gpa, cumulative_gpa)
+        ]
+
+    return {
+        'courses': [
+            {'course_code': c.course_code, 'course_name': c.course_name, 'credit_hours': float(c.credit_hours or 0)}
+            for c in courses
+        ],
+        'current_gpa': round(base_points / base_credits, 2) if base_credits > 0 else 0.0,
+        'scenario_count': int(len(points)),
+        'term_gpa': distribution(term_gpa),
+        'cumulative_gpa': distribution(cumulative_gpa),
+        'scenarios': results
+    }
@@ -10,6 +10,8 @@ from app.core.database import SessionLocal
 from app.services.pdf_processor import pdf_processor
 from app.models.transcript import Transcript
 from app.models.course import Course
+from app.services.course_changes import courses_changed
+from app.services.course_tutor_index import user_course_codes
 import uuid
 from typing import Optional
 
@@ -346,6 +348,10 @@ def _process_transcript_internal(transcript_id: str, user_id: str, pdf_content:
                 transcript.error_message = f"Some courses had errors: {'; '.join(errors)}"
             db.commit()
             
+            # Refresh derived course data (see courses_changed) for the courses on this transcript
+            if courses_saved > 0:
+                courses_changed(db, uuid.UUID(user_id), user_course_codes(db, uuid.UUID(user_id), [transcript.id]))
+            
             # Log summary with detailed information
             print(f"\n=== Transcript Processing Summary ===")
             print(f"Transcript ID: {transcript_id}")
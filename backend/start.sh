@@ -9,9 +9,7 @@ if [ -z "$PORT" ]; then
     export PORT=8000
 fi
 
-# Run database migrations (optional - uncomment if you want auto-migrations)
-# python -m alembic upgrade head || echo "Migration skipped or failed"
-
-# Start the server
-echo "Starting uvicorn on port $PORT..."
-exec uvicorn app.main:app --host 0.0.0.0 --port $PORT --workers 1
+# Start the server (runs migrations once, then forks gunicorn/uvicorn workers)
+# Set WEB_CONCURRENCY to override the auto-sized worker count
+echo "Starting server on port $PORT..."
+exec python start_server.py
@@ -1,28 +1,183 @@
 #!/usr/bin/env python
 """
 Railway startup script - handles PORT environment variable correctly
+
+Production launcher:
+- Migrations run as a pre-deploy step (python -m app.core.migrations); set
+  RUN_MIGRATIONS_ON_STARTUP=1 to run them here, once, before forking instead
+- Preloads the app in the master process and forks N gunicorn/uvicorn workers
+- Sizes N from available CPUs and memory (override with WEB_CONCURRENCY)
+- Recycles workers after MAX_REQUESTS requests to keep memory in check
+
+Falls back to a single uvicorn worker where gunicorn is unavailable (e.g. Windows).
 """
 import os
 import sys
 
+# Tunables (environment variables)
+DEFAULT_WORKER_MEMORY_MB = 256  # Expected resident memory per worker (pdfplumber + SQLAlchemy)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_REQUESTS = 2000
+DEFAULT_MAX_REQUESTS_JITTER = 200
+DEFAULT_DB_MAX_CONNECTIONS = 90  # Connection budget shared by all workers
+DEFAULT_DASHBOARD_EXTRA_CONNECTIONS = 2  # Per worker, for concurrent /dashboard/summary sections
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default"""
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        parsed = int(value)
+        return parsed if parsed > 0 else default
+    except ValueError:
+        print(f"WARNING: Invalid {name} value '{value}', using default {default}", file=sys.stderr)
+        return default
+
+
+def _read_cgroup_value(paths) -> str:
+    """Return the first readable cgroup file's contents, or empty string"""
+    for path in paths:
+        try:
+            with open(path) as f:
+                return f.read().strip()
+        except OSError:
+            continue
+    return ""
+
+
+def available_cpus() -> float:
+    """CPUs usable by this process (affinity and container CPU quota aware)"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    # cgroup v2: "max 100000" or "200000 100000"
+    cpu_max = _read_cgroup_value(["/sys/fs/cgroup/cpu.max"])
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            cpus = min(cpus, int(quota) / int(period))
+    else:
+        # cgroup v1
+        quota = _read_cgroup_value(["/sys/fs/cgroup/cpu/cpu.cfs_quota_us"])
+        period = _read_cgroup_value(["/sys/fs/cgroup/cpu/cpu.cfs_period_us"])
+        if quota and period and int(quota) > 0:
+            cpus = min(cpus, int(quota) / int(period))
+
+    return max(cpus, 1.0)
+
+
+def available_memory_mb() -> int:
+    """Memory available to this process in MB (container limit aware), 0 if unknown"""
+    limit = _read_cgroup_value([
+        "/sys/fs/cgroup/memory.max",  # cgroup v2
+        "/sys/fs/cgroup/memory/memory.limit_in_bytes",  # cgroup v1
+    ])
+    if limit and limit != "max" and int(limit) < 1 << 60:
+        return int(limit) // (1024 * 1024)
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def compute_worker_count() -> int:
+    """Worker count from WEB_CONCURRENCY, or (2 x CPUs + 1) capped by memory and MAX_WORKERS"""
+    if os.environ.get("WEB_CONCURRENCY"):
+        return _env_int("WEB_CONCURRENCY", 1)
+
+    by_cpu = int(2 * available_cpus()) + 1
+    workers = min(by_cpu, _env_int("MAX_WORKERS", DEFAULT_MAX_WORKERS))
+
+    memory_mb = available_memory_mb()
+    if memory_mb:
+        by_memory = memory_mb // _env_int("WORKER_MEMORY_MB", DEFAULT_WORKER_MEMORY_MB)
+        workers = min(workers, by_memory)
+
+    return max(workers, 1)
+
+
+def configure_db_pool(workers: int) -> None:
+    """Split the database connection budget across workers (unless set explicitly)"""
+    if os.environ.get("DB_POOL_SIZE") or os.environ.get("DB_MAX_OVERFLOW"):
+        return
+    per_worker = max(_env_int("DB_MAX_CONNECTIONS", DEFAULT_DB_MAX_CONNECTIONS) // workers, 3)
+    pool_size = max(per_worker // 3, 1)
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = str(per_worker - pool_size)
+    # A small share of the overflow for dashboard sections on their own sessions (none on tight budgets)
+    dashboard_connections = min(DEFAULT_DASHBOARD_EXTRA_CONNECTIONS, per_worker // 5)
+    os.environ.setdefault("DASHBOARD_EXTRA_CONNECTIONS", str(dashboard_connections))
+    print(
+        f"✓ DB pool per worker: pool_size={pool_size}, max_overflow={per_worker - pool_size}, "
+        f"dashboard_extra_connections={os.environ['DASHBOARD_EXTRA_CONNECTIONS']}"
+    )
+
+
+def run_migrations_once() -> None:
+    """Apply migrations before forking (only for deployments without a pre-deploy step)"""
+    from app.core.migrations import run_migrations
+    try:
+        run_migrations()
+    except Exception as e:
+        # Log and start anyway - tables may be out of date
+        print(f"⚠️  WARNING: Database migrations failed: {e}", file=sys.stderr)
+        print("   Application will start, but database operations may fail.", file=sys.stderr)
+
+
+def run_gunicorn(app, port: int, workers: int) -> None:
+    """Serve the preloaded app with gunicorn + uvicorn workers"""
+    from gunicorn.app.base import BaseApplication  # type: ignore
+
+    class NuPeerApplication(BaseApplication):
+        def __init__(self, application, options):
+            self.application = application
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return self.application
+
+    options = {
+        "bind": f"0.0.0.0:{port}",  # Must be 0.0.0.0, not 127.0.0.1, for Railway
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": _env_int("MAX_REQUESTS", DEFAULT_MAX_REQUESTS),
+        "max_requests_jitter": _env_int("MAX_REQUESTS_JITTER", DEFAULT_MAX_REQUESTS_JITTER),
+        "timeout": 180,  # Longer than the upload deadline (transcript parsing is synchronous)
+        "graceful_timeout": 30,
+        "accesslog": "-",
+        "loglevel": "info",
+    }
+    NuPeerApplication(app, options).run()
+
+
 def main():
     # Get PORT from environment (Railway provides this)
     port = os.environ.get('PORT', '8000')
-    
+
     try:
         port = int(port)
     except ValueError:
         print(f"WARNING: Invalid PORT value '{port}', using default 8000", file=sys.stderr)
         port = 8000
-    
+
     print(f"=== Starting NuPeer Backend on port {port} ===")
     print(f"PORT environment variable: {os.environ.get('PORT', 'NOT SET')}")
-    
+
     # Check critical environment variables
     print("\n=== Checking Environment Variables ===")
     database_url = os.environ.get('DATABASE_URL', 'NOT SET')
     secret_key = os.environ.get('SECRET_KEY', 'NOT SET')
-    
+
     if database_url == 'NOT SET':
         print("⚠️  WARNING: DATABASE_URL is not set!", file=sys.stderr)
         print("   The application may fail to start or database operations will fail.", file=sys.stderr)
@@ -30,18 +185,33 @@ def main():
         # Show first 30 chars and last 10 chars for security
         db_preview = database_url[:30] + "..." + database_url[-10:] if len(database_url) > 40 else database_url[:40]
         print(f"✓ DATABASE_URL: {db_preview}")
-    
+
     if secret_key == 'NOT SET' or secret_key == 'your-secret-key-change-in-production':
         print("⚠️  WARNING: SECRET_KEY is not set or using default value!", file=sys.stderr)
         print("   JWT tokens will not be secure. Set SECRET_KEY in Railway.", file=sys.stderr)
     else:
         print("✓ SECRET_KEY: Set (hidden for security)")
-    
+
     print("")
-    
-    # Try to import and test the app before starting
+
+    # Decide worker count before importing the app so the DB pool is sized per worker
+    try:
+        import gunicorn  # type: ignore  # noqa: F401
+        gunicorn_available = os.name != "nt"
+    except ImportError:
+        gunicorn_available = False
+    workers = compute_worker_count() if gunicorn_available else 1
+    print(f"=== Workers: {workers} (CPUs: {available_cpus():g}, memory: {available_memory_mb()}MB) ===")
+    configure_db_pool(workers)
+
+    # Migrations normally run in the pre-deploy step; optionally run them once here
+    if os.environ.get("RUN_MIGRATIONS_ON_STARTUP", "").lower() in ("1", "true", "yes"):
+        print("\n=== Running Database Migrations ===")
+        run_migrations_once()
+
+    # Try to import and test the app before starting (this is the preload - workers fork from it)
     try:
-        print("=== Importing Application ===")
+        print("\n=== Importing Application ===")
         from app.main import app
         print("✓ App imported successfully")
     except ImportError as e:
@@ -59,32 +229,34 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
-    
-    # Import uvicorn and run
-    # Note: uvicorn is installed via requirements.txt
+
+    # Import server and run
+    # Note: uvicorn/gunicorn are installed via requirements.txt
     # IDE may show import error if not installed locally, but it will work on Railway
     try:
-        import uvicorn  # type: ignore
-        print("\n=== Starting Uvicorn Server ===")
+        print("\n=== Starting Server ===")
         print(f"Server will run on http://0.0.0.0:{port}")
         print(f"Server will run until stopped. Press CTRL+C to stop.")
         print("")
-        # Use run() which blocks and keeps the process alive
-        uvicorn.run(
-            "app.main:app",
-            host="0.0.0.0",  # Must be 0.0.0.0, not 127.0.0.1, for Railway
-            port=port,
-            workers=1,
-            log_level="info",
-            access_log=True
-        )
+        if gunicorn_available:
+            run_gunicorn(app, port, workers)
+        else:
+            import uvicorn  # type: ignore
+            # Use run() which blocks and keeps the process alive
+            uvicorn.run(
+                app,
+                host="0.0.0.0",  # Must be 0.0.0.0, not 127.0.0.1, for Railway
+                port=port,
+                log_level="info",
+                access_log=True
+            )
     except KeyboardInterrupt:
         print("\n=== Shutting down server... ===")
         sys.exit(0)
     except ImportError as e:
-        print(f"❌ ERROR: Failed to import uvicorn: {e}", file=sys.stderr)
-        print("   Ensure uvicorn is in requirements.txt", file=sys.stderr)
-        print("   Run: pip install uvicorn[standard]", file=sys.stderr)
+        print(f"❌ ERROR: Failed to import server: {e}", file=sys.stderr)
+        print("   Ensure uvicorn and gunicorn are in requirements.txt", file=sys.stderr)
+        print("   Run: pip install uvicorn[standard] gunicorn", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
         print(f"❌ ERROR: Failed to start server: {e}", file=sys.stderr)
@@ -98,4 +270,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,66 @@
+"""
+SQLite support for the test scripts - creates the Postgres models in a throwaway SQLite database
+
+Importing this module registers the SQLite compile hooks for the Postgres-only
+column types and for array_agg; the tests keep only their own tables and seed data.
+"""
+import json
+import os
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import array_agg
+from sqlalchemy.types import ARRAY, String, TypeDecorator
+from app.core.database import Base
+from typing import Optional, Sequence
+
+
+@compiles(postgresql.UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    """Store UUID columns as CHAR(32) so the models can be created in SQLite"""
+    return "CHAR(32)"
+
+
+@compiles(postgresql.BYTEA, "sqlite")
+def _compile_bytea_sqlite(type_, compiler, **kw):
+    """Store BYTEA columns as BLOB so transcripts can be created in SQLite"""
+    return "BLOB"
+
+
+@compiles(array_agg, "sqlite")
+def _compile_array_agg_sqlite(element, compiler, **kw):
+    """array_agg as json_group_array so array aggregation can run in SQLite"""
+    return f"json_group_array({compiler.process(element.clauses, **kw)})"
+
+
+class _JSONArray(TypeDecorator):
+    """Reads json_group_array results back as lists, like Postgres arrays"""
+    impl = String
+    cache_ok = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+
+    def process_result_value(self, value, dialect):
+        return value if value is None else json.loads(value)
+
+
+def make_session_factory(tables: Sequence, directory: Optional[str] = None, name: str = "test.db") -> sessionmaker:
+    """
+    Session factory over a SQLite database holding just `tables`. In memory by default;
+    pass a directory for a file-backed database when several sessions or threads must
+    share the data (each in-memory connection is its own database).
+    """
+    url = f"sqlite:///{os.path.join(directory, name)}" if directory else "sqlite://"
+    engine = create_engine(url)
+    # ARRAY results are decoded by this engine's dialect only - other engines are untouched
+    engine.dialect.colspecs = {**engine.dialect.colspecs, ARRAY: _JSONArray}
+    Base.metadata.create_all(engine, tables=list(tables))
+    return sessionmaker(bind=engine)
+
+
+def make_session(tables: Sequence) -> Session:
+    """In-memory SQLite session with just `tables`"""
+    return make_session_factory(tables)()
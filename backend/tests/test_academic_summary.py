@@ -0,0 +1,109 @@
+"""
+Test script to verify user_academic_summary maintenance and the by-major view reading it
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.user import User
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.academic_summary import get_user_summary, rebuild_academic_summaries
+from app.services.course_changes import courses_changed
+from app.api.v1.recommendations import get_recommendations_by_major
+from sqlite_support import make_session
+
+
+def _make_session():
+    """In-memory SQLite session with the tables touched by course writes"""
+    return make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__
+    ])
+
+
+def _add_user(db, first_name, major):
+    user = User(
+        id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+        last_name="Test", major=major, hashed_password="x"
+    )
+    db.add(user)
+    return user
+
+
+def _add_course(db, user, course_code, grade, grade_score, credit_hours):
+    course = Course(
+        id=uuid.uuid4(), user_id=user.id, course_code=course_code, grade=grade,
+        grade_score=grade_score, credit_hours=credit_hours, year=2024, semester="Fall"
+    )
+    db.add(course)
+    return course
+
+
+def test_summary_maintenance():
+    """Test summary values follow course writes and match analytics rules"""
+    print("Testing academic summary maintenance...")
+    db = _make_session()
+    user = _add_user(db, "Ann", "Biology")
+    _add_course(db, user, "BIO 101", "A", 4.0, 3.0)
+    _add_course(db, user, "BIO 102", "B", 3.0, 4.0)
+    failed = _add_course(db, user, "CHEM 101", "D", 1.0, 3.0)  # No credit
+    _add_course(db, user, "BIO 201", None, None, 3.0)  # In progress
+    db.commit()
+    courses_changed(db, user.id, ["BIO 101", "BIO 102", "CHEM 101", "BIO 201"])
+
+    summary = get_user_summary(db, user.id)
+    assert float(summary.gpa) == round((4.0 * 3 + 3.0 * 4) / 7, 2)  # D excluded
+    assert float(summary.average_grade_score) == round((4.0 + 3.0 + 1.0) / 3, 2)
+    assert float(summary.earned_credits) == 7.0
+    assert summary.course_count == 4
+    assert summary.year_in_college == "Freshman"
+    print("  [OK] GPA, average grade, earned credits and course count")
+
+    db.delete(failed)
+    db.commit()
+    courses_changed(db, user.id, ["CHEM 101"])
+    db.expire_all()
+    summary = get_user_summary(db, user.id)
+    assert summary.course_count == 3
+    assert float(summary.average_grade_score) == 3.5
+    print("  [OK] Summary updated after course delete")
+
+    db.query(Course).filter(Course.user_id == user.id).delete()
+    db.commit()
+    courses_changed(db, user.id, [])
+    assert get_user_summary(db, user.id) is None
+    print("  [OK] Summary removed when a user has no courses")
+
+
+def test_by_major_reads_summary():
+    """Test by-major ranks same-major users by summary average grade"""
+    print("Testing by-major recommendations...")
+    db = _make_session()
+    requester = _add_user(db, "Requester", "Biology")
+    strong = _add_user(db, "Strong", " biology ")
+    weak = _add_user(db, "Weak", "Biology")
+    _add_user(db, "NoCourses", "Biology")
+    _add_user(db, "Chemist", "Chemistry")
+    _add_course(db, strong, "BIO 101", "A", 4.0, 40.0)
+    _add_course(db, weak, "BIO 101", "C", 2.0, 3.0)
+    db.commit()
+    assert rebuild_academic_summaries(db) == 2
+
+    brothers = asyncio.run(get_recommendations_by_major(limit=10, current_user=requester, db=db))
+    assert [b.helper_name for b in brothers] == ["Strong Test", "Weak Test", "NoCourses Test"], brothers
+    assert brothers[0].total_credits == 40.0 and brothers[0].year_in_college == "Sophomore"
+    assert brothers[2].total_courses == 0 and brothers[2].year_in_college == "Freshman"
+    print("  [OK] Same-major users ordered by average grade, users without courses last")
+
+
+if __name__ == "__main__":
+    test_summary_maintenance()
+    test_by_major_reads_summary()
+    print("\n>>> All academic summary tests passed!")
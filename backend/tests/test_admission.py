@@ -0,0 +1,60 @@
+"""
+Test script to verify per-route-class admission control
+"""
+import sys
+import os
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.admission import RouteClassLimiter, AdmissionRejected
+from app.core.route_classes import RouteClass
+
+
+def test_queue_full_and_timeout():
+    """Test that excess requests are queued, then shed with 429/503"""
+    print("Testing admission limiter...")
+
+    async def run():
+        limiter = RouteClassLimiter(RouteClass.UPLOAD, concurrency=1, queue_depth=1)
+
+        await limiter.acquire(timeout=1.0)  # Takes the only slot
+        assert limiter.active == 1
+
+        # Second request waits in the queue and is admitted once the slot frees up
+        waiter = asyncio.create_task(limiter.acquire(timeout=1.0))
+        await asyncio.sleep(0.01)
+        assert limiter.waiting == 1
+
+        # Third request finds the queue full
+        try:
+            await limiter.acquire(timeout=1.0)
+            assert False, "Expected queue-full rejection"
+        except AdmissionRejected as e:
+            assert e.status_code == 429
+        print("  [OK] Queue full -> 429")
+
+        limiter.release()
+        await waiter
+        assert limiter.active == 1 and limiter.waiting == 0
+        print("  [OK] Queued request admitted after release")
+
+        # Nothing releases the slot now, so a queued request times out
+        try:
+            await limiter.acquire(timeout=0.01)
+            assert False, "Expected timeout rejection"
+        except AdmissionRejected as e:
+            assert e.status_code == 503
+        assert limiter.waiting == 0
+        print("  [OK] Queue wait timeout -> 503")
+
+        limiter.release()
+        assert limiter.active == 0
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_queue_full_and_timeout()
+    print("\n>>> All admission control tests passed!")
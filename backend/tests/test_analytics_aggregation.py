@@ -0,0 +1,351 @@
+"""
+Test script to verify SQL-aggregated academic trends match the original Python implementation
+"""
+import sys
+import os
+import uuid
+import random
+from collections import defaultdict
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.models.course import Course
+from app.models.user import User
+from app.services.academic_summary import earns_credit, calculate_gpa, calculate_earned_credits
+from app.api.v1.analytics import (
+    AcademicAnalytics, GPATrendPoint, GradeDistribution, CourseDistribution, PointsTrendPoint,
+    compute_academic_trends
+)
+from sqlite_support import make_session
+
+
+def _reference_academic_trends(db, user_id):
+    """The Python-loop implementation that SQL aggregation replaced (kept verbatim as the oracle)"""
+    # Get all courses for the user (including those without grade_score for grade distribution)
+    all_courses = db.query(Course).filter(
+        Course.user_id == user_id
+    ).order_by(Course.year, Course.semester).all()
+    
+    # Get courses with grade_score for GPA calculations
+    courses_with_gpa = [c for c in all_courses if c.grade_score is not None]
+    
+    if not all_courses:
+        return AcademicAnalytics(
+            overall_gpa=0.0,
+            total_credits=0.0,
+            total_courses=0,
+            gpa_trend=[],
+            grade_distribution=[],
+            credits_by_semester=[],
+            course_distribution_by_department=[],
+            points_trend=[]
+        )
+    
+    # Calculate overall GPA (only from courses with grade_score that earn credit)
+    overall_gpa = calculate_gpa(courses_with_gpa) if courses_with_gpa else 0.0
+    
+    # Calculate total credits (only from courses with C- or above)
+    total_credits = calculate_earned_credits(all_courses)
+    total_courses = len(all_courses)
+    
+    # Group by semester/year for GPA trend (only courses with grade_score that earn credit)
+    semester_data = defaultdict(lambda: {"points": 0, "credits": 0, "count": 0})
+    
+    for course in courses_with_gpa:
+        if course.grade_score is not None and course.credit_hours is not None:
+            # Only count credits for courses with C- or above
+            if earns_credit(course.grade, course.grade_score):
+                period = f"{course.semester or 'Unknown'} {course.year or 'Unknown'}"
+                semester_data[period]["points"] += float(course.grade_score) * float(course.credit_hours)
+                semester_data[period]["credits"] += float(course.credit_hours)
+                semester_data[period]["count"] += 1
+    
+    # Build GPA trend - sort chronologically by year and semester
+    def sort_period_key(item: tuple) -> tuple:
+        """Sort key for (period, data) tuples - sorts by period chronologically"""
+        period_str, _ = item  # Unpack the tuple to get just the period string
+        # Semester order: Spring (0), Summer (1), Fall (2), Winter (3) - academic year order
+        semester_order = {'Spring': 0, 'Summer': 1, 'Fall': 2, 'Winter': 3, 'Unknown': 99}
+        
+        # Parse period string (e.g., "Fall 2024" or "Spring 2025")
+        parts = period_str.split()
+        if len(parts) >= 2:
+            semester = parts[0]
+            try:
+                year = int(parts[1])
+                semester_priority = semester_order.get(semester, 99)
+                return (year, semester_priority)
+            except (ValueError, IndexError):
+                pass
+        
+        # Fallback for malformed periods
+        return (0, 99)
+    
+    # Calculate cumulative GPA progressively from term GPAs
+    gpa_trend = []
+    cumulative_total_points = 0.0
+    cumulative_total_credits = 0.0
+    
+    for period, data in sorted(semester_data.items(), key=sort_period_key):
+        term_gpa = round(data["points"] / data["credits"], 2) if data["credits"] > 0 else 0.0
+        term_credits = round(data["credits"], 1)
+        term_points = data["points"]
+        
+        # Calculate cumulative GPA: (previous_cumulative_points + current_term_points) / (previous_cumulative_credits + current_term_credits)
+        cumulative_total_points += term_points
+        cumulative_total_credits += data["credits"]
+        cumulative_gpa = round(cumulative_total_points / cumulative_total_credits, 2) if cumulative_total_credits > 0 else 0.0
+        
+        gpa_trend.append(GPATrendPoint(
+            period=period,
+            gpa=term_gpa,
+            cumulative_gpa=cumulative_gpa,
+            credits=term_credits,
+            course_count=data["count"]
+        ))
+    
+    # Grade distribution - use ALL courses with grades (not just those with grade_score)
+    grade_counts = defaultdict(int)
+    for course in all_courses:
+        if course.grade:
+            # Normalize grade - handle letter grades (A, A-, B+, etc.) and numeric grades
+            grade_str = str(course.grade).strip().upper()
+            
+            # If it's a numeric grade, convert to letter
+            try:
+                grade_num = float(grade_str)
+                if grade_num >= 3.7:
+                    grade_letter = "A"
+                elif grade_num >= 3.0:
+                    grade_letter = "B"
+                elif grade_num >= 2.0:
+                    grade_letter = "C"
+                elif grade_num >= 1.0:
+                    grade_letter = "D"
+                else:
+                    grade_letter = "F"
+            except ValueError:
+                # It's a letter grade - take first character
+                grade_letter = grade_str[0] if grade_str else "Unknown"
+            
+            # Only count valid letter grades
+            if grade_letter in ["A", "B", "C", "D", "F"]:
+                grade_counts[grade_letter] += 1
+    
+    total_graded = sum(grade_counts.values())
+    grade_distribution = []
+    for grade in ["A", "B", "C", "D", "F"]:
+        count = grade_counts.get(grade, 0)
+        percentage = round((count / total_graded * 100), 1) if total_graded > 0 else 0.0
+        grade_distribution.append(GradeDistribution(
+            grade=grade,
+            count=count,
+            percentage=percentage
+        ))
+    
+    # Credits by semester (same as GPA trend but just credits)
+    credits_by_semester = [
+        GPATrendPoint(
+            period=point.period,
+            gpa=0.0,  # Not used for credits chart
+            cumulative_gpa=0.0,  # Not used for credits chart
+            credits=point.credits,
+            course_count=point.course_count
+        )
+        for point in gpa_trend
+    ]
+    
+    # Course distribution by department (use all courses)
+    dept_counts = defaultdict(int)
+    for course in all_courses:
+        if course.course_code:
+            # Extract department (e.g., "CS 101" -> "CS")
+            parts = course.course_code.split()
+            if parts:
+                dept = parts[0].upper()
+                dept_counts[dept] += 1
+    
+    total_courses_for_dist = len([c for c in all_courses if c.course_code])
+    course_distribution_by_department = []
+    for dept, count in sorted(dept_counts.items(), key=lambda x: x[1], reverse=True):
+        percentage = round((count / total_courses_for_dist * 100), 1) if total_courses_for_dist > 0 else 0.0
+        course_distribution_by_department.append(CourseDistribution(
+            category=dept,
+            count=count,
+            percentage=percentage
+        ))
+    
+    # Points trend by semester - tracks total points, attempted credits, and earned credits over time
+    points_semester_data = defaultdict(lambda: {"points": 0, "attempted_credits": 0, "earned_credits": 0, "count": 0})
+    
+    for course in all_courses:
+        if course.semester and course.year:
+            period = f"{course.semester} {course.year}"
+            
+            # Get points from database (stored from transcript) or calculate if not available
+            if course.points is not None:
+                points = float(course.points)
+            elif course.grade_score is not None and course.credit_hours is not None:
+                # Fallback: calculate points if not stored
+                points = float(course.grade_score) * float(course.credit_hours)
+            else:
+                points = 0.0
+            
+            points_semester_data[period]["points"] += points
+            
+            # Get attempted credits (use credit_hours as attempted credits)
+            attempted = float(course.credit_hours) if course.credit_hours else 0.0
+            points_semester_data[period]["attempted_credits"] += attempted
+            
+            # Get earned credits (only if grade earns credit)
+            if earns_credit(course.grade, course.grade_score) and course.credit_hours:
+                earned = float(course.credit_hours)
+                points_semester_data[period]["earned_credits"] += earned
+            
+            points_semester_data[period]["count"] += 1
+    
+    # Build points trend - sort by academic calendar order (Fall, Spring, Summer)
+    def sort_period_key_for_points(item: tuple) -> tuple:
+        """Sort key for (period, data) tuples - sorts by academic year order: Fall, Spring, Summer"""
+        period_str, _ = item
+        # Academic calendar order: Fall starts the year, then Spring, then Summer
+        semester_order = {'Fall': 0, 'Spring': 1, 'Summer': 2, 'Winter': 3, 'Unknown': 99}
+        parts = period_str.split()
+        if len(parts) >= 2:
+            semester = parts[0]
+            try:
+                year = int(parts[1])
+                semester_priority = semester_order.get(semester, 99)
+                # For academic year: Fall 2023 starts academic year 2023-2024
+                # Spring 2024 and Summer 2024 are part of the same academic year
+                # So we use the year of Fall as the academic year base
+                if semester == 'Spring' or semester == 'Summer':
+                    # Spring and Summer belong to the academic year that started in the previous Fall
+                    academic_year = year - 1
+                else:
+                    # Fall starts the academic year
+                    academic_year = year
+                return (academic_year, semester_priority)
+            except (ValueError, IndexError):
+                pass
+        return (0, 99)
+    
+    points_trend = []
+    for period, data in sorted(points_semester_data.items(), key=sort_period_key_for_points):
+        points_trend.append(PointsTrendPoint(
+            period=period,
+            points=round(data["points"], 2),
+            attempted_credits=round(data["attempted_credits"], 1),
+            earned_credits=round(data["earned_credits"], 1),
+            course_count=data["count"]
+        ))
+    
+    return AcademicAnalytics(
+        overall_gpa=overall_gpa,
+        total_credits=round(total_credits, 1),
+        total_courses=total_courses,
+        gpa_trend=gpa_trend,
+        grade_distribution=grade_distribution,
+        credits_by_semester=credits_by_semester,
+        course_distribution_by_department=course_distribution_by_department,
+        points_trend=points_trend
+    )
+
+
+
+def _make_session():
+    return make_session([User.__table__, Course.__table__])
+
+
+def _add_user(db, first_name):
+    user = User(id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name, last_name="Test", hashed_password="x")
+    db.add(user)
+    return user
+
+
+GRADES = [
+    ("A", 4.0), ("A-", 3.7), ("B+", 3.3), ("B", 3.0), ("B-", 2.7), ("C+", 2.3), ("C", 2.0),
+    ("C-", 1.7), ("D", 1.0), ("F", 0.0), ("3.5", 3.5), ("W", None), ("P", None),
+    ("IN PROGRESS", None), ("B", None), ("2.0", None)
+]
+
+
+def _add_long_history(db, user, seed):
+    """Transfer credit plus 12 terms of mixed grades; department counts are distinct"""
+    rng = random.Random(seed)
+    departments = ["CS", "MATH", "PHYS", "ENGL", "HIST", "ECON", "BIOL", "CHEM"]
+    codes = [f"{dept} {1000 + i * 10 + n}" for i, dept in enumerate(departments) for n in range(i + 2)]
+    rng.shuffle(codes)
+    terms = [("Fall", 2019)] + [(semester, year) for year in range(2020, 2024) for semester in ("Spring", "Summer", "Fall")]
+    for k, code in enumerate(codes):
+        semester, year = terms[k % len(terms)]
+        transfer = k % len(terms) == 0 and k < len(terms)
+        grade, grade_score = ("T", None) if transfer else rng.choice(GRADES)
+        credit_hours = rng.choice([1.0, 3.0, 3.0, 4.0, None])
+        stored_points = None
+        if grade_score is not None and credit_hours is not None and rng.random() < 0.5:
+            stored_points = round(grade_score * credit_hours, 2)
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code=code, grade=grade, grade_score=grade_score,
+            credit_hours=credit_hours, points=stored_points, semester=semester, year=year
+        ))
+
+
+def test_identical_output():
+    """Test the SQL implementation returns exactly what the Python implementation returned"""
+    print("Testing SQL-aggregated academic trends against the original implementation...")
+    db = _make_session()
+
+    # Seeds whose cumulative GPA never lands exactly on a half cent: the original summed
+    # floats course by course, so e.g. 2.825 could come out as 2.8249999 and round down,
+    # while the SQL version divides exact sums (see test_half_cent_rounding)
+    users = []
+    for seed in (0, 1, 2, 3, 5, 6):
+        user = _add_user(db, f"Long{seed}")
+        _add_long_history(db, user, seed)
+        users.append(user)
+
+    edge = _add_user(db, "Edge")
+    db.add_all([
+        Course(id=uuid.uuid4(), user_id=edge.id, course_code="CS 101", grade="A", grade_score=4.0, credit_hours=3, year=None, semester="Fall"),
+        Course(id=uuid.uuid4(), user_id=edge.id, course_code="CS 102", grade="B", grade_score=3.0, credit_hours=3, year=2022, semester=None),
+        Course(id=uuid.uuid4(), user_id=edge.id, course_code="MATH 201", grade=None, grade_score=None, credit_hours=None, year=2022, semester="Spring"),
+        Course(id=uuid.uuid4(), user_id=edge.id, course_code="MATH 202", grade="C-", grade_score=1.7, credit_hours=0, year=2022, semester="Spring"),
+        Course(id=uuid.uuid4(), user_id=edge.id, course_code="MATH 203", grade="D", grade_score=1.0, credit_hours=4, year=2022, semester="Spring"),
+    ])
+    users.append(edge)
+    users.append(_add_user(db, "Empty"))
+    db.commit()
+
+    for user in users:
+        expected = _reference_academic_trends(db, user.id).model_dump()
+        actual = compute_academic_trends(db, user.id).model_dump()
+        assert actual == expected, f"{user.first_name}:\nexpected {expected}\nactual   {actual}"
+        print(f"  [OK] {user.first_name}: {len(actual['gpa_trend'])} GPA terms, {len(actual['points_trend'])} points terms")
+
+
+def test_half_cent_rounding():
+    """Test cumulative GPAs exactly on a half cent round from the exact quotient"""
+    print("Testing half-cent cumulative GPA rounding...")
+    db = _make_session()
+    user = _add_user(db, "Tie")
+    # 22.6 points / 8 credits = 2.825 exactly
+    db.add_all([
+        Course(id=uuid.uuid4(), user_id=user.id, course_code="CS 101", grade="C+", grade_score=2.3, credit_hours=3, semester="Fall", year=2019),
+        Course(id=uuid.uuid4(), user_id=user.id, course_code="CS 102", grade="B+", grade_score=3.3, credit_hours=4, semester="Spring", year=2020),
+        Course(id=uuid.uuid4(), user_id=user.id, course_code="CS 103", grade="C+", grade_score=2.5, credit_hours=1, semester="Spring", year=2020),
+    ])
+    db.commit()
+
+    trends = compute_academic_trends(db, user.id)
+    assert [t.cumulative_gpa for t in trends.gpa_trend] == [2.3, 2.83]
+    assert trends.overall_gpa == 2.83
+    print("  [OK] 22.6 / 8 rounds to 2.83")
+
+
+if __name__ == "__main__":
+    test_identical_output()
+    test_half_cent_rounding()
+    print("\n>>> All academic trends aggregation tests passed!")
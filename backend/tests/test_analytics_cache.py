@@ -0,0 +1,95 @@
+"""
+Test script to verify academic trends are cached per course-set version and served as 304 when unchanged
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Request, Response
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.course_changes import courses_changed, get_course_version
+from app.api.v1 import analytics
+from sqlite_support import make_session
+
+
+def _request(if_none_match=None):
+    """Minimal GET request with an optional If-None-Match header"""
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/analytics/academic-trends", "headers": headers})
+
+
+def test_versioned_cache_and_etag():
+    """Test cache hits, 304 on a matching ETag, and recomputation after a course write"""
+    print("Testing analytics snapshot cache...")
+    db = make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__
+    ])
+    analytics._trends_cache.clear()
+
+    user = User(id=uuid.uuid4(), email="ann@example.com", first_name="Ann", last_name="Test", hashed_password="x")
+    db.add(user)
+    db.add(Course(
+        id=uuid.uuid4(), user_id=user.id, course_code="CS 101", grade="A", grade_score=4.0,
+        credit_hours=3, semester="Fall", year=2024
+    ))
+    db.commit()
+    courses_changed(db, user.id, ["CS 101"])
+    assert get_course_version(db, user.id) == 1
+    print("  [OK] Course writes bump users.course_version")
+
+    computed = []
+    original_compute = analytics.compute_academic_trends
+
+    def counting_compute(db, user_id):
+        computed.append(user_id)
+        return original_compute(db, user_id)
+
+    def view(if_none_match=None):
+        response = Response()
+        result = asyncio.run(analytics.get_academic_trends(
+            request=_request(if_none_match), response=response, current_user=user, db=db
+        ))
+        return result, response
+
+    analytics.compute_academic_trends = counting_compute
+    try:
+        first, response = view()
+        etag = response.headers["etag"]
+        assert first.total_courses == 1 and len(computed) == 1
+        assert response.headers["cache-control"] == "private, no-cache"
+        second, _ = view()
+        assert second is first and len(computed) == 1
+        print("  [OK] Payload computed once per version")
+
+        not_modified, _ = view(if_none_match=etag)
+        assert not_modified.status_code == 304 and not_modified.headers["etag"] == etag
+        assert view(if_none_match=f"W/{etag}")[0].status_code == 304
+        assert len(computed) == 1
+        print("  [OK] Matching If-None-Match answered with 304")
+
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code="MATH 201", grade="B", grade_score=3.0,
+            credit_hours=3, semester="Spring", year=2025
+        ))
+        db.commit()
+        courses_changed(db, user.id, ["MATH 201"])
+        third, response = view(if_none_match=etag)
+        assert third.total_courses == 2 and len(computed) == 2
+        assert response.headers["etag"] != etag
+        print("  [OK] Course change invalidates the ETag and recomputes")
+    finally:
+        analytics.compute_academic_trends = original_compute
+
+
+if __name__ == "__main__":
+    test_versioned_cache_and_etag()
+    print("\n>>> All analytics cache tests passed!")
@@ -0,0 +1,190 @@
+"""
+Test script to verify chapter-wide analytics by major, pledge class and graduation year
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import app.models  # noqa: F401 - registers all mappers
+from app.core.config import settings
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services import chapter_analytics
+from app.services.academic_summary import rebuild_academic_summaries
+from app.api.v1.analytics import get_chapter_analytics
+from sqlite_support import make_session
+
+
+def _make_session():
+    """In-memory SQLite session with the tables the report reads"""
+    return make_session([
+        User.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__
+    ])
+
+
+def _add_member(db, name, major, pledge_class, graduation_year, grades, is_alumni=False):
+    """Member with one 3-credit course per grade (letter, grade_score)"""
+    user = User(
+        id=uuid.uuid4(), email=f"{name.lower()}@example.com", first_name=name, last_name="Test",
+        hashed_password="x", major=major, pledge_class=pledge_class, graduation_year=graduation_year,
+        is_alumni=is_alumni
+    )
+    db.add(user)
+    for n, (grade, grade_score) in enumerate(grades):
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code=f"CS {100 + n}", grade=grade,
+            grade_score=grade_score, credit_hours=3, semester="Fall", year=2024
+        ))
+    return user
+
+
+def _seed(db):
+    """Five active members and one alumnus"""
+    _add_member(db, "Ann", "Computer Science", "Fall 2022", 2026, [("A", 4.0), ("B", 3.0)])
+    _add_member(db, "Ben", "CS", "Fall 2022", 2026, [("A", 4.0)] * 12)
+    _add_member(db, "Cal", "Math", "Spring 2023", 2027, [("C", 2.0), ("D", 1.0)])
+    _add_member(db, "Dan", "Computer Science ", "Spring 2023", None, [("B+", 3.3)])
+    _add_member(db, "Eli", None, None, 2027, [])
+    _add_member(db, "Old", "Math", "Fall 2015", 2019, [("F", 0.0)], is_alumni=True)
+    db.commit()
+    rebuild_academic_summaries(db)
+
+
+def _cohort(cohorts, name):
+    """Cohort entry by label"""
+    return next(c for c in cohorts if c['cohort'] == name)
+
+
+def _build_report(db, min_cohort_size):
+    """Chapter report with a given minimum cohort size"""
+    original = settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE
+    settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = min_cohort_size
+    try:
+        return chapter_analytics.build_chapter_report(db)
+    finally:
+        settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = original
+
+
+def test_chapter_report():
+    """Test overall statistics and the three breakdowns"""
+    print("Testing chapter report...")
+    db = _make_session()
+    _seed(db)
+    report = _build_report(db, min_cohort_size=1)  # Every cohort of the small seed reports statistics
+
+    overall = report['overall']
+    assert overall['member_count'] == 5  # Alumni excluded
+    assert overall['graded_member_count'] == 4  # Eli has no courses
+    gpas = [3.5, 4.0, 2.0, 3.3]  # Cal's D earns no credit, so his GPA is 2.0
+    assert overall['gpa']['mean'] == round(float(np.mean(gpas)), 2)
+    assert overall['gpa']['p50'] == round(float(np.median(gpas)), 2)
+    assert (overall['gpa']['min'], overall['gpa']['max']) == (2.0, 4.0)
+    assert [b['count'] for b in overall['gpa_distribution']] == [0, 1, 0, 1, 2]
+    assert [g['count'] for g in overall['grade_distribution']] == [13, 2, 1, 1, 0]
+    standing = {s['standing']: s['count'] for s in overall['credit_progress']['class_standing']}
+    assert standing == {'Freshman': 3, 'Sophomore': 1, 'Junior': 0, 'Senior': 0}  # Ben: 36 credits
+    print("  [OK] Overall GPA percentiles, buckets, grades and class standing")
+
+    by_major = report['by_major']
+    assert [c['cohort'] for c in by_major] == ['Computer Science', 'Math', 'Unknown']
+    cs = _cohort(by_major, 'Computer Science')
+    assert cs['member_count'] == 3  # "CS" shares the major_key
+    assert cs['gpa']['max'] == 4.0 and cs['gpa']['min'] == 3.3
+    unknown = _cohort(by_major, 'Unknown')
+    assert unknown['graded_member_count'] == 0 and unknown['gpa']['mean'] == 0.0
+    print("  [OK] Majors grouped by major_key, labelled by the most common spelling")
+
+    assert [c['cohort'] for c in report['by_pledge_class']] == ['Fall 2022', 'Spring 2023', 'Unknown']
+    assert _cohort(report['by_pledge_class'], 'Fall 2022')['credit_progress']['average_earned_credits'] == 21.0
+    assert [c['cohort'] for c in report['by_graduation_year']] == ['2026', '2027', 'Unknown']
+    assert _cohort(report['by_graduation_year'], '2027')['grade_distribution'][2]['count'] == 1
+    print("  [OK] Pledge class and graduation year breakdowns")
+
+
+def test_small_cohorts_report_counts_only():
+    """Test cohorts under the minimum size expose no GPA, grade, credit or projection statistics"""
+    print("Testing small cohort suppression...")
+    db = _make_session()
+    _seed(db)
+    gus = _add_member(db, "Gus", "Math", "Spring 2023", 2027, [("B", 3.0)])
+    db.add(Course(  # A second term, so Gus has a projection
+        id=uuid.uuid4(), user_id=gus.id, course_code="MATH 200", grade="A", grade_score=4.0,
+        credit_hours=3, semester="Spring", year=2025
+    ))
+    db.commit()
+    rebuild_academic_summaries(db)
+    report = _build_report(db, min_cohort_size=5)
+
+    overall = report['overall']  # Six active members
+    assert overall['gpa']['max'] == 4.0 and overall['grade_distribution'][0]['count'] == 14
+    assert overall['projected_term_gpa'] is not None and overall['projected_member_count'] == 1
+    print("  [OK] Cohorts at the minimum size report statistics")
+
+    year_2026 = _cohort(report['by_graduation_year'], '2026')  # Ann and Ben
+    assert (year_2026['member_count'], year_2026['graded_member_count']) == (2, 2)
+    assert year_2026['gpa'] is None and year_2026['credit_progress'] is None
+    assert year_2026['gpa_distribution'] == [] and year_2026['grade_distribution'] == []
+    math = _cohort(report['by_major'], 'Math')  # Cal and Gus - Gus has a projection
+    assert math['projected_member_count'] == 1 and math['projected_term_gpa'] is None
+    assert all(c['gpa'] is None for c in report['by_major'] + report['by_pledge_class'])
+    print("  [OK] Smaller cohorts report member counts only")
+
+    chapter_analytics._report_cache.clear()
+    admin = db.query(User).filter(User.first_name == "Ann").first()
+    original = settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE
+    settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = 5
+    try:
+        response = asyncio.run(get_chapter_analytics(admin_user=admin, db=db))
+    finally:
+        settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = original
+        chapter_analytics._report_cache.clear()
+    assert _cohort([c.model_dump() for c in response.by_graduation_year], '2026')['gpa'] is None
+    print("  [OK] Endpoint serializes suppressed cohorts")
+
+
+def test_report_cache():
+    """Test the report is served from cache until the refresh interval passes"""
+    print("Testing chapter report cache...")
+    db = _make_session()
+    _seed(db)
+    chapter_analytics._report_cache.clear()
+    admin = db.query(User).filter(User.first_name == "Ann").first()
+
+    first = asyncio.run(get_chapter_analytics(admin_user=admin, db=db))
+    _add_member(db, "Fay", "Physics", "Fall 2024", 2028, [("A", 4.0)])
+    db.commit()
+    rebuild_academic_summaries(db)
+
+    cached = asyncio.run(get_chapter_analytics(admin_user=admin, db=db))
+    assert cached.overall.member_count == first.overall.member_count == 5
+    assert cached.generated_at == first.generated_at
+    print("  [OK] Served from cache within the refresh interval")
+
+    chapter_analytics._report_cache.clear()  # What the TTL expiring does
+    refreshed = asyncio.run(get_chapter_analytics(admin_user=admin, db=db))
+    assert refreshed.overall.member_count == 6
+    print("  [OK] Rebuilt once the cached report expires")
+
+
+def test_empty_chapter():
+    """Test a chapter without members"""
+    print("Testing empty chapter...")
+    report = chapter_analytics.build_chapter_report(_make_session())
+    assert report['overall']['member_count'] == 0
+    assert report['by_major'] == []
+    print("  [OK] Empty report")
+
+
+if __name__ == "__main__":
+    test_chapter_report()
+    test_small_cohorts_report_counts_only()
+    test_report_cache()
+    test_empty_chapter()
+    print("\n>>> All chapter analytics tests passed!")
@@ -0,0 +1,193 @@
+"""
+Test script to verify the per-course grade statistics store and endpoints
+"""
+import sys
+import os
+import uuid
+import asyncio
+import random
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import func
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_grade_stats import CourseGradeStats
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.academic_summary import grade_letter
+from app.services.course_changes import courses_changed
+from app.services.course_grade_stats import get_course_stats, rebuild_course_grade_stats
+from app.api.v1.courses import get_bulk_course_stats, get_single_course_stats
+from sqlite_support import make_session
+
+
+CODES = ["CS 2110", "MATH 2415", "PHYS 2325"]
+GRADES = [("A", 4.0), ("A-", 3.7), ("B+", 3.3), ("B", 3.0), ("C-", 1.7), ("D", 1.0), ("F", 0.0), ("W", None), (None, None)]
+TERMS = [("Fall", 2023), ("Spring", 2024), ("Summer", 2024), ("Fall", 2024)]
+
+
+def _make_session():
+    """In-memory SQLite session with the tables course writes touch"""
+    return make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__,
+        UserAcademicSummary.__table__, CourseGradeStats.__table__
+    ])
+
+
+def _seed(db, count=40, seed=5):
+    """Members with random grades in CODES across TERMS"""
+    rng = random.Random(seed)
+    users = []
+    for n in range(count):
+        user = User(id=uuid.uuid4(), email=f"m{n}@example.com", first_name=f"M{n}", last_name="Test", hashed_password="x")
+        db.add(user)
+        for code in rng.sample(CODES, rng.randint(1, len(CODES))):
+            grade, grade_score = rng.choice(GRADES)
+            semester, year = rng.choice(TERMS)
+            db.add(Course(
+                id=uuid.uuid4(), user_id=user.id, course_code=code, grade=grade, grade_score=grade_score,
+                credit_hours=3, semester=semester, year=year
+            ))
+        users.append(user)
+    db.commit()
+    return users
+
+
+def _scan(db, code):
+    """Reference statistics from every course row of a code (any case)"""
+    courses = db.query(Course).filter(func.upper(Course.course_code) == code).all()
+    graded = [float(c.grade_score) for c in courses if c.grade_score is not None]
+    letters = [grade_letter(c.grade) for c in courses if c.grade]
+    return {
+        'taker_count': len(courses),
+        'graded_count': len(graded),
+        'mean_grade_score': round(sum(graded) / len(graded), 2) if graded else None,
+        'pass_rate': round(sum(g >= 1.7 for g in graded) / len(graded) * 100, 1) if graded else None,
+        'letters': {letter: letters.count(letter) for letter in "ABCDF"},
+        'terms': {f"{c.semester} {c.year}" for c in courses}
+    }
+
+
+def _assert_matches(db, stats, code):
+    """stats equals a full scan of the course's rows"""
+    expected = _scan(db, code)
+    for field in ('taker_count', 'graded_count', 'mean_grade_score', 'pass_rate'):
+        assert stats[field] == expected[field], (code, field, stats[field], expected[field])
+    assert {g['grade']: g['count'] for g in stats['grade_distribution']} == expected['letters']
+    assert {t['term'] for t in stats['takers_by_term']} == expected['terms']
+    assert sum(t['taker_count'] for t in stats['takers_by_term']) == expected['taker_count']
+
+
+def test_stats_match_scan():
+    """Test the grouped store reproduces a full scan of courses"""
+    print("Testing course grade stats...")
+    db = _make_session()
+    _seed(db)
+    rows = rebuild_course_grade_stats(db)
+    assert rows < db.query(Course).count()
+
+    stats = get_course_stats(db, CODES + ["NONE 1000"])
+    assert sorted(stats) == CODES
+    for code in CODES:
+        _assert_matches(db, stats[code], code)
+    terms = [(t['semester'], t['year']) for t in stats["CS 2110"]['takers_by_term']]
+    assert terms == sorted(terms, key=lambda t: (t[1], ["Spring", "Summer", "Fall"].index(t[0])))
+    print(f"  [OK] {rows} stats rows reproduce {db.query(Course).count()} course rows; terms in order")
+
+
+def test_incremental_refresh():
+    """Test course writes refresh only the affected codes"""
+    print("Testing incremental refresh...")
+    db = _make_session()
+    users = _seed(db, seed=9)
+    rebuild_course_grade_stats(db)
+
+    user = users[0]
+    course = Course(
+        id=uuid.uuid4(), user_id=user.id, course_code="CS 3345", grade="A", grade_score=4.0,
+        credit_hours=3, semester="Spring", year=2025
+    )
+    db.add(course)
+    db.commit()
+    courses_changed(db, user.id, ["CS 3345"])
+    stats = get_course_stats(db, ["CS 3345"])["CS 3345"]
+    assert stats['taker_count'] == 1 and stats['pass_rate'] == 100.0
+    print("  [OK] New course code appears after courses_changed")
+
+    changed = db.query(Course).filter(Course.user_id == user.id, Course.course_code != "CS 3345").first()
+    changed.grade, changed.grade_score = "F", 0.0
+    db.commit()
+    courses_changed(db, user.id, [changed.course_code])
+    _assert_matches(db, get_course_stats(db, [changed.course_code])[changed.course_code], changed.course_code)
+
+    db.delete(course)
+    db.commit()
+    courses_changed(db, user.id, ["CS 3345"])
+    assert get_course_stats(db, ["CS 3345"]) == {}
+    print("  [OK] Updates and deletes refresh the affected code")
+
+
+def test_codes_grouped_case_insensitively():
+    """Test a manually added code typed in lower case counts towards its course"""
+    print("Testing course code case...")
+    db = _make_session()
+    users = _seed(db, seed=3)
+    rebuild_course_grade_stats(db)
+    before = get_course_stats(db, ["CS 2110"])["CS 2110"]['taker_count']
+
+    db.add(Course(
+        id=uuid.uuid4(), user_id=users[0].id, course_code="cs 2110", grade="B", grade_score=3.0,
+        credit_hours=3, semester="Spring", year=2025
+    ))
+    db.commit()
+    courses_changed(db, users[0].id, ["cs 2110"])
+    stats = get_course_stats(db, ["CS 2110"])["CS 2110"]
+    assert stats['taker_count'] == before + 1
+    _assert_matches(db, stats, "CS 2110")
+    assert db.query(CourseGradeStats).filter(CourseGradeStats.course_code == "cs 2110").count() == 0
+    print("  [OK] Incremental refresh counts \"cs 2110\" under CS 2110")
+
+    rebuild_course_grade_stats(db)
+    assert get_course_stats(db, ["cs 2110"]) == {"CS 2110": stats}
+    single = asyncio.run(get_single_course_stats(course_code="cs 2110", current_user=users[0], db=db))
+    assert single.taker_count == before + 1
+    print("  [OK] Full rebuild and lookups group codes case-insensitively")
+
+
+def test_endpoints():
+    """Test the single and bulk endpoints"""
+    print("Testing endpoints...")
+    db = _make_session()
+    users = _seed(db, seed=2)
+    rebuild_course_grade_stats(db)
+
+    single = asyncio.run(get_single_course_stats(course_code=" cs 2110 ", current_user=users[0], db=db))
+    assert single.course_code == "CS 2110" and single.taker_count == _scan(db, "CS 2110")['taker_count']
+    try:
+        asyncio.run(get_single_course_stats(course_code="NONE 1000", current_user=users[0], db=db))
+        assert False, "expected 404"
+    except HTTPException as e:
+        assert e.status_code == 404
+    print("  [OK] /courses/{code}/stats")
+
+    bulk = asyncio.run(get_bulk_course_stats(course_codes=["MATH 2415", "CS 2110", "NONE 1000"], current_user=users[0], db=db))
+    assert [s.course_code for s in bulk] == ["CS 2110", "MATH 2415"]
+    try:
+        asyncio.run(get_bulk_course_stats(course_codes=[f"CS {n}" for n in range(51)], current_user=users[0], db=db))
+        assert False, "expected 400"
+    except HTTPException as e:
+        assert e.status_code == 400
+    print("  [OK] /courses/stats bulk variant")
+
+
+if __name__ == "__main__":
+    test_stats_match_scan()
+    test_incremental_refresh()
+    test_codes_grouped_case_insensitively()
+    test_endpoints()
+    print("\n>>> All course grade stats tests passed!")
@@ -0,0 +1,117 @@
+"""
+Test script to verify the course tutor index is kept in sync incrementally
+"""
+import sys
+import os
+import uuid
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.core.config import settings
+from app.models.course import Course
+from app.models.user import User
+from app.models.course_tutor_index import CourseTutorIndex
+from app.services.course_tutor_index import rebuild_course_tutor_index
+from app.services.course_changes import courses_changed, user_major_changed
+from sqlite_support import make_session
+
+
+def _index_rows(db, course_code):
+    """(first_name, rank, major_key) of the index rows for a course code, best first"""
+    rows = db.query(CourseTutorIndex, User).join(
+        User, CourseTutorIndex.user_id == User.id
+    ).filter(
+        CourseTutorIndex.course_code == course_code
+    ).order_by(CourseTutorIndex.rank).all()
+    return [(user.first_name, entry.rank, entry.major_key) for entry, user in rows]
+
+
+def test_incremental_maintenance():
+    """Test top-K rows follow course inserts, updates, deletes and major changes"""
+    print("Testing course tutor index maintenance...")
+    db = make_session([User.__table__, Course.__table__, CourseTutorIndex.__table__])
+
+    original_size = settings.COURSE_TUTOR_INDEX_SIZE
+    settings.COURSE_TUTOR_INDEX_SIZE = 2
+    try:
+        users = {}
+        for name in ["Ann", "Ben", "Cal"]:
+            users[name] = User(
+                id=uuid.uuid4(), email=f"{name.lower()}@example.com", first_name=name,
+                last_name="Test", major="Biology", hashed_password="x"
+            )
+            db.add(users[name])
+
+        courses = {}
+        for name, grade_score in [("Ann", 4.0), ("Ben", 3.0), ("Cal", 2.0)]:
+            courses[name] = Course(
+                id=uuid.uuid4(), user_id=users[name].id, course_code="BIO 101", grade="A",
+                grade_score=grade_score, year=2024, semester="Fall"
+            )
+            db.add(courses[name])
+        db.commit()
+
+        assert rebuild_course_tutor_index(db) == 2
+        assert _index_rows(db, "BIO 101") == [("Ann", 1, "biology"), ("Ben", 2, "biology")]
+        print("  [OK] Rebuild keeps the top K per course code")
+
+        # Update: Cal's grade improves
+        courses["Cal"].grade_score = 3.7
+        db.commit()
+        courses_changed(db, users["Cal"].id, ["BIO 101"])
+        assert _index_rows(db, "BIO 101") == [("Ann", 1, "biology"), ("Cal", 2, "biology")]
+        print("  [OK] Update re-ranks the course code")
+
+        # Delete: Ann's course is removed, Ben backfills the freed slot
+        db.delete(courses["Ann"])
+        db.commit()
+        courses_changed(db, users["Ann"].id, ["BIO 101"])
+        assert _index_rows(db, "BIO 101") == [("Cal", 1, "biology"), ("Ben", 2, "biology")]
+        print("  [OK] Delete backfills from remaining takers")
+
+        # Course code change: moves between codes
+        courses["Ben"].course_code = "BIO 102"
+        db.commit()
+        courses_changed(db, users["Ben"].id, ["BIO 101", "BIO 102"])
+        assert _index_rows(db, "BIO 101") == [("Cal", 1, "biology")]
+        assert _index_rows(db, "BIO 102") == [("Ben", 1, "biology")]
+        print("  [OK] Course code change refreshes old and new codes")
+
+        users["Cal"].major = "Chemistry"
+        db.commit()
+        user_major_changed(db, users["Cal"].id)
+        assert _index_rows(db, "BIO 101") == [("Cal", 1, "chemistry")]
+        print("  [OK] Major change propagates to index rows")
+
+        # Per-major slots: Dee (physics) ranks 3rd overall but is kept as a top physics taker
+        users["Dee"] = User(
+            id=uuid.uuid4(), email="dee@example.com", first_name="Dee", last_name="Test",
+            major="Physics", hashed_password="x"
+        )
+        db.add(users["Dee"])
+        for name, grade_score in [("Ann", 3.9), ("Ben", 3.8), ("Dee", 3.0)]:
+            db.add(Course(
+                id=uuid.uuid4(), user_id=users[name].id, course_code="BIO 101", grade="A",
+                grade_score=grade_score, year=2024, semester="Fall"
+            ))
+        db.commit()
+        courses_changed(db, users["Dee"].id, ["BIO 101"])
+        assert _index_rows(db, "BIO 101") == [
+            ("Ann", 1, "biology"), ("Ben", 2, "biology"), ("Cal", 3, "chemistry"), ("Dee", 4, "physics")
+        ]
+        print("  [OK] Top K per major are kept alongside the overall top K")
+
+        users["Dee"].major = "Biology"
+        db.commit()
+        user_major_changed(db, users["Dee"].id)
+        assert _index_rows(db, "BIO 101") == [("Ann", 1, "biology"), ("Ben", 2, "biology"), ("Cal", 3, "chemistry")]
+        print("  [OK] Major change re-ranks the user's course codes")
+    finally:
+        settings.COURSE_TUTOR_INDEX_SIZE = original_size
+
+
+if __name__ == "__main__":
+    test_incremental_maintenance()
+    print("\n>>> All course tutor index tests passed!")
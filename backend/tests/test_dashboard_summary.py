@@ -0,0 +1,203 @@
+"""
+Test script to verify /dashboard/summary assembles the dashboard sections with bounded concurrency
+"""
+import sys
+import os
+import uuid
+import threading
+import itertools
+import asyncio
+import tempfile
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import text
+import app.models  # noqa: F401 - registers all mappers
+from app.core.user_cache import AuthenticatedUser
+from app.models.battle_buddy import BattleBuddyMember, BattleBuddyTeam
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.points import PointsHistory, PointType
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services.academic_summary import rebuild_academic_summaries
+from app.api.v1 import analytics, dashboard
+from app.api.v1.battle_buddy import get_my_team
+from app.api.v1.points import get_leaderboard, get_my_points
+from app.api.v1.recommendations import get_group_study_recommendations, get_recommendations_by_major
+from sqlite_support import make_session_factory
+
+
+def _make_sessions(directory):
+    """File-backed SQLite (so section threads on their own sessions see the data) with a small chapter"""
+    factory = make_session_factory([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__,
+        PointsHistory.__table__, BattleBuddyTeam.__table__, BattleBuddyMember.__table__
+    ], directory, "dashboard.db")
+    db = factory()
+
+    users = []
+    for n, (name, points) in enumerate([("Ann", 40), ("Ben", 25), ("Cal", 60)]):
+        user = User(
+            id=uuid.uuid4(), email=f"{name.lower()}@example.com", first_name=name, last_name="Test",
+            hashed_password="x", major="Computer Science", major_key="computer science", points=points
+        )
+        db.add(user)
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, transcript_id=uuid.uuid4(), course_code="CS 1337", grade="A",
+            grade_score=4.0 - n * 0.3, credit_hours=3, semester="Fall", year=2024
+        ))
+        db.add(Course(id=uuid.uuid4(), user_id=user.id, course_code="CS 3345", credit_hours=3, semester="Spring", year=2025))
+        users.append(user)
+    db.add(PointsHistory(id=uuid.uuid4(), user_id=users[0].id, points=40, point_type=PointType.HELP_PROVIDED, description="Helped"))
+    team = BattleBuddyTeam(id=uuid.uuid4(), team_name="Lions", points=12)
+    db.add(team)
+    db.add_all([BattleBuddyMember(id=uuid.uuid4(), team_id=team.id, user_id=user.id) for user in users[:2]])
+    db.commit()
+    rebuild_academic_summaries(db)
+    dashboard.SessionLocal = factory  # Sessions for sections that get an extra connection
+    return factory, db, AuthenticatedUser.model_validate(users[0])
+
+
+def _summary(db, user, sections=None):
+    response = Response()
+    summary = asyncio.run(dashboard.get_dashboard_summary(response=response, sections=sections, current_user=user, db=db))
+    return summary, response
+
+
+def test_sections_match_endpoints():
+    """Test every section equals the response of its own endpoint"""
+    print("Testing dashboard sections...")
+    with tempfile.TemporaryDirectory() as directory:
+        factory, db, ann = _make_sessions(directory)
+        analytics._trends_cache.clear()
+        summary, response = _summary(factory(), ann)
+
+        request = Request({"type": "http", "method": "GET", "path": "/api/v1/analytics/academic-trends", "headers": []})
+        trends = asyncio.run(analytics.get_academic_trends(request=request, response=Response(), current_user=ann, db=db))
+        assert summary.academic_trends == trends
+        points = asyncio.run(get_my_points(current_user=ann, db=db))
+        assert summary.points.total_points == points['total_points'] == 40 and summary.points.rank == points['rank'] == 2
+        assert len(summary.points.recent_activity) == 1
+        leaderboard = asyncio.run(get_leaderboard(limit=dashboard.DASHBOARD_LEADERBOARD_LIMIT, current_user=ann, db=db))
+        assert [e.model_dump() for e in summary.leaderboard] == leaderboard
+        assert summary.my_team == asyncio.run(get_my_team(current_user=ann, db=db)) and summary.my_team.member_count == 2
+        assert summary.by_major == asyncio.run(get_recommendations_by_major(
+            limit=dashboard.DASHBOARD_RECOMMENDATION_LIMIT, current_user=ann, db=db
+        ))
+        assert summary.group_study == asyncio.run(get_group_study_recommendations(
+            limit=dashboard.DASHBOARD_RECOMMENDATION_LIMIT, jaccard=False, current_user=ann, db=db
+        ))
+        assert [c.course_code for c in summary.current_courses] == ["CS 3345"]
+        assert summary.errors == {}
+        print("  [OK] All 7 sections match their endpoints")
+
+        assert summary.cache['academic_trends'].etag == analytics.academic_trends_state(db, ann.id)[0]
+        assert summary.cache['academic_trends'].max_age == 0 and summary.cache['leaderboard'].max_age == 60
+        assert summary.cache['current_courses'].etag and summary.cache['points'].etag is None
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        print("  [OK] Per-section cache hints")
+
+
+def test_section_selection():
+    """Test section selection, unknown sections and per-section failures"""
+    print("Testing section selection...")
+    with tempfile.TemporaryDirectory() as directory:
+        factory, _, ann = _make_sessions(directory)
+        db = factory()
+        summary, response = _summary(db, ann, sections="leaderboard, points")
+        assert set(summary.cache) == {"leaderboard", "points"}
+        assert summary.academic_trends is None and summary.leaderboard
+        assert response.headers["Cache-Control"] == "private, max-age=30"
+        print("  [OK] Only requested sections are loaded; Cache-Control uses the shortest max_age")
+
+        try:
+            _summary(db, ann, sections="points,grades")
+            assert False, "expected 400"
+        except HTTPException as e:
+            assert e.status_code == 400 and "grades" in e.detail
+        print("  [OK] Unknown sections -> 400")
+
+        def broken(db, user):
+            db.execute(text("SELECT * FROM no_such_table"))
+        sections = dict(dashboard.SECTIONS)
+        slots = dashboard._extra_connections
+        dashboard.SECTIONS['points'] = (broken, 30)
+        dashboard._extra_connections = threading.BoundedSemaphore(0)  # All three on the request session
+        try:
+            summary, _ = _summary(db, ann, sections="points,leaderboard,my_team")
+        finally:
+            dashboard.SECTIONS.clear()
+            dashboard.SECTIONS.update(sections)
+            dashboard._extra_connections = slots
+        assert set(summary.errors) == {"points"} and "points" not in summary.cache
+        assert summary.leaderboard and summary.my_team.member_count == 2
+        print("  [OK] A failing section is reported; later sections still run on the rolled-back session")
+
+
+def _record_sessions(request_session, slots, wait_for=0):
+    """
+    Run every section with `slots` extra connections; returns (session, thread) per section.
+    With wait_for, that many sections must be running at once before any returns.
+    """
+    calls = {}
+    barrier = threading.Barrier(wait_for) if wait_for else None
+    arrivals = itertools.count()
+
+    def record(name):
+        def loader(db, user):
+            calls[name] = (db, threading.get_ident())
+            if barrier and next(arrivals) < wait_for:
+                barrier.wait(timeout=5)  # Raises (section error) unless the first sections overlap
+            return [], None
+        return loader
+
+    original_sections = dict(dashboard.SECTIONS)
+    original_slots = dashboard._extra_connections
+    dashboard.SECTIONS.update({name: (record(name), max_age) for name, (_, max_age) in original_sections.items()})
+    dashboard._extra_connections = threading.BoundedSemaphore(slots)
+    try:
+        user = AuthenticatedUser(id=uuid.uuid4(), email="x@example.com", first_name="X", last_name="Y")
+        summary, _ = _summary(request_session, user)
+        assert summary.errors == {}
+        # Every slot is given back once the summary is done
+        assert all(dashboard._extra_connections.acquire(blocking=False) for _ in range(slots))
+    finally:
+        dashboard.SECTIONS.clear()
+        dashboard.SECTIONS.update(original_sections)
+        dashboard._extra_connections = original_slots
+    return [calls[name] for name in original_sections]
+
+
+def test_bounded_section_concurrency():
+    """Test sections run concurrently on at most DASHBOARD_EXTRA_CONNECTIONS extra sessions"""
+    print("Testing section concurrency...")
+    with tempfile.TemporaryDirectory() as directory:
+        factory, _, _ = _make_sessions(directory)
+        request_session = factory()
+
+        calls = _record_sessions(request_session, slots=2, wait_for=3)
+        own = [(db, thread) for db, thread in calls if db is not request_session]
+        shared = [(db, thread) for db, thread in calls if db is request_session]
+        assert len(own) == 2 and len(shared) == len(calls) - 2
+        assert len({id(db) for db, _ in own}) == 2 and len({thread for _, thread in shared}) == 1
+        assert threading.get_ident() not in {thread for _, thread in calls}
+        print("  [OK] 2 sections on their own sessions overlap the request session's sections, off the event loop")
+
+        calls = _record_sessions(request_session, slots=0)
+        assert {id(db) for db, _ in calls} == {id(request_session)} and len({thread for _, thread in calls}) == 1
+        print("  [OK] No free slot -> every section on the request session (one pooled connection)")
+
+        calls = _record_sessions(request_session, slots=len(dashboard.SECTIONS) + 3)
+        assert sum(db is request_session for db, _ in calls) == 1
+        print("  [OK] The request session always keeps a section")
+
+
+if __name__ == "__main__":
+    test_sections_match_endpoints()
+    test_section_selection()
+    test_bounded_section_concurrency()
+    print("\n>>> All dashboard summary tests passed!")
@@ -0,0 +1,65 @@
+"""
+Test script to verify route classification and request deadline budgets
+"""
+import sys
+import os
+import time
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.route_classes import RouteClass, classify_route
+from app.core import deadlines
+
+
+def test_route_classification():
+    """Test that routes are assigned to the expected cost classes"""
+    print("Testing route classification...")
+    cases = [
+        ("POST", "/api/v1/transcripts/upload", RouteClass.UPLOAD),
+        ("POST", "/api/v1/auth/login", RouteClass.AUTH),
+        ("GET", "/api/v1/auth/me", RouteClass.LIGHT_READ),
+        ("GET", "/api/v1/analytics/academic-trends", RouteClass.HEAVY_READ),
+        ("GET", "/api/v1/points/leaderboard", RouteClass.HEAVY_READ),
+        ("GET", "/api/v1/dashboard/summary", RouteClass.HEAVY_READ),
+        ("POST", "/api/v1/help-requests", RouteClass.HEAVY_READ),
+        ("GET", "/api/v1/help-requests", RouteClass.LIGHT_READ),
+        ("GET", "/api/v1/courses", RouteClass.LIGHT_READ),
+        ("GET", "/api/v1/analyticsx", RouteClass.LIGHT_READ),  # Prefix must end at a path segment
+    ]
+    for method, path, expected in cases:
+        result = classify_route(method, path)
+        print(f"  {method} {path} -> {result.value}")
+        assert result == expected, f"{method} {path}: expected {expected}, got {result}"
+    print("[OK] Route classification")
+
+
+def test_statement_timeout_from_deadline():
+    """Test that the remaining budget is converted to a statement_timeout"""
+    print("\nTesting statement_timeout calculation...")
+    assert deadlines.statement_timeout_ms() is None, "No deadline outside a request"
+
+    token = deadlines._request_deadline.set(time.monotonic() + 2.0)
+    try:
+        timeout_ms = deadlines.statement_timeout_ms()
+        print(f"  2s budget -> statement_timeout {timeout_ms}ms")
+        assert 1000 < timeout_ms <= 2000
+    finally:
+        deadlines._request_deadline.reset(token)
+
+    token = deadlines._request_deadline.set(time.monotonic() - 1.0)
+    try:
+        try:
+            deadlines.statement_timeout_ms()
+            assert False, "Expected DeadlineExceeded for an expired deadline"
+        except deadlines.DeadlineExceeded:
+            print("  expired deadline -> DeadlineExceeded")
+    finally:
+        deadlines._request_deadline.reset(token)
+    print("[OK] statement_timeout calculation")
+
+
+if __name__ == "__main__":
+    test_route_classification()
+    test_statement_timeout_from_deadline()
+    print("\n>>> All deadline tests passed!")
@@ -0,0 +1,195 @@
+"""
+Test script to verify GPA percentile lookups against precomputed sorted cohort lists
+"""
+import sys
+import os
+import uuid
+import asyncio
+import random
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Request, Response
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services import gpa_percentiles
+from app.services.academic_summary import rebuild_academic_summaries
+from app.services.cache_versions import GPA_PERCENTILES, bump_cache_version
+from app.services.course_changes import courses_changed
+from app.api.v1 import analytics
+from sqlite_support import make_session
+
+
+MAJORS = ["Computer Science", "CS", "Mathematics", "Physics", None]
+PLEDGE_CLASSES = ["Fall 2022", "Spring 2023", "Fall 2023", None]
+GRADES = [("A", 4.0), ("A-", 3.7), ("B+", 3.3), ("B", 3.0), ("C+", 2.3), ("C", 2.0), ("D", 1.0)]
+
+
+def _make_session():
+    """In-memory SQLite session with users, courses and summaries"""
+    return make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__
+    ])
+
+
+def _seed(db, count=60, seed=7):
+    """Members with random majors, pledge classes, graduation years and grades"""
+    rng = random.Random(seed)
+    users = []
+    for n in range(count):
+        user = User(
+            id=uuid.uuid4(), email=f"member{n}@example.com", first_name=f"Member{n}", last_name="Test",
+            hashed_password="x", major=rng.choice(MAJORS), pledge_class=rng.choice(PLEDGE_CLASSES),
+            graduation_year=rng.choice([2025, 2026, 2027, None]), is_alumni=n % 15 == 0
+        )
+        db.add(user)
+        for k in range(rng.randint(0, 5)):
+            grade, grade_score = rng.choice(GRADES)
+            db.add(Course(
+                id=uuid.uuid4(), user_id=user.id, course_code=f"CS {100 + k}", grade=grade,
+                grade_score=grade_score, credit_hours=rng.choice([3, 4]), semester="Fall", year=2024
+            ))
+        users.append(user)
+    db.commit()
+    rebuild_academic_summaries(db)
+    return users
+
+
+def _brute_force(db, user):
+    """Percentiles by scanning every member (reference)"""
+    rows = gpa_percentiles._member_query(db).all()
+    me = next((row for row in rows if row.id == user.id), None)
+    if me is None:
+        return []
+    mine = gpa_percentiles._cohorts(me)
+    results = []
+    for cohort_type in gpa_percentiles.COHORT_TYPES:
+        if cohort_type not in mine:
+            continue
+        key, label = mine[cohort_type]
+        gpas = [float(row.gpa) for row in rows if gpa_percentiles._cohorts(row).get(cohort_type, (None,))[0] == key]
+        below = sum(g < float(me.gpa) for g in gpas)
+        equal = sum(g == float(me.gpa) for g in gpas)
+        results.append({
+            'cohort_type': cohort_type, 'cohort': label, 'gpa': float(me.gpa),
+            'percentile': round((below + equal / 2) / len(gpas) * 100, 1),
+            'rank': sum(g > float(me.gpa) for g in gpas) + 1,
+            'cohort_size': len(gpas)
+        })
+    return results
+
+
+def test_percentiles_match_scan():
+    """Test bisect lookups equal a full scan for every member"""
+    print("Testing percentile lookups...")
+    db = _make_session()
+    users = _seed(db)
+    gpa_percentiles.rebuild_index(db)
+
+    ranked = 0
+    for user in users:
+        expected = _brute_force(db, user)
+        assert gpa_percentiles.get_gpa_percentiles(db, user.id) == expected, user.first_name
+        ranked += bool(expected)
+    assert 0 < ranked < len(users)
+    print(f"  [OK] {ranked} ranked members match a full scan (alumni and members without a GPA excluded)")
+
+    cs_member = next(u for u in users if u.major in ("CS", "Computer Science") and _brute_force(db, u))
+    major = next(p for p in gpa_percentiles.get_gpa_percentiles(db, cs_member.id) if p['cohort_type'] == 'major')
+    cs_size = sum(
+        1 for u in users if u.major in ("CS", "Computer Science") and _brute_force(db, u)
+    )
+    assert major['cohort_size'] == cs_size
+    print("  [OK] Major cohorts use major_key (CS and Computer Science together)")
+
+
+def test_incremental_updates():
+    """Test course and major changes update the lists in place, and foreign changes trigger a rebuild"""
+    print("Testing incremental updates...")
+    db = _make_session()
+    users = _seed(db, seed=11)
+    gpa_percentiles.rebuild_index(db)
+    rebuilds = []
+    original_rebuild = gpa_percentiles.rebuild_index
+
+    def counting_rebuild(db):
+        rebuilds.append(1)
+        original_rebuild(db)
+
+    gpa_percentiles.rebuild_index = counting_rebuild
+    try:
+        target = next(u for u in users if not u.is_alumni)
+        db.add(Course(
+            id=uuid.uuid4(), user_id=target.id, course_code="MATH 300", grade="A", grade_score=4.0,
+            credit_hours=12, semester="Spring", year=2025
+        ))
+        db.commit()
+        courses_changed(db, target.id, ["MATH 300"])
+        assert gpa_percentiles.get_gpa_percentiles(db, target.id) == _brute_force(db, target)
+        assert rebuilds == []
+        print("  [OK] Course change re-placed the member without a rebuild")
+
+        incremental = dict(gpa_percentiles._index.sorted_gpas)
+        original_rebuild(db)
+        assert gpa_percentiles._index.sorted_gpas == incremental
+        print("  [OK] Incremental lists equal a full rebuild")
+
+        # Unrelated user writes (points, profile) leave the lists alone
+        target.points = 25
+        db.commit()
+        gpa_percentiles.get_gpa_percentiles(db, target.id)
+        assert rebuilds == []
+        print("  [OK] Lookups read only the version counter; points updates don't rebuild")
+
+        # Another worker changes X (its member_changed bumps the version), then this
+        # worker changes Y: the lists missed X's change, so Y's bump must not adopt it
+        ranked = [u for u in users if not u.is_alumni and db.get(UserAcademicSummary, u.id) is not None]
+        other, mover = ranked[1], ranked[2]
+        db.delete(db.get(UserAcademicSummary, other.id))
+        db.commit()
+        bump_cache_version(db, GPA_PERCENTILES)
+        db.add(Course(
+            id=uuid.uuid4(), user_id=mover.id, course_code="MATH 301", grade="B", grade_score=3.0,
+            credit_hours=3, semester="Spring", year=2025
+        ))
+        db.commit()
+        courses_changed(db, mover.id, ["MATH 301"])
+        assert gpa_percentiles.get_gpa_percentiles(db, other.id) == []
+        assert gpa_percentiles.get_gpa_percentiles(db, mover.id) == _brute_force(db, mover)
+        assert gpa_percentiles.get_gpa_percentiles(db, target.id) == _brute_force(db, target)
+        assert rebuilds == [1]
+        print("  [OK] Changes from other workers are picked up through the version counter")
+    finally:
+        gpa_percentiles.rebuild_index = original_rebuild
+
+
+def test_endpoints():
+    """Test the percentile endpoint and the academic trends field"""
+    print("Testing endpoints...")
+    db = _make_session()
+    users = _seed(db, seed=3)
+    analytics._trends_cache.clear()
+    user = next(u for u in users if _brute_force(db, u))
+
+    ranking = asyncio.run(analytics.get_gpa_percentile_ranking(current_user=user, db=db))
+    assert [p.model_dump() for p in ranking] == _brute_force(db, user)
+    assert ranking[0].cohort_type == "chapter" and ranking[0].cohort == "Chapter"
+    print("  [OK] /analytics/gpa-percentiles")
+
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/analytics/academic-trends", "headers": []})
+    response = Response()
+    trends = asyncio.run(analytics.get_academic_trends(request=request, response=response, current_user=user, db=db))
+    assert trends.gpa_percentiles == ranking
+    print("  [OK] gpa_percentiles field on academic trends")
+
+
+if __name__ == "__main__":
+    test_percentiles_match_scan()
+    test_incremental_updates()
+    test_endpoints()
+    print("\n>>> All GPA percentile tests passed!")
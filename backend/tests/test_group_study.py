@@ -0,0 +1,72 @@
+"""
+Test script to verify group study matching is grouped and ranked in SQL (overlap / Jaccard)
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.models.course import Course
+from app.models.user import User
+from app.api.v1.recommendations import get_group_study_recommendations
+from sqlite_support import make_session
+
+
+def test_group_study_ranking():
+    """Test overlap ranking, Jaccard ranking, limit and exclusion of completed courses"""
+    print("Testing group study ranking...")
+    db = make_session([User.__table__, Course.__table__])
+
+    def add_user(first_name, current_codes, completed_codes=()):
+        user = User(
+            id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+            last_name="Test", hashed_password="x"
+        )
+        db.add(user)
+        for code in current_codes:
+            db.add(Course(id=uuid.uuid4(), user_id=user.id, course_code=code, grade="IN PROGRESS", semester="Fall", year=2026))
+        transcript_id = uuid.uuid4()  # Courses from a transcript (SQLite doesn't enforce the FK)
+        for code in completed_codes:
+            db.add(Course(
+                id=uuid.uuid4(), user_id=user.id, transcript_id=transcript_id, course_code=code,
+                grade="A", grade_score=4.0, semester="Spring", year=2025
+            ))
+        return user
+
+    me = add_user("Me", ["CS 101", "MATH 201", "PHYS 150"])
+    add_user("Busy", ["CS 101", "MATH 201", "HIST 100", "ART 110", "ECON 101", "BIO 101"])  # 2 shared of 7
+    add_user("Twin", ["CS 101", "MATH 201"])  # 2 shared of 3
+    add_user("Single", ["PHYS 150"])  # 1 shared of 3
+    add_user("Alum", [], completed_codes=["CS 101", "MATH 201", "PHYS 150"])  # Completed only - not current
+    add_user("Stranger", ["HIST 100"])
+    db.commit()
+
+    results = asyncio.run(get_group_study_recommendations(limit=10, jaccard=False, current_user=me, db=db))
+    assert [r.helper_name for r in results] == ["Busy Test", "Twin Test", "Single Test"], results
+    assert results[0].shared_courses == ["CS 101", "MATH 201"]
+    assert results[0].total_shared_courses == 2
+    assert results[1].similarity == round(2 / 3, 4)
+    assert results[0].similarity == round(2 / 7, 4)
+    print("  [OK] Ranked by shared course count, then name; completed courses ignored")
+
+    results = asyncio.run(get_group_study_recommendations(limit=10, jaccard=True, current_user=me, db=db))
+    assert [r.helper_name for r in results] == ["Twin Test", "Single Test", "Busy Test"], results
+    print("  [OK] Jaccard weighting favours similar schedules")
+
+    results = asyncio.run(get_group_study_recommendations(limit=1, jaccard=False, current_user=me, db=db))
+    assert [r.helper_name for r in results] == ["Busy Test"]
+    print("  [OK] Limit applied in SQL")
+
+    loner = add_user("Loner", [])
+    db.commit()
+    assert asyncio.run(get_group_study_recommendations(limit=10, jaccard=False, current_user=loner, db=db)) == []
+    print("  [OK] No current courses -> no recommendations")
+
+
+if __name__ == "__main__":
+    test_group_study_ranking()
+    print("\n>>> All group study tests passed!")
@@ -0,0 +1,170 @@
+"""
+Test script to verify HTTPCacheMiddleware answers If-None-Match from version counters
+"""
+import sys
+import os
+import uuid
+import tempfile
+from decimal import Decimal
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+import app.models  # noqa: F401 - registers all mappers
+from app.core import http_cache
+from app.core.database import get_db
+from app.core.http_cache import HTTPCacheMiddleware, cache_policy
+from app.core.security import create_access_token
+from app.core.serialization import ORJSONResponse
+from app.core.user_cache import AuthenticatedUser
+from app.models.battle_buddy import BattleBuddyMember, BattleBuddyTeam
+from app.models.cache_version import CacheVersion
+from app.models.class_post import ClassPost
+from app.models.points import PointsHistory, PointType
+from app.models.user import User
+from app.api.v1 import battle_buddy, class_posts, points
+from app.api.v1.auth import get_current_user
+from app.services.cache_versions import get_cache_version
+from app.services.points_service import award_points
+from sqlite_support import make_session_factory
+
+
+def _make_client(directory):
+    """Test app with the cached routers, the middleware and a file-backed SQLite database"""
+    factory = make_session_factory([
+        User.__table__, ClassPost.__table__, BattleBuddyTeam.__table__, BattleBuddyMember.__table__,
+        CacheVersion.__table__, PointsHistory.__table__
+    ], directory, "cache.db")
+    db = factory()
+    user = User(id=uuid.uuid4(), email="ann@example.com", first_name="Ann", last_name="Test", hashed_password="x", points=10)
+    db.add(user)
+    db.add(ClassPost(
+        id=uuid.uuid4(), user_id=user.id, course_code="CS 3345", class_format="online", professor_name="Smith",
+        professor_rating=Decimal("4.5"), exam_format="in_person"
+    ))
+    db.add_all([CacheVersion(name=name, version=0) for name in ("class_posts", "battle_buddy_teams", "leaderboard")])
+    db.commit()
+
+    handler_calls = []
+
+    def override_get_db():
+        handler_calls.append(1)
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    test_app = FastAPI(default_response_class=ORJSONResponse)
+    test_app.add_middleware(HTTPCacheMiddleware)
+    test_app.include_router(points.router, prefix="/api/v1")
+    test_app.include_router(battle_buddy.router, prefix="/api/v1/battle-buddy")
+    test_app.include_router(class_posts.router, prefix="/api/v1/class-posts")
+    test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[get_current_user] = lambda: AuthenticatedUser.model_validate(user)
+
+    http_cache.SessionLocal = factory
+    token = create_access_token({"sub": str(user.id)})
+    return TestClient(test_app), db, {"Authorization": f"Bearer {token}"}, handler_calls, user
+
+
+def _bump(db, name):
+    """What the Postgres trigger does on a write to the counter's tables"""
+    db.execute(text("UPDATE cache_versions SET version = version + 1 WHERE name = :name"), {"name": name})
+    db.commit()
+
+
+def test_policies():
+    """Test route matching for cached routes"""
+    print("Testing cache policies...")
+    assert cache_policy("GET", "/api/v1/class-posts").counters == ("class_posts",)
+    assert cache_policy("get", "/api/v1/class-posts/").name == "class-posts"
+    assert cache_policy("POST", "/api/v1/class-posts") is None
+    assert cache_policy("GET", "/api/v1/class-posts/user/me") is None  # Per-user - not shared
+    assert cache_policy("GET", "/api/v1/admin/battle-buddy/teams/list") == cache_policy("GET", "/api/v1/battle-buddy/teams/list")
+    assert not cache_policy("GET", "/api/v1/points/values").private
+    print("  [OK] Exact paths, methods and shared policies")
+
+
+def test_not_modified_without_handler():
+    """Test a matching If-None-Match gets 304 without running the handler, until the counter moves"""
+    print("Testing conditional requests...")
+    original = http_cache.SessionLocal
+    with tempfile.TemporaryDirectory() as directory:
+        client, db, auth, handler_calls, user = _make_client(directory)
+        try:
+            first = client.get("/api/v1/class-posts", headers=auth)
+            etag = first.headers["etag"]
+            assert first.status_code == 200 and len(first.json()) == 1
+            assert first.headers["cache-control"] == "private, no-cache" and len(handler_calls) == 1
+
+            again = client.get("/api/v1/class-posts", headers={**auth, "If-None-Match": etag})
+            assert again.status_code == 304 and again.headers["etag"] == etag and not again.content
+            assert len(handler_calls) == 1
+            print("  [OK] 304 Not Modified without running the handler")
+
+            filtered = client.get("/api/v1/class-posts?course_code=cs", headers={**auth, "If-None-Match": etag})
+            assert filtered.status_code == 200 and filtered.headers["etag"] != etag
+            print("  [OK] Each query string has its own ETag")
+
+            _bump(db, "class_posts")
+            changed = client.get("/api/v1/class-posts", headers={**auth, "If-None-Match": etag})
+            assert changed.status_code == 200 and changed.headers["etag"] != etag
+            _bump(db, "leaderboard")
+            assert client.get("/api/v1/class-posts", headers={**auth, "If-None-Match": changed.headers["etag"]}).status_code == 304
+            print("  [OK] Only the route's own counter invalidates it")
+
+            calls = len(handler_calls)
+            anonymous = client.get("/api/v1/class-posts", headers={"If-None-Match": changed.headers["etag"]})
+            assert anonymous.status_code == 200 and len(handler_calls) == calls + 1
+            print("  [OK] Without a valid token the handler runs (auth is not bypassed)")
+
+            values = client.get("/api/v1/points/values")
+            assert values.headers["cache-control"] == "public, max-age=3600"
+            assert client.get("/api/v1/points/values", headers={"If-None-Match": values.headers["etag"]}).status_code == 304
+            board = client.get("/api/v1/points/leaderboard", headers=auth)
+            assert board.headers["cache-control"] == "private, max-age=15"
+            teams = client.get("/api/v1/battle-buddy/teams/list", headers=auth)
+            assert client.get(
+                "/api/v1/battle-buddy/teams/list", headers={**auth, "If-None-Match": teams.headers["etag"]}
+            ).status_code == 304
+            print("  [OK] Point values, leaderboard and team list carry validators")
+
+            before = get_cache_version(db, "leaderboard")
+            award_points(db, user.id, PointType.HELP_PROVIDED)
+            assert get_cache_version(db, "leaderboard") == before + 1
+            assert client.get(
+                "/api/v1/points/leaderboard", headers={**auth, "If-None-Match": board.headers["etag"]}
+            ).status_code == 200
+            print("  [OK] A points award bumps the leaderboard version after its commit")
+        finally:
+            http_cache.SessionLocal = original
+
+
+def test_version_read_failure():
+    """Test the request is served normally when the counters cannot be read"""
+    print("Testing version read failures...")
+    original = http_cache.SessionLocal
+    with tempfile.TemporaryDirectory() as directory:
+        client, _, auth, handler_calls, _ = _make_client(directory)
+
+        def broken_session():
+            raise RuntimeError("database unavailable")
+
+        http_cache.SessionLocal = broken_session
+        try:
+            response = client.get("/api/v1/class-posts", headers={**auth, "If-None-Match": "*"})
+            assert response.status_code == 200 and "etag" not in response.headers and handler_calls
+        finally:
+            http_cache.SessionLocal = original
+    print("  [OK] Served without validators")
+
+
+if __name__ == "__main__":
+    test_policies()
+    test_not_modified_without_handler()
+    test_version_read_failure()
+    print("\n>>> All HTTP cache tests passed!")
@@ -0,0 +1,63 @@
+"""
+Test script to verify app.main imports quickly and without heavy optional modules
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and checks:
+- pdfplumber, boto3/botocore, Celery and Redis are not imported at startup
+- the cumulative import time of app.main stays within budget
+"""
+import sys
+import os
+import subprocess
+
+# Add the backend directory to the path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Generous enough for slow CI machines; a cold import was ~10s before lazy loading
+IMPORT_TIME_BUDGET_SECONDS = 5.0
+
+# Loaded on first use (uploads, storage), never at import time
+HEAVY_MODULES = ["pdfplumber", "boto3", "botocore", "celery", "redis"]
+
+
+def _import_times():
+    """Return {module: cumulative_microseconds} for a fresh `import app.main`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # Header line
+        times[parts[2].strip()] = int(parts[1].strip())
+    return times
+
+
+def test_import_time_budget():
+    """Test that app.main avoids heavy modules and imports within budget"""
+    print("Testing app.main import time...")
+    times = _import_times()
+
+    for heavy in HEAVY_MODULES:
+        assert heavy not in times, f"{heavy} is imported at startup - import it on first use instead"
+    print(f"  [OK] Not imported at startup: {', '.join(HEAVY_MODULES)}")
+
+    total_seconds = times["app.main"] / 1_000_000
+    assert total_seconds < IMPORT_TIME_BUDGET_SECONDS, (
+        f"import app.main took {total_seconds:.2f}s (budget {IMPORT_TIME_BUDGET_SECONDS}s)"
+    )
+    print(f"  [OK] import app.main: {total_seconds:.2f}s (budget {IMPORT_TIME_BUDGET_SECONDS}s)")
+
+
+if __name__ == "__main__":
+    test_import_time_budget()
+    print("\n>>> All import time tests passed!")
@@ -0,0 +1,73 @@
+"""
+Test script to verify major normalization (canonical major keys) and same-major lookups
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.core.majors import normalize_major
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.api.v1.recommendations import get_recommendations_by_major
+from sqlite_support import make_session
+
+
+def test_normalize_major():
+    """Test case, punctuation, whitespace and aliases map to one key"""
+    print("Testing major normalization...")
+    variants = ["Computer Science", "  computer   science ", "CS", "Comp. Sci.", "compsci"]
+    assert {normalize_major(m) for m in variants} == {"computer science"}
+    print("  [OK] Spelling variants share a key")
+
+    assert normalize_major("Electrical & Computer Engineering") == normalize_major("ECE")
+    assert normalize_major("Econ") == "economics"
+    print("  [OK] '&' and abbreviations are canonicalized")
+
+    assert normalize_major("Underwater Basket Weaving") == "underwater basket weaving"
+    assert normalize_major(None) is None
+    assert normalize_major("  ") is None
+    print("  [OK] Unknown majors pass through; empty majors have no key")
+
+
+def test_major_key_sync_and_lookup():
+    """Test major_key follows major and drives the same-major view"""
+    print("Testing major_key maintenance and same-major lookup...")
+    db = make_session([User.__table__, UserAcademicSummary.__table__])
+
+    def add_user(first_name, major):
+        user = User(
+            id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+            last_name="Test", major=major, hashed_password="x"
+        )
+        db.add(user)
+        return user
+
+    requester = add_user("Requester", "Computer Science")
+    add_user("Alias", "CS")
+    add_user("Spacing", " computer  science ")
+    add_user("Other", "Mathematics")
+    add_user("NoMajor", None)
+    mover = add_user("Mover", "Biology")
+    db.commit()
+
+    assert requester.major_key == "computer science"
+    mover.major = "Comp Sci"
+    db.commit()
+    assert mover.major_key == "computer science"
+    print("  [OK] major_key is set on create and on major change")
+
+    results = asyncio.run(get_recommendations_by_major(limit=20, current_user=requester, db=db))
+    names = sorted(r.helper_name.split()[0] for r in results)
+    assert names == ["Alias", "Mover", "Spacing"], names
+    print("  [OK] Same-major view matches on the normalized key")
+
+
+if __name__ == "__main__":
+    test_normalize_major()
+    test_major_key_sync_and_lookup()
+    print("\n>>> All major normalization tests passed!")
@@ -0,0 +1,69 @@
+"""
+Test script to verify password hashing in the bounded bcrypt pool
+"""
+import sys
+import os
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from app.core import security
+from app.core.config import settings
+from app.core.metrics import metrics
+
+
+def test_hash_and_verify_in_pool():
+    """Test that hashing and verification run in the pool and round-trip"""
+    print("Testing async hash/verify...")
+
+    async def run():
+        hashed = await security.get_password_hash_async("correct horse")
+        assert await security.verify_password_async("correct horse", hashed)
+        assert not await security.verify_password_async("wrong horse", hashed)
+        valid, new_hash = await security.verify_and_update_password("correct horse", hashed)
+        assert valid and new_hash is None, "Hash with the configured cost should not be rehashed"
+
+    asyncio.run(run())
+    assert security._hash_pending == 0, "All pool slots should be released"
+    assert metrics.snapshot()["timings"]["password_hash.queue_wait"]["count"] >= 4
+    print("[OK] Hash/verify round trip")
+
+
+def test_rehash_when_cost_changes():
+    """Test that hashes made with a different cost factor are upgraded on verify"""
+    print("\nTesting transparent rehash...")
+    old_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    old_hash = old_context.hash("legacy password")
+
+    valid, new_hash = asyncio.run(security.verify_and_update_password("legacy password", old_hash))
+    assert valid
+    assert new_hash is not None, "Hash with an outdated cost factor should be replaced"
+    assert f"${settings.BCRYPT_ROUNDS:02d}$" in new_hash
+    print(f"[OK] Rehashed from cost 4 to cost {settings.BCRYPT_ROUNDS}")
+
+
+def test_queue_full_returns_429():
+    """Test that requests are shed with 429 once the pool queue is full"""
+    print("\nTesting queue limit...")
+    rejected_before = metrics.snapshot()["counters"].get("password_hash.rejected", 0)
+    security._hash_pending = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUE
+    try:
+        asyncio.run(security.verify_password_async("pw", "not-a-hash"))
+        assert False, "Expected HTTP 429"
+    except HTTPException as e:
+        assert e.status_code == 429
+        assert "Retry-After" in e.headers
+    finally:
+        security._hash_pending = 0
+    assert metrics.snapshot()["counters"]["password_hash.rejected"] == rejected_before + 1
+    print("[OK] Full queue is rejected with 429")
+
+
+if __name__ == "__main__":
+    test_hash_and_verify_in_pool()
+    test_rehash_when_cost_changes()
+    test_queue_full_returns_429()
+    print("\n>>> All password hashing tests passed!")
@@ -0,0 +1,156 @@
+"""
+Test script to verify server-side projections match frontend projections.ts and run batched
+"""
+import sys
+import os
+import uuid
+import asyncio
+import random
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import Request, Response
+import app.models  # noqa: F401 - registers all mappers
+from app.core.config import settings
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services import chapter_analytics
+from app.services.academic_summary import rebuild_academic_summaries
+from app.services.projections import PRESETS, ProjectionConfig, project_series
+from app.api.v1 import analytics
+from sqlite_support import make_session
+
+
+GPA_SERIES = [
+    ("Fall 2021", 3.1), ("Spring 2022", 3.25), ("Fall 2022", 3.4), ("Spring 2023", 3.32),
+    ("Summer 2023", 3.9), ("Fall 2023", 3.55), ("Spring 2024", 3.7), ("Fall 2024", 3.8)
+]
+POINTS_SERIES = [("Fall 2022", 45.3), ("Spring 2023", 50.1), ("Fall 2023", 38.0)]
+CREDITS_SERIES = [("Fall 2022", 15), ("Spring 2023", 16), ("Summer 2023", 3), ("Fall 2023", 17)]
+
+
+def test_matches_frontend():
+    """Test outputs recorded from frontend/lib/utils/projections.ts for the same inputs"""
+    print("Testing parity with projections.ts...")
+    # projectionPresets.gpa: Spring 2024 already exists, so (like the frontend) it is skipped
+    assert project_series([GPA_SERIES], PRESETS['gpa'])[0] == [("Fall 2025", 4.0), ("Spring 2025", 4.0), ("Summer 2025", 4.0)]
+    assert project_series([POINTS_SERIES], PRESETS['points'])[0] == [("Fall 2024", 37.17), ("Spring 2024", 33.52), ("Summer 2024", 29.87)]
+    assert project_series([CREDITS_SERIES], PRESETS['credits'])[0] == [("Fall 2024", 12.75), ("Spring 2024", 12.75), ("Summer 2024", 12.75)]
+    exponential = ProjectionConfig(method="exponential", periods=2)
+    assert project_series([GPA_SERIES], exponential)[0] == [("Fall 2025", 3.65)]
+    print("  [OK] Linear, moving average and exponential presets match")
+
+    assert project_series([GPA_SERIES[:1], [("Transfer", 3.0), ("Transfer", 3.5)], []], PRESETS['gpa']) == [[], [], []]
+    print("  [OK] Too few points or no year in the last period -> no projection")
+
+
+def test_batch_equals_single():
+    """Test one batched pass equals projecting each series on its own"""
+    print("Testing batched projections...")
+    rng = random.Random(4)
+    semesters = ["Fall", "Spring", "Summer"]
+    series = []
+    for _ in range(300):
+        length = rng.randint(0, 12)
+        series.append([
+            (f"{semesters[k % 3]} {2018 + k // 3}", round(rng.uniform(0, 4), 2)) for k in range(length)
+        ])
+    for method in ("linear", "moving_average", "exponential"):
+        config = ProjectionConfig(method=method, minimum=0.0, maximum=4.0)
+        batched = project_series(series, config)
+        assert batched == [project_series([s], config)[0] for s in series]
+    print(f"  [OK] {len(series)} series x 3 methods")
+
+
+def _make_session():
+    """In-memory SQLite session with users, courses and summaries"""
+    return make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__
+    ])
+
+
+def _add_member(db, name, major, terms):
+    """Member with one 3-credit course per (semester, year, grade_score)"""
+    user = User(
+        id=uuid.uuid4(), email=f"{name.lower()}@example.com", first_name=name, last_name="Test",
+        hashed_password="x", major=major, pledge_class="Fall 2022", graduation_year=2026
+    )
+    db.add(user)
+    for n, (semester, year, grade_score) in enumerate(terms):
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code=f"CS {100 + n}", grade="A", grade_score=grade_score,
+            credit_hours=3, semester=semester, year=year
+        ))
+    return user
+
+
+def test_attached_to_reports():
+    """Test projections on the academic trends response and the chapter report"""
+    print("Testing projections on analytics responses...")
+    db = _make_session()
+    ann = _add_member(db, "Ann", "Computer Science", [("Fall", 2022, 3.0), ("Spring", 2023, 3.3), ("Fall", 2023, 3.7)])
+    _add_member(db, "Ben", "Computer Science", [("Fall", 2022, 3.7), ("Spring", 2023, 3.3)])
+    _add_member(db, "Cal", "Mathematics", [("Fall", 2023, 2.0)])  # One term - no projection
+    db.commit()
+    rebuild_academic_summaries(db)
+    analytics._trends_cache.clear()
+
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/analytics/academic-trends", "headers": []})
+    trends = asyncio.run(analytics.get_academic_trends(request=request, response=Response(), current_user=ann, db=db))
+    expected = project_series([[(p.period, p.gpa) for p in trends.gpa_trend]], PRESETS['gpa'])[0]
+    assert [(p.period, p.value) for p in trends.projections.gpa] == expected and expected
+    assert trends.projections.points and trends.projections.credits
+    print("  [OK] academic-trends carries gpa/points/credits projections")
+
+    original = settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE
+    settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = 1  # Report statistics for these small cohorts
+    try:
+        report = chapter_analytics.build_chapter_report(db)
+    finally:
+        settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = original
+    ann_next = expected[0][1]
+    ben_next = project_series([[("Fall 2022", 3.7), ("Spring 2023", 3.3)]], PRESETS['gpa'])[0][0][1]
+    assert report['overall']['projected_member_count'] == 2
+    assert report['overall']['projected_term_gpa'] == round((ann_next + ben_next) / 2, 2)
+    math = next(c for c in report['by_major'] if c['cohort'] == 'Mathematics')
+    assert math['projected_term_gpa'] is None and math['projected_member_count'] == 0
+    print("  [OK] Chapter cohorts carry the mean projected next-term GPA")
+
+
+def test_chapter_series_matches_member_trend():
+    """Test the chapter projection fits the same term series as the member's own projections.gpa"""
+    print("Testing chapter and member projection parity...")
+    db = _make_session()
+    # Year 0 and empty/NULL semesters are 'Unknown' terms in the trend (sorted first), not dropped
+    ann = _add_member(db, "Ann", "Computer Science", [
+        ("", 2022, 2.0), (None, 2022, 2.4), ("Fall", 0, 3.9), ("Fall", None, 3.1),
+        ("Fall", 2022, 3.0), ("Spring", 2023, 2.7), ("Fall", 2023, 3.6)
+    ])
+    db.commit()
+    rebuild_academic_summaries(db)
+    analytics._trends_cache.clear()
+
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/analytics/academic-trends", "headers": []})
+    trends = asyncio.run(analytics.get_academic_trends(request=request, response=Response(), current_user=ann, db=db))
+    assert [p.period for p in trends.gpa_trend] == ["Fall Unknown", "Fall 2022", "Unknown 2022", "Spring 2023", "Fall 2023"]
+
+    original = settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE
+    settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = 1
+    try:
+        report = chapter_analytics.build_chapter_report(db)
+    finally:
+        settings.CHAPTER_ANALYTICS_MIN_COHORT_SIZE = original
+    assert report['overall']['projected_term_gpa'] == trends.projections.gpa[0].value
+    print("  [OK] Chapter projection equals the member's next projected GPA")
+
+
+if __name__ == "__main__":
+    test_matches_frontend()
+    test_batch_equals_single()
+    test_attached_to_reports()
+    test_chapter_series_matches_member_trend()
+    print("\n>>> All projection tests passed!")
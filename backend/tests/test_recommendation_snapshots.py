@@ -0,0 +1,108 @@
+"""
+Test script to verify help request rankings are stored and served from the recommendations table
+"""
+import sys
+import os
+import uuid
+import asyncio
+import json
+from datetime import timedelta
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import BackgroundTasks
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.course_tutor_index import CourseTutorIndex
+from app.models.help_request import HelpRequest
+from app.models.recommendation import Recommendation
+from app.models.user import User
+from app.models.user_academic_summary import UserAcademicSummary
+from app.services import recommendation_snapshots
+from app.services.course_changes import courses_changed
+from app.services.course_tutor_index import rebuild_course_tutor_index
+from app.api.v1.help_requests import create_help_request, HelpRequestCreate
+from app.api.v1.recommendations import get_recommendations
+from sqlite_support import make_session
+
+
+def test_snapshot_lifecycle():
+    """Test create stores the ranking, views reuse it, and new tutors trigger a refresh"""
+    print("Testing recommendation snapshots...")
+    db = make_session([
+        User.__table__, CacheVersion.__table__, Course.__table__, CourseTutorIndex.__table__, UserAcademicSummary.__table__,
+        HelpRequest.__table__, Recommendation.__table__
+    ])
+
+    def add_user(first_name, grade_score=None):
+        user = User(
+            id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+            last_name="Test", major="Biology", hashed_password="x"
+        )
+        db.add(user)
+        if grade_score is not None:
+            db.add(Course(
+                id=uuid.uuid4(), user_id=user.id, course_code="BIO 101", grade="A",
+                grade_score=grade_score, year=2024, semester="Fall"
+            ))
+        return user
+
+    requester = add_user("Requester")
+    add_user("Ann", 4.0)
+    add_user("Ben", 3.0)
+    db.commit()
+    rebuild_course_tutor_index(db)
+
+    help_request = asyncio.run(create_help_request(
+        request_data=HelpRequestCreate(course_code="bio 101"), current_user=requester, db=db
+    ))
+    stored = db.query(Recommendation).order_by(Recommendation.rank).all()
+    assert [(r.rank, float(r.grade_score)) for r in stored] == [(1, 4.0), (2, 3.0)]
+    print("  [OK] create_help_request stores the ranking")
+
+    def view(limit=10):
+        tasks = BackgroundTasks()
+        results = asyncio.run(get_recommendations(
+            request_id=help_request.id, background_tasks=tasks, limit=limit, current_user=requester, db=db
+        ))
+        return [r['helper_name'].split()[0] for r in json.loads(results.body)], tasks
+
+    original_rank_tutors = recommendation_snapshots.rank_tutors
+
+    def fail_rank_tutors(*args, **kwargs):
+        raise AssertionError("Snapshot views must not re-rank")
+
+    recommendation_snapshots.rank_tutors = fail_rank_tutors
+    try:
+        names, tasks = view()
+        assert names == ["Ann", "Ben"] and not tasks.tasks
+        assert view(limit=1)[0] == ["Ann"]
+    finally:
+        recommendation_snapshots.rank_tutors = original_rank_tutors
+    print("  [OK] Views are served from the snapshot without re-ranking")
+
+    # Snapshot taken a while ago; a new graded course for the code arrives since
+    for recommendation in db.query(Recommendation).all():
+        recommendation.created_at = recommendation.created_at - timedelta(minutes=5)
+    db.commit()
+    cal = add_user("Cal", 3.5)
+    db.commit()
+    courses_changed(db, cal.id, ["BIO 101"])
+
+    names, tasks = view()
+    assert names == ["Ann", "Ben"]  # Stale snapshot is still served
+    assert [task.func for task in tasks.tasks] == [recommendation_snapshots.refresh_in_background]
+    print("  [OK] Stale snapshot served and a background refresh scheduled")
+
+    # Run the refresh (the background task does the same in its own session)
+    recommendation_snapshots.refresh_recommendations(db, db.get(HelpRequest, help_request.id), requester.major)
+    names, tasks = view()
+    assert names == ["Ann", "Cal", "Ben"] and not tasks.tasks
+    print("  [OK] Refreshed snapshot includes the new tutor")
+
+
+if __name__ == "__main__":
+    test_snapshot_lifecycle()
+    print("\n>>> All recommendation snapshot tests passed!")
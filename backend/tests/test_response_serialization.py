@@ -0,0 +1,168 @@
+"""
+Test script to verify the orjson response class and pre-built row serializers
+
+Also benchmarks a 1,000-row class post listing: the previous path (FastAPI
+validating each ORM row into ClassPostResponse, then json.dumps) against
+CLASS_POST_ROWS (attrgetter + orjson).
+"""
+import sys
+import os
+import uuid
+import json
+import time
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import List
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+import app.models  # noqa: F401 - registers all mappers
+from app.core.serialization import ORJSONResponse, RowSerializer
+from app.models.class_post import ClassPost
+from app.models.help_request import HelpRequest
+from app.models.transcript import Transcript
+from app.models.user import User
+from app.api.v1.class_posts import CLASS_POST_ROWS, ClassPostResponse, list_class_posts
+from app.api.v1.help_requests import HELP_REQUEST_ROWS, HelpRequestResponse
+from app.api.v1.transcripts import TRANSCRIPT_ROWS, TranscriptResponse
+from sqlite_support import make_session
+
+BENCHMARK_ROWS = 1000
+BENCHMARK_REPEATS = 5
+
+
+def _make_session(post_count=BENCHMARK_ROWS):
+    """In-memory SQLite session with class posts, help requests and transcripts"""
+    db = make_session([
+        User.__table__, ClassPost.__table__, HelpRequest.__table__, Transcript.__table__
+    ])
+    rng = random.Random(7)
+    user = User(id=uuid.uuid4(), email="ann@example.com", first_name="Ann", last_name="Test", hashed_password="x")
+    db.add(user)
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for n in range(post_count):
+        exam_format = rng.choice(["in_person", "online"])
+        db.add(ClassPost(
+            id=uuid.uuid4(), user_id=user.id, course_code=f"CS {1000 + n % 50}",
+            course_name=rng.choice([None, "Data Structures"]), class_format=rng.choice(["in_person", "online"]),
+            professor_name=f"Professor {n % 37}", professor_rating=Decimal(rng.randint(0, 500)) / 100,
+            exam_format=exam_format, lockdown_browser_required=rng.choice([True, False]) if exam_format == "online" else None,
+            description=rng.choice([None, "Weekly quizzes, curved final."]),
+            created_at=start + timedelta(minutes=n, microseconds=rng.choice([0, 123456])),
+            updated_at=rng.choice([None, start + timedelta(days=n)])
+        ))
+    for n, status in enumerate(["active", "fulfilled", "cancelled"]):
+        db.add(HelpRequest(
+            id=uuid.uuid4(), requester_id=user.id, course_code=f"MATH {2400 + n}",
+            course_name=None if n else "Linear Algebra", status=status, created_at=start + timedelta(hours=n)
+        ))
+        db.add(Transcript(
+            id=uuid.uuid4(), user_id=user.id, file_name=f"t{n}.pdf", file_size=1000 * n, pdf_content=b"%PDF" * 100,
+            upload_date=start + timedelta(days=n), processing_status=status,
+            processed_at=None if n else start, error_message="Parse failed" if n == 2 else None
+        ))
+    db.commit()
+    return db, user
+
+
+class _IdOnly(BaseModel):
+    id: str
+
+
+def _validated_body(response_model, rows) -> bytes:
+    """Response body the way FastAPI built it before: validate rows into response_model, then json.dumps"""
+    field = create_response_field(name="response", type_=List[response_model])
+    content = asyncio.run(serialize_response(field=field, response_content=rows))
+    return JSONResponse(content).body
+
+
+def test_rows_match_response_models():
+    """Test row serializers produce the same JSON as validating through the response models"""
+    print("Testing row serializers against response models...")
+    db, _ = _make_session(post_count=200)
+
+    posts = db.query(ClassPost).all()
+    assert json.loads(CLASS_POST_ROWS.response(posts).body) == json.loads(_validated_body(ClassPostResponse, posts))
+    print(f"  [OK] {len(posts)} class posts (Decimal ratings, datetimes with and without microseconds, nulls)")
+
+    requests = db.query(*HELP_REQUEST_ROWS.columns).all()
+    assert json.loads(HELP_REQUEST_ROWS.response(requests).body) == json.loads(
+        _validated_body(HelpRequestResponse, db.query(HelpRequest).all())
+    )
+    transcripts = db.query(*TRANSCRIPT_ROWS.columns).all()
+    assert json.loads(TRANSCRIPT_ROWS.response(transcripts).body) == json.loads(
+        _validated_body(TranscriptResponse, db.query(Transcript).all())
+    )
+    assert "pdf_content" not in {column.key for column in TRANSCRIPT_ROWS.columns}
+    print("  [OK] Help requests and transcripts from column-only queries")
+
+
+def test_serializer_checks_fields():
+    """Test a serializer whose response model does not match the ORM model is rejected when built"""
+    print("Testing serializer construction...")
+    try:
+        RowSerializer(ClassPostResponse, HelpRequest)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "professor_name" in str(e)
+    assert RowSerializer(_IdOnly)([HelpRequest(id="x")]) == [{"id": "x"}]
+    print("  [OK] Missing attributes raise; single-field models work")
+
+    body = ORJSONResponse({"rating": Decimal("4.50"), "tags": {"a"}, 1: None}).body
+    assert json.loads(body) == {"rating": 4.5, "tags": ["a"], "1": None}
+    print("  [OK] ORJSONResponse encodes Decimals, sets and non-str keys")
+
+
+def test_endpoint_response():
+    """Test list_class_posts returns the pre-serialized response"""
+    print("Testing class post listing endpoint...")
+    db, user = _make_session(post_count=20)
+    response = asyncio.run(list_class_posts(course_code="cs 100", professor_name=None, current_user=user, db=db))
+    posts = json.loads(response.body)
+    assert isinstance(response, ORJSONResponse) and posts
+    assert all(post["course_code"].startswith("CS 100") for post in posts)
+    assert [p["created_at"] for p in posts] == sorted((p["created_at"] for p in posts), reverse=True)
+    print(f"  [OK] {len(posts)} filtered posts, newest first")
+
+
+def benchmark_class_post_listing():
+    """Serialization time of a 1,000-row class post listing, before and after"""
+    print(f"Benchmarking {BENCHMARK_ROWS}-row class post listing...")
+    db, _ = _make_session()
+    posts = db.query(ClassPost).all()
+
+    def best_of(serialize):
+        timings = []
+        for _ in range(BENCHMARK_REPEATS):
+            started = time.perf_counter()
+            serialize()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    before = best_of(lambda: _validated_body(ClassPostResponse, posts))
+    after = best_of(lambda: CLASS_POST_ROWS.response(posts).body)
+    print(f"  response_model + json.dumps: {before * 1000:.1f} ms")
+    print(f"  RowSerializer + orjson:      {after * 1000:.1f} ms ({before / after:.1f}x faster)")
+    return before, after
+
+
+def test_benchmark():
+    """Test the pre-built serializer is faster than per-row validation"""
+    before, after = benchmark_class_post_listing()
+    assert after < before
+    print("  [OK] Pre-built serializer is faster")
+
+
+if __name__ == "__main__":
+    test_rows_match_response_models()
+    test_serializer_checks_fields()
+    test_endpoint_response()
+    test_benchmark()
+    print("\n>>> All response serialization tests passed!")
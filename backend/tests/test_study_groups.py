@@ -0,0 +1,103 @@
+"""
+Test script to verify chapter-wide study group formation (balanced groups, affinity, caching)
+"""
+import sys
+import os
+import uuid
+import asyncio
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app.models  # noqa: F401 - registers all mappers
+from app.models.cache_version import CacheVersion
+from app.models.course import Course
+from app.models.user import User
+from app.services import study_groups
+from app.services.course_changes import courses_changed
+from app.services.study_groups import build_study_group_plan, get_study_group_plan
+from app.api.v1.recommendations import get_study_groups
+from sqlite_support import make_session
+
+
+def test_group_formation():
+    """Test groups are balanced and members sharing other courses are grouped together"""
+    print("Testing study group formation...")
+    members = [uuid.UUID(int=i) for i in range(10)]
+    # Everyone takes CS 101; members 0-3 also share MATH 201, members 4-5 share PHYS 150
+    enrolments = [(member, "CS 101") for member in members]
+    enrolments += [(members[i], "MATH 201") for i in range(4)]
+    enrolments += [(members[i], "PHYS 150") for i in (4, 5)]
+    enrolments += [(members[9], "ART 110")]  # Only one taker - no group
+
+    plan = build_study_group_plan(enrolments, group_size=4)
+    cs_groups = plan.groups["CS 101"]
+    assert sorted(len(group) for group in cs_groups) == [3, 3, 4], cs_groups
+    assert sorted(i for group in cs_groups for i in group) == list(range(10))
+    print("  [OK] 10 members -> 3 groups of sizes 4/3/3, everyone placed once")
+
+    assert [0, 1, 2, 3] in cs_groups, cs_groups
+    assert any({4, 5} <= set(group) for group in cs_groups), cs_groups
+    print("  [OK] Members sharing other courses are placed together")
+
+    assert plan.groups["MATH 201"] == [[0, 1, 2, 3]]
+    assert "ART 110" not in plan.groups
+    assert plan.shared_count(members[0], members[1]) == 2
+    print("  [OK] Single-taker courses skipped; shared counts from the incidence product")
+
+
+def test_endpoint_and_cache():
+    """Test the endpoint returns the user's groups and plans are rebuilt on enrolment change"""
+    print("Testing study group endpoint and cache...")
+    db = make_session([User.__table__, Course.__table__, CacheVersion.__table__])
+    study_groups._plan_cache.clear()
+
+    def add_user(first_name, codes):
+        user = User(
+            id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+            last_name="Test", hashed_password="x"
+        )
+        db.add(user)
+        for code in codes:
+            db.add(Course(id=uuid.uuid4(), user_id=user.id, course_code=code, grade="IN PROGRESS", semester="Fall", year=2026))
+        return user
+
+    me = add_user("Me", ["CS 101", "MATH 201"])
+    add_user("Ann", ["CS 101", "MATH 201"])
+    add_user("Ben", ["CS 101"])
+    db.commit()
+
+    groups = asyncio.run(get_study_groups(current_user=me, db=db))
+    assert [g.course_code for g in groups] == ["CS 101", "MATH 201"]
+    assert [(m.name, m.shared_courses) for m in groups[0].members] == [("Ann Test", 2), ("Ben Test", 1)]
+    print("  [OK] One group per current course, members ordered by shared courses")
+
+    scans = []
+    original_scan = study_groups._current_enrolments
+
+    def counting_scan(db):
+        scans.append(1)
+        return original_scan(db)
+
+    study_groups._current_enrolments = counting_scan
+    try:
+        before = get_study_group_plan(db)
+        assert get_study_group_plan(db) is before and scans == []
+        print("  [OK] Plan reused while enrolments are unchanged, without scanning enrolments")
+
+        cal = add_user("Cal", ["MATH 201"])
+        db.commit()
+        courses_changed(db, cal.id, ["MATH 201"])
+        after = get_study_group_plan(db)
+        assert after is not before and scans == [1]
+        assert len(after.groups["MATH 201"][0]) == 3
+        assert get_study_group_plan(db) is after and scans == [1]
+        print("  [OK] courses_changed (any worker) produces a new plan on the next request")
+    finally:
+        study_groups._current_enrolments = original_scan
+
+
+if __name__ == "__main__":
+    test_group_formation()
+    test_endpoint_and_cache()
+    print("\n>>> All study group tests passed!")
@@ -0,0 +1,192 @@
+"""
+Test script to verify tutor ranking is done in SQL (same major first, then grade, year)
+"""
+import sys
+import os
+import uuid
+import asyncio
+from datetime import datetime
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.dialects import postgresql
+import app.models  # noqa: F401 - registers all mappers
+from app.core.config import settings
+from app.models.course import Course
+from app.models.user import User
+from app.models.help_request import HelpRequest
+from app.models.course_tutor_index import CourseTutorIndex
+from app.services.course_tutor_index import rebuild_course_tutor_index
+from app.services.tutor_ranking import build_tutor_ranking_query, rank_tutors
+from app.api.v1.recommendations import get_previous_tutors, get_connected_brothers
+from sqlite_support import make_session
+
+
+def _make_session():
+    """In-memory SQLite session with just the users and courses tables"""
+    return make_session([
+        User.__table__, Course.__table__, HelpRequest.__table__, CourseTutorIndex.__table__
+    ])
+
+
+def _add_user(db, first_name, major):
+    user = User(
+        id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+        last_name="Test", major=major, hashed_password="x"
+    )
+    db.add(user)
+    return user
+
+
+def test_query_is_limited_and_ordered_in_sql():
+    """Test that the Postgres query orders by same major, grade, year and applies LIMIT"""
+    print("Testing tutor ranking SQL...")
+    db = sessionmaker()()  # Query is only compiled, never executed
+    query = build_tutor_ranking_query(db, "CS 101", uuid.uuid4(), "Computer Science", 5)
+    sql = str(query.statement.compile(dialect=postgresql.dialect()))
+
+    assert "ORDER BY CASE WHEN (users.major_key =" in sql
+    assert "courses.grade_score DESC" in sql
+    assert "courses.year DESC NULLS LAST" in sql
+    assert "LIMIT" in sql
+    print("  [OK] Ranking and LIMIT are in the SQL query")
+
+
+def test_ranking_order():
+    """Test same-major tutors rank first, then by grade_score and year"""
+    print("Testing tutor ranking order...")
+    db = _make_session()
+
+    requester = _add_user(db, "Requester", "Computer Science")
+    same_major_b = _add_user(db, "SameMajorB", " comp. sci ")
+    other_major_a = _add_user(db, "OtherMajorA", "Mathematics")
+    no_major_a = _add_user(db, "NoMajorA", None)
+    same_major_a_old = _add_user(db, "SameMajorAOld", "Computer Science")
+    same_major_a_new = _add_user(db, "SameMajorANew", "Computer Science")
+    no_grade = _add_user(db, "NoGrade", "Computer Science")
+
+    def add_course(user, grade_score, year):
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code="CS 101", grade="A",
+            grade_score=grade_score, year=year, semester="Fall"
+        ))
+
+    add_course(requester, 4.0, 2024)  # Requester is excluded
+    add_course(same_major_b, 3.0, 2024)
+    add_course(other_major_a, 4.0, 2024)
+    add_course(no_major_a, 4.0, 2025)
+    add_course(same_major_a_old, 4.0, 2022)
+    add_course(same_major_a_new, 4.0, 2024)
+    add_course(no_grade, None, 2024)  # No grade - not a tutor
+    db.commit()
+    rebuild_course_tutor_index(db)
+
+    ranked = rank_tutors(db, "CS 101", requester.id, "Computer Science", limit=10)
+    names = [helper.first_name for _course, helper in ranked]
+    assert names == ["SameMajorANew", "SameMajorAOld", "SameMajorB", "NoMajorA", "OtherMajorA"], names
+    print("  [OK] Same major first, then grade_score, then year")
+
+    live = build_tutor_ranking_query(db, "CS 101", requester.id, "Computer Science", 10).all()
+    assert [helper.first_name for _course, helper in live] == names
+    print("  [OK] Tutor index matches ranking over all takers")
+
+    assert len(rank_tutors(db, "CS 101", requester.id, "Computer Science", limit=2)) == 2
+    print("  [OK] Limit applied")
+
+    # Requester without a major: pure grade/year ordering
+    ranked = rank_tutors(db, "CS 101", requester.id, None, limit=3)
+    names = [helper.first_name for _course, helper in ranked]
+    assert names[0] == "NoMajorA", names  # Most recent 4.0
+    assert set(names[1:]) == {"OtherMajorA", "SameMajorANew"}, names  # 4.0 in 2024, order among ties unspecified
+    print("  [OK] Requester without a major ranks by grade and year")
+
+
+def test_index_beyond_top_k():
+    """Test same-major tutors ranked below the overall top K still come first"""
+    print("Testing tutor index with more than K takers...")
+    db = _make_session()
+    original_size = settings.COURSE_TUTOR_INDEX_SIZE
+    settings.COURSE_TUTOR_INDEX_SIZE = 5
+    try:
+        requester = _add_user(db, "Requester", "Physics")
+        # Twelve math majors outgrade the three physics majors
+        for n in range(15):
+            taker = _add_user(db, f"Taker{n}", "Mathematics" if n < 12 else "Physics")
+            db.add(Course(
+                id=uuid.uuid4(), user_id=taker.id, course_code="PHYS 201", grade="A",
+                grade_score=4.0 - n * 0.1, year=2024, semester="Fall"
+            ))
+        db.commit()
+        rebuild_course_tutor_index(db)
+
+        for major in ["Physics", "Mathematics", None]:
+            for limit in range(1, 5):
+                indexed = [helper.first_name for _course, helper in rank_tutors(db, "PHYS 201", requester.id, major, limit)]
+                live = build_tutor_ranking_query(db, "PHYS 201", requester.id, major, limit).all()
+                assert indexed == [helper.first_name for _course, helper in live], (major, limit, indexed)
+        names = [helper.first_name for _course, helper in rank_tutors(db, "PHYS 201", requester.id, "Physics", 4)]
+        assert names == ["Taker12", "Taker13", "Taker14", "Taker0"], names
+        print("  [OK] Index ranking equals ranking over all takers (same-major takers ranked 13th-15th overall)")
+    finally:
+        settings.COURSE_TUTOR_INDEX_SIZE = original_size
+
+
+def test_previous_tutors_and_connected_brothers():
+    """Test the batched help request queries group tutors per help request and per brother"""
+    print("Testing previous tutors and connected brothers...")
+    db = _make_session()
+
+    requester = _add_user(db, "Requester", "Computer Science")
+    alice = _add_user(db, "Alice", "Computer Science")
+    bob = _add_user(db, "Bob", "Mathematics")
+
+    def add_course(user, course_code, grade_score, year):
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, course_code=course_code, grade="A",
+            grade_score=grade_score, year=year, semester="Fall"
+        ))
+
+    add_course(alice, "CS 101", 4.0, 2024)
+    add_course(bob, "CS 101", 3.0, 2024)
+    add_course(bob, "MATH 201", 3.7, 2023)
+    add_course(alice, "MATH 201", 3.3, 2023)
+    add_course(alice, "PHYS 150", 2.0, 2022)  # No help request for this course
+
+    cs_request = HelpRequest(
+        id=uuid.uuid4(), requester_id=requester.id, course_code="CS 101", created_at=datetime(2025, 1, 1)
+    )
+    math_request = HelpRequest(
+        id=uuid.uuid4(), requester_id=requester.id, course_code="MATH 201", created_at=datetime(2025, 2, 1)
+    )
+    db.add_all([cs_request, math_request])
+    db.commit()
+
+    # Previous tutors: top tutor of each request (Alice for CS 101, Bob for MATH 201), best grade first
+    tutors = asyncio.run(get_previous_tutors(current_user=requester, db=db))
+    assert [(t.helper_name, t.course_code, t.grade_score) for t in tutors] == [
+        ("Alice Test", "CS 101", 4.0),
+        ("Bob Test", "MATH 201", 3.7),
+    ], tutors
+    assert tutors[1].help_request_id == str(math_request.id)
+    print("  [OK] Previous tutors: one top tutor per help request")
+
+    # Connected brothers: both helped with both courses, most recently connected first
+    brothers = asyncio.run(get_connected_brothers(current_user=requester, db=db))
+    assert len(brothers) == 2
+    for brother in brothers:
+        assert [c.course_code for c in brother.courses_helped] == ["CS 101", "MATH 201"], brother
+        assert brother.total_courses == 2
+        assert brother.first_connected.startswith("2025-01-01")
+        assert brother.last_connected.startswith("2025-02-01")
+    assert brothers[0].courses_helped[1].help_request_date.startswith("2025-02-01")
+    print("  [OK] Connected brothers: grouped per brother with first/last connection dates")
+
+
+if __name__ == "__main__":
+    test_query_is_limited_and_ordered_in_sql()
+    test_ranking_order()
+    test_index_beyond_top_k()
+    test_previous_tutors_and_connected_brothers()
+    print("\n>>> All tutor ranking tests passed!")
@@ -0,0 +1,85 @@
+"""
+Test script to verify multi-course tutor search (coverage, grade, recency, same-major tiebreak)
+"""
+import sys
+import os
+import uuid
+import asyncio
+from datetime import datetime
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+import app.models  # noqa: F401 - registers all mappers
+from app.models.course import Course
+from app.models.user import User
+from app.api.v1.recommendations import search_multi_course_tutors
+from sqlite_support import make_session
+
+
+def test_multi_course_ranking():
+    """Test scoring across courses and the same-major tiebreak"""
+    print("Testing multi-course tutor search...")
+    db = make_session([User.__table__, Course.__table__])
+    this_year = datetime.now().year
+
+    def add_user(first_name, major, courses):
+        user = User(
+            id=uuid.uuid4(), email=f"{first_name.lower()}@example.com", first_name=first_name,
+            last_name="Test", major=major, hashed_password="x"
+        )
+        db.add(user)
+        for code, grade_score, year, semester in courses:
+            db.add(Course(
+                id=uuid.uuid4(), user_id=user.id, course_code=code, grade="A",
+                grade_score=grade_score, year=year, semester=semester
+            ))
+        return user
+
+    me = add_user("Me", "Computer Science", [("CS 2110", 3.0, this_year, "Fall")])
+    add_user("Both", "Mathematics", [("CS 2110", 3.7, this_year - 1, "Fall"), ("MATH 2415", 3.7, this_year - 1, "Spring")])
+    # Retook CS 2110 - only the best attempt counts
+    add_user("Retake", "Physics", [
+        ("CS 2110", 2.0, this_year - 3, "Fall"), ("CS 2110", 4.0, this_year - 1, "Fall"),
+        ("MATH 2415", 3.4, this_year - 1, "Spring")
+    ])
+    add_user("OneCourse", "Mathematics", [("CS 2110", 4.0, this_year, "Fall")])
+    add_user("TwinOther", "Biology", [("MATH 2415", 3.0, this_year - 1, "Fall")])
+    add_user("TwinSame", "CS", [("MATH 2415", 3.0, this_year - 1, "Fall")])
+    add_user("Unrelated", "Computer Science", [("HIST 100", 4.0, this_year, "Fall")])
+    add_user("Ungraded", "Computer Science", [("CS 2110", None, this_year, "Fall")])
+    db.commit()
+
+    results = asyncio.run(search_multi_course_tutors(
+        course_codes=["cs 2110", "MATH 2415 "], limit=10, current_user=me, db=db
+    ))
+    names = [r.helper_name.split()[0] for r in results]
+    assert names == ["Both", "Retake", "OneCourse", "TwinSame", "TwinOther"], names
+    print("  [OK] Full coverage first, then grade, recency; same major breaks ties")
+
+    retake = results[1]
+    assert retake.courses_covered == 2 and retake.coverage == 1.0
+    assert [c.grade_score for c in retake.courses] == [4.0, 3.4]
+    assert retake.average_grade_score == 3.7
+    assert results[3].same_major and not results[4].same_major
+    assert [r.rank for r in results] == [1, 2, 3, 4, 5]
+    print("  [OK] Best attempt per course; score components reported")
+
+    results = asyncio.run(search_multi_course_tutors(
+        course_codes=["CS 2110", "MATH 2415"], limit=2, current_user=me, db=db
+    ))
+    assert len(results) == 2
+    print("  [OK] Limit applied")
+
+    try:
+        asyncio.run(search_multi_course_tutors(course_codes=[" "], limit=10, current_user=me, db=db))
+        raise AssertionError("Expected 400 for empty course list")
+    except HTTPException as e:
+        assert e.status_code == 400
+    print("  [OK] Empty course list rejected")
+
+
+if __name__ == "__main__":
+    test_multi_course_ranking()
+    print("\n>>> All multi-course tutor search tests passed!")
@@ -0,0 +1,77 @@
+"""
+Test script to verify the TTL cache and the authenticated user cache
+"""
+import sys
+import os
+import time
+import uuid
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.cache import TTLCache
+from app.core import user_cache
+from app.models.user import User
+
+
+def test_ttl_cache_eviction_and_expiry():
+    """Test LRU eviction and per-entry expiry"""
+    print("Testing TTLCache...")
+    cache = TTLCache(maxsize=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # Touch "a" so "b" becomes least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None, "Least recently used entry should be evicted"
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    print("  [OK] LRU eviction")
+
+    short_lived = TTLCache(maxsize=10, ttl_seconds=60)
+    short_lived.set("short", "value", ttl_seconds=0.01)
+    time.sleep(0.02)
+    assert short_lived.get("short") is None, "Expired entry should not be returned"
+    print("  [OK] Expiry")
+
+    removed = cache.discard_where(lambda key: key in ("a", "c"))
+    assert removed == 2 and len(cache) == 0
+    print("  [OK] discard_where")
+
+
+def test_user_cache_invalidation():
+    """Test that invalidate_user drops every token cached for a user"""
+    print("\nTesting user cache invalidation...")
+    user_cache.clear_user_cache()
+    user = User(
+        id=uuid.uuid4(),
+        email="brother@example.com",
+        first_name="Test",
+        last_name="Brother",
+        major="Computer Science",
+        points=None,
+    )
+    other = User(id=uuid.uuid4(), email="other@example.com", first_name="Other", last_name="Brother")
+
+    projection = user_cache.cache_user(user, "token-1", time.time() + 600)
+    user_cache.cache_user(user, "token-2", time.time() + 600)
+    user_cache.cache_user(other, "token-3", time.time() + 600)
+    assert projection.points == 0 and projection.major == "Computer Science"
+    assert user_cache.get_cached_user(user.id, "token-1") is projection
+    assert user_cache.get_cached_user(user.id, "unknown-token") is None
+
+    user_cache.invalidate_user(str(user.id))
+    assert user_cache.get_cached_user(user.id, "token-1") is None
+    assert user_cache.get_cached_user(user.id, "token-2") is None
+    assert user_cache.get_cached_user(other.id, "token-3") is not None
+    print("  [OK] All tokens for the user were dropped, other users untouched")
+
+    # Entries never outlive the token they were validated for
+    user_cache.cache_user(user, "expired-token", time.time() - 1)
+    assert user_cache.get_cached_user(user.id, "expired-token") is None
+    print("  [OK] Expired tokens are not cached")
+    user_cache.clear_user_cache()
+
+
+if __name__ == "__main__":
+    test_ttl_cache_eviction_and_expiry()
+    test_user_cache_invalidation()
+    print("\n>>> All user cache tests passed!")
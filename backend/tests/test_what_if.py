@@ -0,0 +1,146 @@
+"""
+Test script to verify the vectorized GPA what-if simulator
+"""
+import sys
+import os
+import uuid
+import asyncio
+import itertools
+
+# Add the backend directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from fastapi import HTTPException
+import app.models  # noqa: F401 - registers all mappers
+from app.models.course import Course
+from app.models.user import User
+from app.services.pdf_processor import PDFProcessor
+from app.services.what_if import GRADE_LEVELS, WhatIfError, simulate
+from app.api.v1.analytics import WhatIfRequest, simulate_what_if
+from sqlite_support import make_session
+
+
+CURRENT = [("CS 3345", 3), ("MATH 2418", 4), ("PHYS 2326", 3), ("CS 3341", 3), ("GOVT 2305", 1)]
+COMPLETED = [("CS 1337", 3, "A", 4.0), ("CS 2336", 3, "B+", 3.3), ("HIST 1301", 3, "D", 1.0)]
+
+
+def _make_session():
+    """In-memory SQLite session with a member, completed transcript courses and current courses"""
+    db = make_session([User.__table__, Course.__table__])
+    user = User(id=uuid.uuid4(), email="ann@example.com", first_name="Ann", last_name="Test", hashed_password="x")
+    transcript_id = uuid.uuid4()  # Completed courses come from a transcript
+    db.add(user)
+    for code, hours, grade, score in COMPLETED:
+        db.add(Course(
+            id=uuid.uuid4(), user_id=user.id, transcript_id=transcript_id, course_code=code,
+            credit_hours=hours, grade=grade, grade_score=score, semester="Fall", year=2024
+        ))
+    for code, hours in CURRENT:
+        db.add(Course(id=uuid.uuid4(), user_id=user.id, course_code=code, credit_hours=hours, semester="Spring", year=2025))
+    db.commit()
+    return db, user
+
+
+def _brute_force(levels, courses, base_points, base_credits):
+    """Term and cumulative GPA of every combination, one scenario at a time (calculate_gpa rules)"""
+    term, cumulative = [], []
+    for combination in itertools.product(levels, repeat=len(courses)):
+        points = sum(PDFProcessor.GRADE_MAP[g] * h for g, (_, h) in zip(combination, courses) if PDFProcessor.GRADE_MAP[g] >= 1.7)
+        credits = sum(h for g, (_, h) in zip(combination, courses) if PDFProcessor.GRADE_MAP[g] >= 1.7)
+        term.append(points / credits if credits else np.nan)
+        cumulative.append((points + base_points) / (credits + base_credits))
+    return np.array(term), np.array(cumulative)
+
+
+def _distribution_matches(result, gpas):
+    """Distribution summary equals statistics of the reference GPAs"""
+    values = gpas[~np.isnan(gpas)]
+    assert result['min'] == round(float(values.min()), 2)
+    assert result['max'] == round(float(values.max()), 2)
+    assert result['mean'] == round(float(values.mean()), 2)
+    assert result['p50'] == round(float(np.median(values)), 2)
+    assert sum(bucket['count'] for bucket in result['histogram']) == len(values)
+
+
+def test_matches_brute_force():
+    """Test the outer-sum grid equals evaluating every combination in a loop"""
+    print("Testing grid against brute force...")
+    db, user = _make_session()
+    base_points, base_credits = 4.0 * 3 + 3.3 * 3, 6.0  # The D earns no credit
+    levels = ["A", "B", "C", "D", "F"]
+    result = simulate(db, user.id, grade_levels=levels)
+    courses = sorted(CURRENT)
+    term, cumulative = _brute_force(levels, courses, base_points, base_credits)
+
+    assert result['current_gpa'] == round(base_points / base_credits, 2)
+    assert [c['course_code'] for c in result['courses']] == [code for code, _ in courses]
+    assert result['scenario_count'] == 5 ** 5
+    _distribution_matches(result['term_gpa'], term)
+    _distribution_matches(result['cumulative_gpa'], cumulative)
+    print(f"  [OK] {result['scenario_count']} scenarios match a per-scenario loop")
+
+
+def test_all_grade_levels():
+    """Test the default grid enumerates every letter with a GPA score"""
+    print("Testing full grade grid...")
+    db, user = _make_session()
+    result = simulate(db, user.id)
+    assert len(GRADE_LEVELS) == 13 and "S" not in GRADE_LEVELS
+    assert result['scenario_count'] == 13 ** 5 == 371293
+    assert result['term_gpa']['max'] == 4.0 and result['term_gpa']['min'] == 1.7
+    print("  [OK] 13 levels x 5 courses -> 371,293 scenarios")
+
+    try:
+        simulate(db, user.id, max_scenarios=100_000)
+        assert False, "expected WhatIfError"
+    except WhatIfError:
+        pass
+    print("  [OK] Grids over max_scenarios are rejected")
+
+
+def test_explicit_scenarios():
+    """Test explicit scenarios get per-scenario results"""
+    print("Testing explicit scenarios...")
+    db, user = _make_session()
+    scenarios = [
+        {"CS 3345": "A", "MATH 2418": "B", "PHYS 2326": "C"},
+        {"CS 3345": "f", "GOVT 2305": "D"},  # No credit-earning course
+    ]
+    result = simulate(db, user.id, scenarios=scenarios)
+    first, second = result['scenarios']
+    assert first['term_gpa'] == round((4.0 * 3 + 3.0 * 4 + 2.0 * 3) / 10, 2)
+    assert first['cumulative_gpa'] == round((4.0 * 3 + 3.0 * 4 + 2.0 * 3 + 21.9) / 16, 2)
+    assert second['term_gpa'] is None and second['cumulative_gpa'] == 3.65
+    assert result['scenario_count'] == 2
+    print("  [OK] Term and cumulative GPA per scenario")
+
+    for bad in ([{"CS 9999": "A"}], [{"CS 3345": "Z"}]):
+        try:
+            simulate(db, user.id, scenarios=bad)
+            assert False, "expected WhatIfError"
+        except WhatIfError:
+            pass
+    print("  [OK] Unknown courses and grades are rejected")
+
+
+def test_endpoint():
+    """Test POST /analytics/what-if"""
+    print("Testing endpoint...")
+    db, user = _make_session()
+    result = asyncio.run(simulate_what_if(what_if=WhatIfRequest(grade_levels=["A", "B"]), current_user=user, db=db))
+    assert result.scenario_count == 32 and result.term_gpa.max == 4.0
+    try:
+        asyncio.run(simulate_what_if(what_if=WhatIfRequest(grade_levels=["A+", "Q"]), current_user=user, db=db))
+        assert False, "expected 400"
+    except HTTPException as e:
+        assert e.status_code == 400
+    print("  [OK] Distribution response; invalid grades -> 400")
+
+
+if __name__ == "__main__":
+    test_matches_brute_force()
+    test_all_grade_levels()
+    test_explicit_scenarios()
+    test_endpoint()
+    print("\n>>> All what-if tests passed!")